@@ -0,0 +1,8 @@
+# Imported by core.urls on the first request (or reverse()) under /admin/, so the
+# ModelAdmin registrations are only loaded when the admin is actually used
+from django.contrib import admin
+
+admin.autodiscover()
+
+app_name = 'admin'
+urlpatterns = admin.site.get_urls()
@@ -1,10 +1,14 @@
 import os
 
-from django.core.asgi import get_asgi_application
+from core.startup import startup_gc, warm_up
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_asgi_application()
+with startup_gc():
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    warm_up()
 
 # This is for Vercel
-app = application
\ No newline at end of file
+app = application
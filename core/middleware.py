@@ -0,0 +1,42 @@
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+class LazyWhiteNoiseMiddleware:
+    """
+    WhiteNoise, set up on the first static file request instead of at startup
+    
+    WhiteNoiseMiddleware scans STATIC_ROOT when it is created, which most requests
+    to the API never need. Sync and async capable, so under ASGI the rest of the
+    chain stays async; WhiteNoise itself only runs synchronously, so static file
+    requests go through a thread.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.static_prefix = '/' + settings.STATIC_URL.lstrip('/')
+        self.whitenoise = None
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not request.path_info.startswith(self.static_prefix):
+            return self.get_response(request)
+        return self.get_whitenoise()(request)
+    
+    async def __acall__(self, request):
+        if not request.path_info.startswith(self.static_prefix):
+            return await self.get_response(request)
+        return await sync_to_async(self.get_whitenoise())(request)
+    
+    def get_whitenoise(self):
+        if self.whitenoise is None:
+            from whitenoise.middleware import WhiteNoiseMiddleware
+            get_response = self.get_response
+            if iscoroutinefunction(get_response):
+                get_response = async_to_sync(get_response)
+            self.whitenoise = WhiteNoiseMiddleware(get_response)
+        return self.whitenoise
@@ -0,0 +1,68 @@
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from .pool import ConnectionPool, get_pool
+
+# Idle, in the transaction status codes of both psycopg2 and psycopg 3
+TRANSACTION_STATUS_IDLE = 0
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend that takes connections from a process-wide pool
+    
+    Closing the connection (at the end of each request, with CONN_MAX_AGE = 0) hands it
+    back to the pool instead of disconnecting. Pool options come from the database's
+    POOL setting: MAX_SIZE, MAX_LIFETIME, MAX_IDLE, PING_AFTER and TIMEOUT (seconds).
+    """
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.create_pool)
+    
+    def create_pool(self):
+        options = self.settings_dict.get('POOL', {})
+        return ConnectionPool(
+            ping=self.ping,
+            max_size=options.get('MAX_SIZE', 5),
+            max_lifetime=options.get('MAX_LIFETIME', 1800),
+            max_idle=options.get('MAX_IDLE', 300),
+            ping_after=options.get('PING_AFTER', 5),
+            timeout=options.get('TIMEOUT', 10),
+        )
+    
+    @staticmethod
+    def ping(connection):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    
+    def get_new_connection(self, conn_params):
+        connection = self.pool.acquire(
+            connect=lambda: base.DatabaseWrapper.get_new_connection(self, conn_params)
+        )
+        # The parent sets this on new connections; pooled ones keep the configured level
+        level = self.settings_dict['OPTIONS'].get('isolation_level')
+        self.isolation_level = IsolationLevel.READ_COMMITTED if level is None else IsolationLevel(level)
+        return connection
+    
+    def is_reusable(self):
+        """
+        Return True if the current connection can go back to the pool, rolling back any open transaction
+        """
+        connection = self.connection
+        if connection.closed or self.errors_occurred:
+            return False
+        if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except Exception:
+                return False
+        return True
+    
+    def _close(self):
+        if self.connection is not None:
+            # Django keeps using a connection closed inside atomic() until the block
+            # exits, so that one is really closed rather than handed to another thread
+            reusable = not self.in_atomic_block and self.is_reusable()
+            with self.wrap_database_errors:
+                self.pool.release(self.connection, reusable=reusable)
+    
+    def pool_stats(self):
+        return self.pool.stats()
@@ -0,0 +1,214 @@
+import threading
+import time
+from collections import deque
+
+class PoolTimeout(Exception):
+    """
+    Raised when no connection became available within the pool timeout
+    """
+
+class PooledConnection:
+    """
+    Bookkeeping for one connection owned by the pool
+    """
+    __slots__ = ('connection', 'created_at', 'returned_at')
+    
+    def __init__(self, connection, created_at):
+        self.connection = connection
+        self.created_at = created_at
+        self.returned_at = created_at
+
+class ConnectionPool:
+    """
+    Thread-safe, bounded pool of DB-API connections
+    
+    connect() opens a new connection and ping(connection) raises if it is broken. Idle
+    connections are reused newest first; connections past max_lifetime or idle longer
+    than max_idle are closed instead of handed out, and connections idle for at least
+    ping_after seconds are pinged before reuse.
+    """
+    def __init__(self, connect=None, ping=None, max_size=5, max_lifetime=1800, max_idle=300,
+                 ping_after=5, timeout=10, clock=time.monotonic):
+        self.connect = connect
+        self.ping = ping
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.ping_after = ping_after
+        self.timeout = timeout
+        self.clock = clock
+        
+        self.idle = deque()
+        self.in_use = {}
+        self.opening = 0
+        self.lock = threading.Lock()
+        self.available = threading.Condition(self.lock)
+        
+        self.counters = {
+            'checkouts': 0,
+            'created': 0,
+            'closed_expired': 0,
+            'closed_idle': 0,
+            'closed_broken': 0,
+            'ping_failures': 0,
+            'waits': 0,
+            'timeouts': 0,
+        }
+        self.wait_seconds = 0.0
+    
+    @property
+    def size(self):
+        return len(self.idle) + len(self.in_use) + self.opening
+    
+    def acquire(self, timeout=None, connect=None):
+        """
+        Return a healthy connection, opening one (with connect, if given) if the pool has room
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = self.clock() + timeout
+        waited = False
+        
+        while True:
+            with self.lock:
+                while not self.idle and self.size >= self.max_size:
+                    remaining = deadline - self.clock()
+                    if remaining <= 0:
+                        self.counters['timeouts'] += 1
+                        raise PoolTimeout(f'No database connection available within {timeout}s')
+                    if not waited:
+                        waited = True
+                        self.counters['waits'] += 1
+                    start = self.clock()
+                    self.available.wait(remaining)
+                    self.wait_seconds += self.clock() - start
+                
+                if self.idle:
+                    entry = self.idle.pop()
+                    # Counted as in use while it is checked, so size stays accurate
+                    self.in_use[id(entry.connection)] = entry
+                else:
+                    entry = None
+                    self.opening += 1
+            
+            if entry is None:
+                return self.open_connection(connect or self.connect)
+            
+            if self.check(entry):
+                with self.lock:
+                    self.counters['checkouts'] += 1
+                return entry.connection
+    
+    def open_connection(self, connect):
+        try:
+            connection = connect()
+        except BaseException:
+            with self.lock:
+                self.opening -= 1
+                self.available.notify()
+            raise
+        
+        with self.lock:
+            self.opening -= 1
+            self.in_use[id(connection)] = PooledConnection(connection, self.clock())
+            self.counters['created'] += 1
+            self.counters['checkouts'] += 1
+        return connection
+    
+    def check(self, entry):
+        """
+        Return True if an idle connection can be reused, closing it otherwise
+        """
+        now = self.clock()
+        reason = None
+        if self.max_lifetime is not None and now - entry.created_at >= self.max_lifetime:
+            reason = 'closed_expired'
+        elif self.max_idle is not None and now - entry.returned_at >= self.max_idle:
+            reason = 'closed_idle'
+        elif self.ping is not None and self.ping_after is not None and now - entry.returned_at >= self.ping_after:
+            try:
+                self.ping(entry.connection)
+            except Exception:
+                with self.lock:
+                    self.counters['ping_failures'] += 1
+                reason = 'closed_broken'
+        
+        if reason is None:
+            return True
+        self.discard(entry.connection, reason)
+        return False
+    
+    def release(self, connection, reusable=True):
+        """
+        Give a connection back to the pool, or close it if it can't be reused
+        """
+        if not reusable:
+            self.discard(connection, 'closed_broken')
+            return
+        
+        with self.lock:
+            entry = self.in_use.pop(id(connection), None)
+            if entry is not None:
+                entry.returned_at = self.clock()
+                self.idle.append(entry)
+                self.available.notify()
+                return
+        
+        # Not ours (e.g. the pool was reset while it was checked out)
+        self.close_quietly(connection)
+    
+    def discard(self, connection, reason):
+        """
+        Close a connection and free its slot
+        """
+        with self.lock:
+            self.in_use.pop(id(connection), None)
+            self.counters[reason] += 1
+            self.available.notify()
+        self.close_quietly(connection)
+    
+    def close_quietly(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+    
+    def close_idle(self):
+        """
+        Close every idle connection, e.g. before a worker is frozen or forked
+        """
+        with self.lock:
+            entries = list(self.idle)
+            self.idle.clear()
+            self.available.notify_all()
+        for entry in entries:
+            self.close_quietly(entry.connection)
+    
+    def stats(self):
+        """
+        Return the pool's gauges and counters
+        """
+        with self.lock:
+            return {
+                'max_size': self.max_size,
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': len(self.in_use),
+                'wait_seconds': self.wait_seconds,
+                **self.counters,
+            }
+
+# Pools by database alias, shared by every thread's DatabaseWrapper
+pools = {}
+pools_lock = threading.Lock()
+
+def get_pool(alias, factory):
+    """
+    Return the pool for a database alias, creating it with factory() on first use
+    """
+    pool = pools.get(alias)
+    if pool is None:
+        with pools_lock:
+            pool = pools.get(alias)
+            if pool is None:
+                pool = pools[alias] = factory()
+    return pool
@@ -18,9 +18,30 @@ DEBUG = os.environ.get('DEBUG', 'False') == 'True'
 
 ALLOWED_HOSTS = ['*']
 
+# API-only mode serves just the JSON API: no admin, sessions, messages, static files or
+# browsable API, so serverless cold starts import and set up less
+API_ONLY = os.environ.get('API_ONLY', 'False') == 'True'
+
+# Apps and middleware only needed for the admin and other HTML pages
+BROWSER_APPS = [
+    # The admin registers its ModelAdmins on the first /admin/ request, see core.admin_urls
+    'django.contrib.admin.apps.SimpleAdminConfig',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+BROWSER_MIDDLEWARE = [
+    'core.middleware.LazyWhiteNoiseMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
 # Application definition
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -35,8 +56,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'orders.metrics.MetricsMiddleware',
+    'orders.replicas.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.LazyWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -46,6 +69,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if API_ONLY:
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in BROWSER_APPS]
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in BROWSER_MIDDLEWARE]
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
@@ -86,6 +113,53 @@ if DATABASE_URL:
         ssl_require=True
     )
 
+# Optional read replica. Admin list, detail, export and dashboard reads go to it through
+# orders.replicas.ReplicaRouter; migrations and writes always use the primary
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=600,
+        ssl_require=True
+    )
+    # Tests read the replica through the test database instead of creating another one
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['orders.replicas.ReplicaRouter']
+
+# Seconds a client's reads stay on the primary after it writes, so it never reads
+# replica data older than its own change. Pins are kept in this cache, which every
+# instance must share: the replica is left unused while it is a local memory cache
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get('DATABASE_REPLICA_PIN_SECONDS', 10))
+DATABASE_REPLICA_PIN_CACHE = os.environ.get('DATABASE_REPLICA_PIN_CACHE', 'default')
+
+# Cache shared by all instances (needs the redis package). Without it each process has its own
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+# Share Postgres connections through an in-process pool (core.pooled_postgresql). Each
+# request returns its connection to the pool, which keeps it open for the next one
+DB_POOL_ENABLED = os.environ.get('DB_POOL_ENABLED', 'True') == 'True'
+for database in DATABASES.values():
+    if DB_POOL_ENABLED and database['ENGINE'] == 'django.db.backends.postgresql':
+        database.update({
+            'ENGINE': 'core.pooled_postgresql',
+            'CONN_MAX_AGE': 0,
+            'POOL': {
+                'MAX_SIZE': int(os.environ.get('DB_POOL_MAX_SIZE', 5)),
+                'MAX_LIFETIME': int(os.environ.get('DB_POOL_MAX_LIFETIME', 1800)),  # seconds
+                'MAX_IDLE': int(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+                'PING_AFTER': int(os.environ.get('DB_POOL_PING_AFTER', 5)),  # idle seconds before a health check
+                'TIMEOUT': int(os.environ.get('DB_POOL_TIMEOUT', 10)),  # seconds to wait for a free connection
+            },
+        })
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -119,15 +193,23 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'orders.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 10
+    'PAGE_SIZE': 10,
+    # Proxies in front of the app that append to X-Forwarded-For. Throttles and replica pins
+    # identify clients by the address the nearest trusted proxy saw, or by REMOTE_ADDR with 0,
+    # so clients can't pick their own identity with a forged header
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
 }
 
+if API_ONLY:
+    # The browsable API needs templates, sessions and static files
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ['rest_framework.renderers.JSONRenderer']
+
 # JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
@@ -144,9 +226,81 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Cache of users resolved from JWT tokens, per process
+JWT_USER_CACHE_TTL = int(os.environ.get('JWT_USER_CACHE_TTL', 30))  # seconds
+JWT_USER_CACHE_SIZE = 1024
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True
 
-# Lontong price settings
+# Lontong price settings, used until a PriceCatalog version exists
 LONTONG_LARGE_PRICE = 80000  # 80k in IDR
-LONTONG_SMALL_PRICE = 40000  # 40k in IDR
\ No newline at end of file
+LONTONG_SMALL_PRICE = 40000  # 40k in IDR
+
+# Seconds a process keeps the price catalog before re-reading it
+PRICE_CATALOG_CACHE_TTL = int(os.environ.get('PRICE_CATALOG_CACHE_TTL', 60))
+
+# Bulk order import settings
+ORDER_BULK_MAX_ITEMS = int(os.environ.get('ORDER_BULK_MAX_ITEMS', 500))
+ORDER_BULK_BATCH_SIZE = 100
+
+# Number of generated WhatsApp links kept in memory per process
+WHATSAPP_LINK_CACHE_SIZE = int(os.environ.get('WHATSAPP_LINK_CACHE_SIZE', 2048))
+
+# WhatsApp message text, in str.format() syntax. Fields: any Order column plus
+# large_unit_price and small_unit_price from the order's price catalog version
+WHATSAPP_MESSAGE_TEMPLATE = os.environ.get('WHATSAPP_MESSAGE_TEMPLATE', (
+    "Hello {name}, thank you for your order!\n\n"
+    "Order Summary:\n"
+    "- Large Lontong: {total_lontong_large} x {large_unit_price} IDR\n"
+    "- Small Lontong: {total_lontong_small} x {small_unit_price} IDR\n"
+    "Total: {total_price} IDR\n\n"
+    "Customer Address: {address}\n\n"
+    "We will process your order and inform you once it's ready for pickup."
+    "\n\nThank you for choosing us!"
+))
+
+# Most order ids accepted by one batch WhatsApp link request
+WHATSAPP_LINK_BATCH_MAX_IDS = 1000
+
+# Rows fetched per database round trip when streaming order exports
+ORDER_EXPORT_CHUNK_SIZE = 2000
+
+# Season archives written by `manage.py archive_orders`: gzip NDJSON chunks per season.
+# Seasons start on these dates (comma separated YYYY-MM-DD, e.g. each Ramadan), or on
+# January 1st when none are given
+ORDER_ARCHIVE_ROOT = os.environ.get('ORDER_ARCHIVE_ROOT', BASE_DIR / 'archives')
+ORDER_ARCHIVE_CHUNK_SIZE = 10000  # orders per chunk file
+ORDER_ARCHIVE_DELETE_BATCH_SIZE = 1000  # orders removed from the hot table per DELETE
+ORDER_SEASON_STARTS = [day for day in os.environ.get('ORDER_SEASON_STARTS', '').split(',') if day]
+
+# Format list pages straight from values() rows instead of running OrderSerializer per
+# order; the output is identical, this switch only exists to compare the two
+ORDER_LIST_FAST_PATH = os.environ.get('ORDER_LIST_FAST_PATH', 'True') == 'True'
+
+# Order intake: 'direct' inserts on request, 'queue' appends to a local queue drained by
+# `manage.py drain_order_queue` and answers 202 Accepted with a ticket id
+ORDER_INTAKE_MODE = os.environ.get('ORDER_INTAKE_MODE', 'direct')
+ORDER_INTAKE_QUEUE_PATH = os.environ.get('ORDER_INTAKE_QUEUE_PATH', BASE_DIR / 'intake_queue.sqlite3')
+ORDER_INTAKE_STALE_AFTER = 300  # seconds before a claimed submission is retried
+
+# How long a stored Idempotency-Key response is replayed for
+IDEMPOTENCY_KEY_TTL = timedelta(hours=int(os.environ.get('IDEMPOTENCY_KEY_TTL_HOURS', 24)))
+
+# Admission control for public order creation: token buckets per client IP and phone
+# number, plus a cap on orders being created at once. Use
+# 'orders.throttling.CacheAdmissionBackend' to share state between instances through CACHES
+ORDER_ADMISSION = {
+    'ENABLED': os.environ.get('ORDER_ADMISSION_ENABLED', 'True') == 'True',
+    'BACKEND': os.environ.get('ORDER_ADMISSION_BACKEND', 'orders.throttling.LocalAdmissionBackend'),
+    'IP_RATE': 0.2,  # tokens per second, i.e. 12 orders a minute
+    'IP_BURST': 20,
+    'PHONE_RATE': 1 / 60,
+    'PHONE_BURST': 5,
+    'MAX_CONCURRENT': int(os.environ.get('ORDER_ADMISSION_MAX_CONCURRENT', 50)),
+    'SLOT_TIMEOUT': 60,  # seconds, at least the request timeout; CacheAdmissionBackend frees lost slots after 2x
+    'RETRY_AFTER': 2,  # seconds suggested to clients when shedding load
+}
+
+# Request and SQL metrics collected by orders.metrics.MetricsMiddleware and served at /api/metrics
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True') == 'True'
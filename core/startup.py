@@ -0,0 +1,26 @@
+import gc
+from contextlib import contextmanager
+
+@contextmanager
+def startup_gc():
+    """
+    Pause the garbage collector while the application starts up
+    
+    Startup creates tens of thousands of long-lived objects (modules, classes, URL
+    patterns), which triggers full collections that find nothing to free. The survivors
+    are frozen afterwards so later collections skip them as well.
+    """
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.freeze()
+        gc.enable()
+
+def warm_up():
+    """
+    Import the URLconf and views now rather than on the first request
+    """
+    from django.urls import get_resolver
+    
+    get_resolver().url_patterns
@@ -1,13 +1,23 @@
-from django.contrib import admin
-from django.urls import path, include
+from django.apps import apps
+from django.urls import URLResolver, path, include
+from django.urls.resolvers import RoutePattern
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/', include('orders.urls')),
-]
\ No newline at end of file
+]
+
+# The admin is left out in API-only mode. Otherwise its URLconf is imported lazily:
+# URLResolver only loads core.admin_urls the first time it resolves or reverses a URL
+if apps.is_installed('django.contrib.admin'):
+    urlpatterns.insert(0, URLResolver(
+        RoutePattern('admin/'),
+        'core.admin_urls',
+        app_name='admin',
+        namespace='admin',
+    ))
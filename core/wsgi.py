@@ -1,10 +1,14 @@
 import os
 
-from django.core.wsgi import get_wsgi_application
+from core.startup import startup_gc, warm_up
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_wsgi_application()
+with startup_gc():
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+    warm_up()
 
 # This is for Vercel
-app = application
\ No newline at end of file
+app = application
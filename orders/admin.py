@@ -1,9 +1,41 @@
 from django.contrib import admin
-from .models import Order
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from .models import DailyOrderSummary, Order, PriceCatalog
+from .search import search_orders
+
+class RankedChangeList(ChangeList):
+    """
+    Change list that keeps search results in rank order unless a column is sorted
+    """
+    def get_ordering(self, request, queryset):
+        # ChangeList would otherwise put the model's default ordering ahead of the rank
+        if 'search_rank' in queryset.query.annotations and ORDER_VAR not in self.params:
+            return list(queryset.query.order_by)
+        return super().get_ordering(request, queryset)
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'phone_number', 'total_lontong_large', 'total_lontong_small', 'total_price', 'created_at')
     list_filter = ('created_at',)
     search_fields = ('name', 'phone_number', 'address')
-    readonly_fields = ('total_price',)
\ No newline at end of file
+    readonly_fields = ('total_price', 'price_catalog')
+    
+    def get_changelist(self, request, **kwargs):
+        return RankedChangeList
+    
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search through the full-text index instead of icontains scans
+        """
+        if not search_term.strip():
+            return queryset, False
+        return search_orders(queryset, search_term), False
+
+@admin.register(DailyOrderSummary)
+class DailyOrderSummaryAdmin(admin.ModelAdmin):
+    list_display = ('date', 'order_count', 'total_lontong_large', 'total_lontong_small', 'revenue')
+    readonly_fields = ('date', 'order_count', 'total_lontong_large', 'total_lontong_small', 'revenue')
+
+@admin.register(PriceCatalog)
+class PriceCatalogAdmin(admin.ModelAdmin):
+    list_display = ('id', 'effective_from', 'large_price', 'small_price', 'created_at')
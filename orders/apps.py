@@ -0,0 +1,22 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.core import checks
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+class OrdersConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'orders'
+
+    def ready(self):
+        from .authentication import invalidate_cached_user
+        from .metrics import install_query_timer
+        from .replicas import check_replica_pin_cache
+        from .search import restore_sqlite_search
+
+        checks.register(check_replica_pin_cache, checks.Tags.caches)
+
+        post_save.connect(invalidate_cached_user, sender=settings.AUTH_USER_MODEL)
+        post_delete.connect(invalidate_cached_user, sender=settings.AUTH_USER_MODEL)
+        post_migrate.connect(restore_sqlite_search, sender=self)
+        connection_created.connect(install_query_timer)
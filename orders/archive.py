@@ -0,0 +1,174 @@
+import bisect
+import gzip
+import json
+import os
+import re
+from datetime import date, datetime
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .exports import iter_gzip, iter_ndjson
+from .models import Order
+from .phones import normalize_phone_number
+
+CHUNK_PATTERN = re.compile(r'^orders-(\d+)\.ndjson\.gz$')
+SEASON_PATTERN = re.compile(r'^[\w-]+$')
+
+class ArchiveJSONEncoder(DjangoJSONEncoder):
+    """
+    Keeps full microsecond precision, which DjangoJSONEncoder truncates to milliseconds
+    """
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+def get_archive_fields():
+    """
+    Return the order columns written to archives, so archived orders can be restored in full
+    """
+    return tuple(field.attname for field in Order._meta.concrete_fields)
+
+def get_season_starts():
+    return sorted(date.fromisoformat(value) for value in settings.ORDER_SEASON_STARTS)
+
+def get_season(day, starts=None):
+    """
+    Return the name of the season a day falls in: the year the season started in
+    
+    Seasons start on the ORDER_SEASON_STARTS dates (e.g. the start of each Ramadan).
+    Earlier seasons are calendar years, the last of which runs until the first start.
+    """
+    starts = get_season_starts() if starts is None else starts
+    index = bisect.bisect_right(starts, day)
+    if index:
+        return str(starts[index - 1].year)
+    if starts and day.year == starts[0].year:
+        return str(day.year - 1)
+    return str(day.year)
+
+def get_season_path(season, root=None):
+    if not SEASON_PATTERN.match(season):
+        raise ValueError(f'Invalid season name: {season!r}')
+    return os.path.join(root or settings.ORDER_ARCHIVE_ROOT, season)
+
+def get_chunk_paths(season, root=None):
+    """
+    Return a season's archive chunk files in the order they were written
+    """
+    path = get_season_path(season, root)
+    if not os.path.isdir(path):
+        return []
+    
+    chunks = sorted(
+        (int(match.group(1)), name)
+        for match, name in ((CHUNK_PATTERN.match(name), name) for name in os.listdir(path))
+        if match
+    )
+    return [os.path.join(path, name) for _, name in chunks]
+
+def write_chunk(season, rows, root=None):
+    """
+    Write rows to the season's next gzip NDJSON chunk, returning its path once it is on disk
+    """
+    path = get_season_path(season, root)
+    os.makedirs(path, exist_ok=True)
+    
+    existing = get_chunk_paths(season, root)
+    number = int(CHUNK_PATTERN.match(os.path.basename(existing[-1])).group(1)) + 1 if existing else 1
+    chunk_path = os.path.join(path, f'orders-{number:05d}.ndjson.gz')
+    
+    # Written under a temporary name, so a chunk is either complete or absent
+    temporary_path = chunk_path + '.tmp'
+    with open(temporary_path, 'wb') as output:
+        for data in iter_gzip(iter_ndjson(rows, get_archive_fields(), ArchiveJSONEncoder)):
+            output.write(data)
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(temporary_path, chunk_path)
+    return chunk_path
+
+def archive_orders(before, chunk_size=None, batch_size=None, root=None, using=None):
+    """
+    Move orders created before a datetime into season archives, oldest first
+    
+    Each chunk is written to disk before its orders are deleted, so an interrupted run
+    never loses orders. Yields (season, chunk path, order count) per chunk.
+    """
+    chunk_size = chunk_size or settings.ORDER_ARCHIVE_CHUNK_SIZE
+    batch_size = batch_size or settings.ORDER_ARCHIVE_DELETE_BATCH_SIZE
+    fields = get_archive_fields()
+    starts = get_season_starts()
+    orders = Order.objects.db_manager(using).filter(created_at__lt=before).order_by('created_at', 'id')
+    created_at = fields.index('created_at')
+    
+    while True:
+        # Archived rows are deleted, so every pass starts from the oldest remaining order
+        rows = list(orders.values_list(*fields)[:chunk_size])
+        if not rows:
+            break
+        
+        # Chunks never span two seasons
+        season = get_season(timezone.localdate(rows[0][created_at]), starts)
+        rows = [row for row in rows if get_season(timezone.localdate(row[created_at]), starts) == season]
+        
+        chunk_path = write_chunk(season, rows, root)
+        ids = [row[0] for row in rows]
+        for start in range(0, len(ids), batch_size):
+            orders.filter(id__in=ids[start:start + batch_size]).purge()
+        yield season, chunk_path, len(rows)
+
+def list_archives(root=None):
+    """
+    Return the archived seasons with their chunk count and compressed size
+    """
+    root = root or settings.ORDER_ARCHIVE_ROOT
+    if not os.path.isdir(root):
+        return []
+    
+    seasons = []
+    for season in sorted(os.listdir(root)):
+        if not SEASON_PATTERN.match(season):
+            continue
+        chunks = get_chunk_paths(season, root)
+        if chunks:
+            seasons.append({
+                'season': season,
+                'chunks': len(chunks),
+                'size': sum(os.path.getsize(path) for path in chunks),
+            })
+    return seasons
+
+def iter_archive(season, root=None):
+    """
+    Yield a season's archived orders as dicts, reading the chunks as streams
+    """
+    for path in get_chunk_paths(season, root):
+        with gzip.open(path, 'rt', encoding='utf-8') as chunk:
+            for line in chunk:
+                yield json.loads(line)
+
+def filter_archive(orders, filters):
+    """
+    Filter archived orders by phone number, text and creation time, like the list filters
+    """
+    phone = normalize_phone_number(filters['phone']) if filters.get('phone') else None
+    terms = filters['q'].lower().split() if filters.get('q') else []
+    created_after = filters.get('created_after')
+    created_before = filters.get('created_before')
+    
+    for order in orders:
+        if phone and order['normalized_phone'] != phone:
+            continue
+        if terms:
+            text = f"{order['name']} {order['address']} {order['phone_number']}".lower()
+            if not all(term in text for term in terms):
+                continue
+        if created_after or created_before:
+            created_at = parse_datetime(order['created_at'])
+            if created_after and created_at < created_after:
+                continue
+            if created_before and created_at >= created_before:
+                continue
+        yield order
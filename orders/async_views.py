@@ -0,0 +1,114 @@
+import json
+import math
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponseNotAllowed, JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.throttling import BaseThrottle
+from .authentication import CachedJWTAuthentication
+from .idempotency import IDEMPOTENCY_HEADER
+from .models import Order
+from .serializers import OrderSerializer
+from .throttling import Overloaded, admission_wait, async_admission_slot
+from .views import OrderViewSet
+
+# Async counterparts of OrderViewSet.create and retrieve for the ASGI application.
+# They use the same serializer and model, so responses match the DRF views.
+
+# The DRF create view, for requests the async path doesn't handle itself
+viewset_create = OrderViewSet.as_view({'post': 'create'})
+
+async def authenticate_admin(request):
+    """
+    Authenticate a JWT request and return an error response unless the user is staff
+    """
+    authenticator = CachedJWTAuthentication()
+    try:
+        result = await sync_to_async(authenticator.authenticate)(request)
+    except AuthenticationFailed as exc:
+        # Same body DRF's exception handler would produce
+        data = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+        return JsonResponse(data, status=status.HTTP_401_UNAUTHORIZED)
+    
+    if result is None:
+        return JsonResponse(
+            {'detail': 'Authentication credentials were not provided.'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+    
+    user, _ = result
+    if not user.is_staff:
+        return JsonResponse(
+            {'detail': 'You do not have permission to perform this action.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    return None
+
+async def serialize_order(order):
+    """
+    Serialize an order off the event loop, since the WhatsApp link may read the catalog
+    """
+    return await sync_to_async(lambda: OrderSerializer(order).data)()
+
+async def order_create(request):
+    """
+    Create an order from a JSON body (public)
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    
+    # Idempotency-Key replays and queue intake go through the DRF view, throttle included
+    if IDEMPOTENCY_HEADER in request.headers or settings.ORDER_INTAKE_MODE == 'queue':
+        return await sync_to_async(lambda: viewset_create(request).render())()
+    
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'detail': 'JSON parse error.'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    phone_number = data.get('phone_number') if isinstance(data, dict) else None
+    wait = await sync_to_async(admission_wait, thread_sensitive=False)(
+        BaseThrottle().get_ident(request), phone_number
+    )
+    if wait:
+        response = JsonResponse(
+            {'detail': 'Request was throttled.'},
+            status=status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        response['Retry-After'] = str(math.ceil(wait))
+        return response
+    
+    try:
+        async with async_admission_slot():
+            serializer = OrderSerializer(data=data)
+            if not serializer.is_valid():
+                return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            
+            order = Order(**serializer.validated_data)
+            await order.asave()
+            return JsonResponse(await serialize_order(order), status=status.HTTP_201_CREATED)
+    except Overloaded as exc:
+        response = JsonResponse({'detail': exc.detail}, status=exc.status_code)
+        response['Retry-After'] = str(exc.wait)
+        return response
+
+# Requests are authenticated with JWT headers, not cookies
+order_create.csrf_exempt = True
+
+async def order_detail(request, pk):
+    """
+    Retrieve a single order (admin only)
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    
+    error = await authenticate_admin(request)
+    if error is not None:
+        return error
+    
+    order = await Order.objects.filter(pk=pk).afirst()
+    if order is None:
+        return JsonResponse({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return JsonResponse(await serialize_order(order))
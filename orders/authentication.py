@@ -0,0 +1,43 @@
+import copy
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from .cache import LRUCache
+
+# Users resolved from JWT user ids, dropped whenever the user is saved or deleted
+user_cache = LRUCache(maxsize=settings.JWT_USER_CACHE_SIZE, ttl=settings.JWT_USER_CACHE_TTL)
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that caches the user looked up for each token's user id
+    """
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        
+        key = str(user_id)
+        user = user_cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(key, user)
+        elif jwt_settings.CHECK_REVOKE_TOKEN:
+            # The revoke claim is per token, so check it on every cache hit
+            if validated_token.get(
+                jwt_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+        
+        # Hand out a copy so one request cannot change another's user
+        return copy.copy(user)
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drop a user from the cache when it is saved or deleted
+    """
+    user_cache.delete(str(getattr(instance, jwt_settings.USER_ID_FIELD)))
@@ -0,0 +1,148 @@
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+def percentile(values, pct):
+    """
+    Return the pct-th percentile of a list of numbers (nearest rank)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+@contextmanager
+def scratch_database(alias='default'):
+    """
+    Run the block against a freshly migrated throwaway database, dropped afterwards
+    """
+    connection = connections[alias]
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    tmpdir = None
+    
+    if connection.vendor == 'sqlite':
+        # A file database can be shared by the threads serving concurrent requests
+        tmpdir = tempfile.mkdtemp(prefix='lontong-bench-')
+        test_settings['NAME'] = os.path.join(tmpdir, 'bench.sqlite3')
+    
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = old_test_name
+        if tmpdir is not None:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+@contextmanager
+def simulated_db_latency(milliseconds):
+    """
+    Add a fixed delay to every query, to mimic a remote database on a local one
+    """
+    if not milliseconds:
+        yield
+        return
+    
+    delay = milliseconds / 1000
+    
+    def delayed_execute(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+    
+    def install(sender, connection, **kwargs):
+        connection.execute_wrappers.append(delayed_execute)
+    
+    for connection in connections.all():
+        connection.execute_wrappers.append(delayed_execute)
+    connection_created.connect(install)
+    try:
+        yield
+    finally:
+        connection_created.disconnect(install)
+        for connection in connections.all():
+            if delayed_execute in connection.execute_wrappers:
+                connection.execute_wrappers.remove(delayed_execute)
+
+# Run in a fresh interpreter by profile_startup(): load the WSGI application and serve one
+# request, as a serverless cold start does, then print the timings as JSON
+STARTUP_SCRIPT = """
+import importlib, io, json, sys, time
+start = time.perf_counter()
+module_name, attribute = sys.argv[1].rsplit('.', 1)
+application = getattr(importlib.import_module(module_name), attribute)
+loaded = time.perf_counter()
+statuses = []
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[2], 'QUERY_STRING': '',
+    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+    'wsgi.input': io.BytesIO(), 'wsgi.errors': io.StringIO(), 'wsgi.url_scheme': 'http',
+    'wsgi.version': (1, 0), 'wsgi.multithread': False, 'wsgi.multiprocess': True, 'wsgi.run_once': False,
+}
+b''.join(application(environ, lambda status, headers, exc_info=None: statuses.append(int(status[:3]))))
+done = time.perf_counter()
+print(json.dumps({
+    'startup_ms': (loaded - start) * 1000,
+    'first_request_ms': (done - loaded) * 1000,
+    'status': statuses[0],
+}))
+"""
+
+def parse_importtime(output):
+    """
+    Return [(module, self_us, cumulative_us)] from python -X importtime output
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # the column header
+        modules.append((fields[2].strip(), self_us, cumulative_us))
+    return modules
+
+def profile_startup(api_only=False, path='/api/orders/', runs=3):
+    """
+    Time loading the WSGI application and its first request in fresh interpreters
+
+    Returns the median timings of the runs, plus per-module import times from the first run.
+    """
+    env = dict(os.environ, API_ONLY=str(bool(api_only)), PYTHONDONTWRITEBYTECODE='1')
+    env.setdefault('DJANGO_SETTINGS_MODULE', os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'))
+    command = [sys.executable, '-c', STARTUP_SCRIPT, settings.WSGI_APPLICATION, path]
+    
+    timings = []
+    modules = None
+    for run in range(runs):
+        # Import timing adds overhead, so only the first run records it
+        args = command[:1] + ['-X', 'importtime'] + command[1:] if run == 0 else command
+        result = subprocess.run(args, capture_output=True, text=True, env=env, cwd=settings.BASE_DIR)
+        if result.returncode != 0:
+            raise RuntimeError(f'Startup failed:\n{result.stderr[-2000:]}')
+        timings.append(json.loads(result.stdout.strip().splitlines()[-1]))
+        if run == 0:
+            modules = parse_importtime(result.stderr)
+    
+    measured = timings[1:] or timings
+    report = {
+        name: round(statistics.median(timing[name] for timing in measured), 1)
+        for name in ('startup_ms', 'first_request_ms')
+    }
+    report['cold_start_ms'] = round(report['startup_ms'] + report['first_request_ms'], 1)
+    report['status'] = timings[0]['status']
+    report['module_count'] = len(modules)
+    report['modules'] = modules
+    return report
@@ -0,0 +1,83 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+def make_etag(request, *parts):
+    """
+    Build a strong ETag from the given parts, the query string and the Accept header
+    """
+    query = sorted(request.query_params.lists())
+    accept = request.META.get('HTTP_ACCEPT', '')
+    digest = hashlib.md5(repr((parts, query, accept)).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+class ConditionalGetMixin:
+    """
+    Answer list and retrieve requests with 304 Not Modified when nothing changed
+    
+    ETags come from cheap probes (MAX(updated_at) and COUNT(*) for lists, the row's
+    updated_at for details) that run before any serialization. There is no Last-Modified:
+    its whole-second dates miss writes in the same second, and deleting an order doesn't
+    move MAX(updated_at), so If-Modified-Since would answer 304 for changed orders. The
+    ETags cover both through the full timestamp and the count.
+    """
+    def get_list_etag(self):
+        """
+        Return the ETag for the filtered order list
+        """
+        probe = self.filter_queryset(self.get_queryset()).aggregate(
+            last_updated=Max('updated_at'),
+            count=Count('pk')
+        )
+        return make_etag(self.request, 'list', probe['count'], probe['last_updated'])
+    
+    def get_detail_etag(self):
+        """
+        Return the ETag for a single order, or None if it cannot be probed
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            last_updated = (
+                self.get_queryset()
+                .filter(**lookup)
+                .values_list('updated_at', flat=True)
+                .first()
+            )
+        except (TypeError, ValueError):
+            return None
+        
+        if last_updated is None:
+            return None
+        return make_etag(self.request, 'detail', lookup, last_updated)
+    
+    def conditional_response(self, etag, handler, *args, **kwargs):
+        """
+        Return 304 when the client's ETag matches, otherwise run the handler
+        """
+        if etag is None:
+            return handler(self.request, *args, **kwargs)
+        
+        not_modified = get_conditional_response(self.request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        response = handler(self.request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+    
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.get_list_etag(),
+            super().list,
+            *args, **kwargs
+        )
+    
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.get_detail_etag(),
+            super().retrieve,
+            *args, **kwargs
+        )
@@ -0,0 +1,71 @@
+import csv
+import io
+import zlib
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Columns written by the order export, in output order
+EXPORT_FIELDS = (
+    'id', 'phone_number', 'name', 'address',
+    'total_lontong_large', 'total_lontong_small',
+    'total_price', 'created_at', 'updated_at'
+)
+
+# Flush the output buffer once it grows past this many characters
+BUFFER_SIZE = 64 * 1024
+
+def iter_csv(rows):
+    """
+    Yield CSV text for the given rows, header first, in buffered chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= BUFFER_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
+def iter_ndjson(rows, fields=EXPORT_FIELDS, encoder_class=DjangoJSONEncoder):
+    """
+    Yield newline delimited JSON objects for the given rows in buffered chunks
+    
+    Rows are tuples of the given fields, or dicts when fields is None.
+    """
+    encoder = encoder_class()
+    lines = []
+    size = 0
+    
+    for row in rows:
+        line = encoder.encode(row if fields is None else dict(zip(fields, row)))
+        lines.append(line)
+        size += len(line) + 1
+        if size >= BUFFER_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+            size = 0
+    
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+def iter_gzip(chunks):
+    """
+    Compress a stream of text chunks into a single gzip stream
+    """
+    # wbits=31 selects the gzip container format
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+# Output formats supported by the export: (row encoder, content type, file extension)
+EXPORT_FORMATS = {
+    'csv': (iter_csv, 'text/csv; charset=utf-8', 'csv'),
+    'ndjson': (iter_ndjson, 'application/x-ndjson; charset=utf-8', 'ndjson'),
+}
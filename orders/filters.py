@@ -0,0 +1,100 @@
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.fields import empty
+from .search import search_orders
+
+class OptionalBooleanField(serializers.BooleanField):
+    """
+    Boolean query parameter that is left out when missing instead of read as false
+    """
+    default_empty_html = empty
+
+class OrderFilterSerializer(serializers.Serializer):
+    """
+    Serializer for validating order list query parameters
+    """
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    updated_since = serializers.DateTimeField(required=False)
+    min_total = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    max_total = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    has_large = OptionalBooleanField(required=False)
+    has_small = OptionalBooleanField(required=False)
+    q = serializers.CharField(required=False, max_length=200)
+
+class WhatsAppLinkBatchSerializer(serializers.Serializer):
+    """
+    Serializer for selecting the orders of a batch WhatsApp link request
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=settings.WHATSAPP_LINK_BATCH_MAX_IDS
+    )
+    filters = serializers.DictField(required=False)
+    
+    def validate_filters(self, value):
+        # A typo would otherwise silently select, and message, every order
+        if not value:
+            raise serializers.ValidationError('Provide at least one filter.')
+        unknown = sorted(set(value) - set(OrderFilterSerializer().fields))
+        if unknown:
+            raise serializers.ValidationError(f"Unknown filters: {', '.join(unknown)}.")
+        return value
+    
+    def validate(self, attrs):
+        if 'ids' not in attrs and 'filters' not in attrs:
+            raise serializers.ValidationError('Provide ids, filters or both.')
+        return attrs
+
+class ArchiveFilterSerializer(serializers.Serializer):
+    """
+    Serializer for validating season archive query parameters
+    """
+    phone = serializers.RegexField(r'^\+?\d{9,17}$', required=False)
+    q = serializers.CharField(required=False, max_length=200)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+
+class DailySummaryFilterSerializer(serializers.Serializer):
+    """
+    Serializer for validating the daily summary date range
+    """
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+# Each filter maps to a lookup served by one of the indexes on Order.Meta
+FILTER_LOOKUPS = {
+    'created_after': 'created_at__gte',
+    'created_before': 'created_at__lt',
+    'updated_since': 'updated_at__gte',
+    'min_total': 'total_price__gte',
+    'max_total': 'total_price__lte',
+}
+
+def filter_orders(queryset, params):
+    """
+    Apply the validated query parameter filters to an order queryset
+    """
+    serializer = OrderFilterSerializer(data=params)
+    serializer.is_valid(raise_exception=True)
+    filters = serializer.validated_data
+    
+    lookups = {
+        lookup: filters[name]
+        for name, lookup in FILTER_LOOKUPS.items()
+        if name in filters
+    }
+    
+    # true selects orders with that size and false those without it, each matching a partial index
+    for name, field in (('has_large', 'total_lontong_large'), ('has_small', 'total_lontong_small')):
+        if name in filters:
+            lookups[f'{field}__gt' if filters[name] else field] = 0
+    
+    queryset = queryset.filter(**lookups)
+    
+    # Full-text matches come back ranked, best first
+    if filters.get('q'):
+        queryset = search_orders(queryset, filters['q'])
+    return queryset
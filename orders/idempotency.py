@@ -0,0 +1,120 @@
+import hashlib
+import json
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+class DiscardKey(Exception):
+    """
+    Raised to roll back a key whose request did not succeed, so the client can retry
+    """
+    def __init__(self, response):
+        self.response = response
+
+def hash_key(request, key):
+    """
+    Return the stored form of a client supplied key, scoped to the client that sent it
+    
+    Clients are the authenticated user, or else the IP address, so two clients that
+    pick the same key never get each other's responses.
+    """
+    if request.user and request.user.is_authenticated:
+        client = f'user:{request.user.pk}'
+    else:
+        client = f'ip:{BaseThrottle().get_ident(request)}'
+    return hashlib.sha256(f'{client}\n{key}'.encode('utf-8')).hexdigest()
+
+def get_request_key(request):
+    """
+    Return the hashed Idempotency-Key of a request, or None if it was sent without one
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        return None
+    if not key or len(key) > 255:
+        raise ValidationError({IDEMPOTENCY_HEADER: ['Must be between 1 and 255 characters.']})
+    return hash_key(request, key)
+
+def has_stored_key(request):
+    """
+    Return True if the request's Idempotency-Key is already stored, so it will only be replayed
+    """
+    key = get_request_key(request)
+    return key is not None and IdempotencyKey.objects.filter(key=key, expires_at__gt=timezone.now()).exists()
+
+def fingerprint_request(request):
+    """
+    Return a digest of the method, path and body so reused keys can be detected
+    """
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    payload = f"{request.method} {request.path}\n{body}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def replay(record, fingerprint):
+    """
+    Return the stored response for an existing key
+    """
+    if record.fingerprint != fingerprint:
+        return Response(
+            {'detail': f'{IDEMPOTENCY_HEADER} was already used with a different request.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    if record.status_code is None:
+        return Response(
+            {'detail': f'A request with this {IDEMPOTENCY_HEADER} is still being processed.'},
+            status=status.HTTP_409_CONFLICT
+        )
+    return Response(
+        record.response_body,
+        status=record.status_code,
+        headers={'Idempotent-Replayed': 'true'}
+    )
+
+def idempotent(request, handler):
+    """
+    Run handler once per Idempotency-Key and replay its stored response for repeats
+    
+    The key row is inserted before the handler runs and relies on the unique
+    constraint: a concurrent duplicate blocks on the insert until the first request
+    commits, then replays its response. Unsuccessful responses are rolled back with
+    the key so the client can fix the request and retry.
+    """
+    key = get_request_key(request)
+    if key is None:
+        return handler()
+    
+    fingerprint = fingerprint_request(request)
+    now = timezone.now()
+    
+    # Clear an expired entry so the key can be used again
+    IdempotencyKey.objects.filter(key=key, expires_at__lte=now).delete()
+    
+    try:
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        key=key,
+                        fingerprint=fingerprint,
+                        expires_at=now + settings.IDEMPOTENCY_KEY_TTL
+                    )
+            except IntegrityError:
+                return replay(IdempotencyKey.objects.get(key=key), fingerprint)
+            
+            response = handler()
+            if not status.is_success(response.status_code):
+                raise DiscardKey(response)
+            
+            record.status_code = response.status_code
+            record.response_body = response.data
+            record.save(update_fields=['status_code', 'response_body'])
+            return response
+    except DiscardKey as exc:
+        return exc.response
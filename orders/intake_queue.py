@@ -0,0 +1,157 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from django.conf import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS intake_ticket (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    order_id INTEGER,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS intake_ticket_status_seq ON intake_ticket (status, seq);
+"""
+
+class IntakeQueue:
+    """
+    Durable local queue of validated order submissions, stored in a SQLite WAL database
+    
+    Tickets move from 'queued' to 'processing' when a worker claims them and end as
+    'done' (with the created order id) or 'failed'. Delivery is at-least-once: a worker
+    that dies after inserting orders but before completing its tickets leaves them to
+    be claimed again once they go stale.
+    """
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+    
+    @property
+    def connection(self):
+        """
+        Return this thread's connection, creating the schema on first use
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+        return connection
+    
+    def enqueue(self, payload):
+        """
+        Append a submission to the queue and return its ticket id
+        """
+        ticket = uuid.uuid4().hex
+        now = time.time()
+        self.connection.execute(
+            'INSERT INTO intake_ticket (ticket, payload, created_at, updated_at) VALUES (?, ?, ?, ?)',
+            (ticket, json.dumps(payload), now, now)
+        )
+        return ticket
+    
+    def claim(self, limit):
+        """
+        Mark up to limit queued tickets as processing and return [(ticket, payload)]
+        """
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers never claim the same ticket
+        with self.transaction('BEGIN IMMEDIATE') as connection:
+            rows = connection.execute(
+                "SELECT seq, ticket, payload FROM intake_ticket WHERE status = 'queued' ORDER BY seq LIMIT ?",
+                (limit,)
+            ).fetchall()
+            if rows:
+                connection.execute(
+                    f"UPDATE intake_ticket SET status = 'processing', updated_at = ? "
+                    f"WHERE seq IN ({', '.join('?' * len(rows))})",
+                    (time.time(), *(row[0] for row in rows))
+                )
+        return [(ticket, json.loads(payload)) for _, ticket, payload in rows]
+    
+    def complete(self, order_ids):
+        """
+        Mark tickets as done, given a {ticket: order_id} mapping
+        """
+        now = time.time()
+        with self.transaction() as connection:
+            connection.executemany(
+                "UPDATE intake_ticket SET status = 'done', order_id = ?, updated_at = ? WHERE ticket = ?",
+                [(order_id, now, ticket) for ticket, order_id in order_ids.items()]
+            )
+    
+    def fail(self, errors):
+        """
+        Mark tickets as failed, given a {ticket: error} mapping
+        """
+        now = time.time()
+        with self.transaction() as connection:
+            connection.executemany(
+                "UPDATE intake_ticket SET status = 'failed', error = ?, updated_at = ? WHERE ticket = ?",
+                [(json.dumps(error), now, ticket) for ticket, error in errors.items()]
+            )
+    
+    def requeue_stale(self, older_than):
+        """
+        Put tickets stuck in processing for more than older_than seconds back in the queue
+        """
+        cursor = self.connection.execute(
+            "UPDATE intake_ticket SET status = 'queued', updated_at = ? "
+            "WHERE status = 'processing' AND updated_at < ?",
+            (time.time(), time.time() - older_than)
+        )
+        return cursor.rowcount
+    
+    def status(self, ticket):
+        """
+        Return the state of a ticket as a dict, or None if it is unknown
+        """
+        row = self.connection.execute(
+            'SELECT status, order_id, error FROM intake_ticket WHERE ticket = ?',
+            (ticket,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        status, order_id, error = row
+        return {
+            'ticket': ticket,
+            'status': status,
+            'order_id': order_id,
+            'errors': json.loads(error) if error else None,
+        }
+    
+    @contextmanager
+    def transaction(self, begin='BEGIN'):
+        """
+        Run the block in a transaction on this thread's connection
+        """
+        connection = self.connection
+        connection.execute(begin)
+        try:
+            yield connection
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+def get_intake_queue():
+    """
+    Return the process-wide queue for settings.ORDER_INTAKE_QUEUE_PATH
+    """
+    path = str(settings.ORDER_INTAKE_QUEUE_PATH)
+    with _queues_lock:
+        if path not in _queues:
+            _queues[path] = IntakeQueue(path)
+        return _queues[path]
@@ -0,0 +1,68 @@
+from collections import Counter
+from datetime import datetime, time, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from orders.archive import archive_orders, get_season, get_season_starts
+from orders.models import Order
+
+class Command(BaseCommand):
+    help = 'Moves orders created before a cutoff into gzip NDJSON season archives'
+
+    def add_arguments(self, parser):
+        cutoff = parser.add_mutually_exclusive_group(required=True)
+        cutoff.add_argument('--before', help='Archive orders created before this day (YYYY-MM-DD)')
+        cutoff.add_argument('--older-than-days', type=int, help='Archive orders created more than this many days ago')
+        parser.add_argument('--chunk-size', type=int, help='Orders per archive file (default ORDER_ARCHIVE_CHUNK_SIZE)')
+        parser.add_argument('--batch-size', type=int, help='Orders deleted per statement (default ORDER_ARCHIVE_DELETE_BATCH_SIZE)')
+        parser.add_argument('--output-dir', help='Archive directory (default ORDER_ARCHIVE_ROOT)')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many orders each season would archive')
+
+    def handle(self, *args, **options):
+        before = self.get_cutoff(options)
+
+        if options['dry_run']:
+            self.report_seasons(before)
+            return
+
+        totals = Counter()
+        for season, path, count in archive_orders(
+            before,
+            chunk_size=options['chunk_size'],
+            batch_size=options['batch_size'],
+            root=options['output_dir'],
+        ):
+            totals[season] += count
+            self.stdout.write(f'{season}: archived {count} orders to {path}')
+
+        if not totals:
+            self.stdout.write(f'No orders created before {before:%Y-%m-%d %H:%M %Z}')
+            return
+        summary = ', '.join(f'{season}: {count}' for season, count in sorted(totals.items()))
+        self.stdout.write(self.style.SUCCESS(f'Archived {sum(totals.values())} orders ({summary})'))
+
+    def get_cutoff(self, options):
+        """
+        Return the aware datetime orders must be created before to be archived
+        """
+        if options['older_than_days'] is not None:
+            if options['older_than_days'] < 1:
+                raise CommandError('--older-than-days must be at least 1')
+            day = timezone.localdate() - timedelta(days=options['older_than_days'])
+        else:
+            day = parse_date(options['before'])
+            if day is None:
+                raise CommandError('--before must be a date in YYYY-MM-DD format')
+            if day > timezone.localdate():
+                raise CommandError('--before must not be in the future')
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    def report_seasons(self, before):
+        starts = get_season_starts()
+        totals = Counter()
+        for row in Order.objects.filter(created_at__lt=before).daily_totals():
+            totals[get_season(row['day'], starts)] += row['order_count']
+
+        for season, count in sorted(totals.items()):
+            self.stdout.write(f'{season}: {count} orders would be archived')
+        self.stdout.write(f'{sum(totals.values())} orders in total')
@@ -0,0 +1,169 @@
+import json
+import platform
+import subprocess
+import time
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from orders.benchmarking import percentile, scratch_database
+from orders.models import Order
+
+class Command(BaseCommand):
+    help = 'Benchmarks the order API in process and reports latency percentiles and query counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=2000, help='Orders to seed')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per operation')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per operation')
+        parser.add_argument('--page-size', type=int, default=50, help='Page size for list requests')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        # Runs against a scratch database, without admission control throttling the client
+        admission = dict(settings.ORDER_ADMISSION, ENABLED=False)
+        with scratch_database(), override_settings(ORDER_ADMISSION=admission):
+            self.seed(options['orders'])
+            results = self.run_operations(options)
+
+        report = {
+            'meta': self.get_meta(options),
+            'operations': results,
+        }
+        self.print_report(results)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def seed(self, count):
+        self.admin_user = User.objects.create_superuser(
+            username='bench-admin',
+            email='bench@example.com',
+            password='bench-password'
+        )
+        Order.objects.create_batch([
+            Order(
+                phone_number=f'+62812{index:08d}',
+                name=f'Bench Customer {index}',
+                address=f'{index} Benchmark Street, Jakarta',
+                total_lontong_large=index % 5,
+                total_lontong_small=index % 3
+            )
+            for index in range(count)
+        ], batch_size=500)
+        self.order = Order.objects.order_by('id').first()
+
+    def get_operations(self, options):
+        """
+        Return {name: callable(client, iteration)} for the operations to time
+        """
+        page_size = options['page_size']
+        last_page = max(1, -(-options['orders'] // page_size))
+        list_url = reverse('order-list')
+        detail_url = reverse('order-detail', args=[self.order.id])
+        whatsapp_url = reverse('order-send-whatsapp', args=[self.order.id])
+
+        def list_page(page):
+            return lambda client, i: client.get(list_url, {'page': page, 'page_size': page_size})
+
+        def serialized_list_page(page):
+            # The same request through OrderSerializer, to compare with the values() fast path
+            def operation(client, i):
+                with override_settings(ORDER_LIST_FAST_PATH=False):
+                    return client.get(list_url, {'page': page, 'page_size': page_size})
+            return operation
+
+        def create(client, i):
+            return client.post(list_url, {
+                'phone_number': f'+62813{i:08d}',
+                'name': f'Bench New Customer {i}',
+                'address': 'Benchmark Street',
+                'total_lontong_large': 1,
+                'total_lontong_small': 2,
+            }, format='json')
+
+        def update(client, i):
+            return client.patch(detail_url, {'address': f'{i} Updated Street'}, format='json')
+
+        return {
+            'list_first_page': list_page(1),
+            'list_middle_page': list_page(max(1, last_page // 2)),
+            'list_last_page': list_page(last_page),
+            'list_first_page_serializer': serialized_list_page(1),
+            'list_cursor_first_page': lambda client, i: client.get(
+                list_url, {'pagination': 'cursor', 'page_size': page_size}
+            ),
+            'detail': lambda client, i: client.get(detail_url),
+            'create': create,
+            'update': update,
+            'send_whatsapp': lambda client, i: client.post(whatsapp_url),
+        }
+
+    def run_operations(self, options):
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        results = {}
+
+        for name, operation in self.get_operations(options).items():
+            # Warmup iterations follow the timed ones, so operations can use i in unique values
+            for i in range(options['iterations'], options['iterations'] + options['warmup']):
+                self.check_response(name, operation(client, i))
+
+            timings = []
+            queries = []
+            for i in range(options['iterations']):
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    response = operation(client, i)
+                    timings.append((time.perf_counter() - start) * 1000)
+                queries.append(len(captured))
+                self.check_response(name, response)
+
+            results[name] = {
+                'p50_ms': round(percentile(timings, 50), 3),
+                'p95_ms': round(percentile(timings, 95), 3),
+                'p99_ms': round(percentile(timings, 99), 3),
+                'mean_ms': round(sum(timings) / len(timings), 3),
+                'queries': max(queries),
+            }
+        return results
+
+    def check_response(self, name, response):
+        if response.status_code >= 400:
+            raise RuntimeError(f'{name} failed with {response.status_code}: {response.content[:200]}')
+
+    def get_meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'],
+                capture_output=True, text=True, check=True, cwd=settings.BASE_DIR
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+
+        return {
+            'commit': commit,
+            'timestamp': timezone.now().isoformat(),
+            'orders': options['orders'],
+            'iterations': options['iterations'],
+            'page_size': options['page_size'],
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        }
+
+    def print_report(self, results):
+        self.stdout.write(f"{'operation':<28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<28} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                f"{result['p99_ms']:>9.2f} {result['queries']:>8}"
+            )
@@ -0,0 +1,54 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from orders.intake_queue import get_intake_queue
+from orders.models import Order
+from orders.serializers import OrderSerializer
+
+class Command(BaseCommand):
+    help = 'Drains queued order submissions into the database in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.ORDER_BULK_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new submissions')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        queue = get_intake_queue()
+        requeued = queue.requeue_stale(settings.ORDER_INTAKE_STALE_AFTER)
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale submissions'))
+
+        total = 0
+        while True:
+            batch = queue.claim(options['batch_size'])
+            if batch:
+                total += self.process(queue, batch)
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Created {total} orders from the queue'))
+
+    def process(self, queue, batch):
+        tickets = []
+        orders = []
+        errors = {}
+        for ticket, payload in batch:
+            # Submissions were validated on intake; validate again in case the rules changed since
+            serializer = OrderSerializer(data=payload)
+            if serializer.is_valid():
+                tickets.append(ticket)
+                orders.append(Order(**serializer.validated_data))
+            else:
+                errors[ticket] = serializer.errors
+
+        if errors:
+            queue.fail(errors)
+        if not orders:
+            return 0
+
+        orders = Order.objects.create_batch(orders)
+        queue.complete({ticket: order.id for ticket, order in zip(tickets, orders)})
+        return len(orders)
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.test import AsyncClient
+from django.urls import reverse
+from orders.benchmarking import percentile, scratch_database, simulated_db_latency
+
+class Command(BaseCommand):
+    help = 'Compares order intake throughput of the DRF create view and the async view under ASGI'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300, help='Orders submitted per path')
+        parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight at once')
+        parser.add_argument(
+            '--db-latency-ms',
+            type=float,
+            default=0,
+            help='Delay added to every query to mimic a remote database'
+        )
+
+    def handle(self, *args, **options):
+        paths = {
+            'sync (OrderViewSet.create)': reverse('order-list'),
+            'async (order_create)': reverse('async-order-create'),
+        }
+
+        # Runs against a scratch database so no real orders are created, and without
+        # admission control, which would otherwise throttle the single load test client
+        admission = dict(settings.ORDER_ADMISSION, ENABLED=False)
+        with scratch_database(), simulated_db_latency(options['db_latency_ms']), \
+                override_settings(ORDER_ADMISSION=admission):
+            for label, path in paths.items():
+                result = asyncio.run(self.run_load(path, options['requests'], options['concurrency']))
+                self.report(label, result)
+
+    async def run_load(self, path, total, concurrency):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        statuses = Counter()
+
+        async def submit(index):
+            payload = {
+                'phone_number': f'+62812{index:08d}',
+                'name': f'Load Test {index}',
+                'address': 'Load Test Street',
+                'total_lontong_large': 1,
+                'total_lontong_small': 1,
+            }
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(path, payload, content_type='application/json')
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(submit(index) for index in range(total)))
+        elapsed = time.perf_counter() - start
+
+        return {
+            'elapsed': elapsed,
+            'throughput': total / elapsed if elapsed else 0.0,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'statuses': dict(statuses),
+        }
+
+    def report(self, label, result):
+        self.stdout.write(
+            f"{label}: {result['throughput']:.1f} req/s "
+            f"(p50 {result['p50'] * 1000:.1f} ms, p95 {result['p95'] * 1000:.1f} ms, "
+            f"statuses {result['statuses']})"
+        )
@@ -0,0 +1,68 @@
+import json
+from collections import defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from orders.benchmarking import profile_startup
+
+class Command(BaseCommand):
+    help = 'Measures cold-start time of the WSGI application and reports per-module import times'
+
+    def add_arguments(self, parser):
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument('--api-only', action='store_true', help='Profile API-only mode')
+        mode.add_argument('--compare', action='store_true', help='Profile the full and API-only modes')
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters started per mode')
+        parser.add_argument('--top', type=int, default=20, help='Slowest modules and packages to list')
+        parser.add_argument('--path', default='/api/orders/', help='Path of the first request')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        if options['compare']:
+            modes = {'full': False, 'api-only': True}
+        elif options['api_only']:
+            modes = {'api-only': True}
+        else:
+            modes = {'api-only' if settings.API_ONLY else 'full': settings.API_ONLY}
+
+        results = {}
+        for label, api_only in modes.items():
+            results[label] = report = profile_startup(api_only, options['path'], options['runs'])
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{label} mode'))
+            self.stdout.write(
+                f"startup {report['startup_ms']:.1f} ms + first request {report['first_request_ms']:.1f} ms "
+                f"(status {report['status']}) = {report['cold_start_ms']:.1f} ms, "
+                f"{report['module_count']} modules imported"
+            )
+            self.print_modules(report['modules'], options['top'])
+
+        if options['compare']:
+            full, api_only = results['full'], results['api-only']
+            saved = full['cold_start_ms'] - api_only['cold_start_ms']
+            self.stdout.write(self.style.SUCCESS(
+                f"\nAPI-only mode saves {saved:.1f} ms "
+                f"({saved / full['cold_start_ms']:.0%}) and {full['module_count'] - api_only['module_count']} imports"
+            ))
+            skipped = {name for name, _, _ in full['modules']} - {name for name, _, _ in api_only['modules']}
+            self.print_modules([module for module in full['modules'] if module[0] in skipped], options['top'],
+                               title='Slowest imports skipped in API-only mode')
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def print_modules(self, modules, top, title='Slowest imports'):
+        """
+        Print the modules with the most import time of their own, and the same summed per package
+        """
+        packages = defaultdict(int)
+        for name, self_us, _ in modules:
+            packages['.'.join(name.split('.')[:2])] += self_us
+
+        self.stdout.write(f'{title} (self ms / cumulative ms):')
+        for name, self_us, cumulative_us in sorted(modules, key=lambda module: -module[1])[:top]:
+            self.stdout.write(f'  {self_us / 1000:8.1f} {cumulative_us / 1000:9.1f}  {name}')
+
+        self.stdout.write('By package (self ms):')
+        for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            self.stdout.write(f'  {self_us / 1000:8.1f}  {name}')
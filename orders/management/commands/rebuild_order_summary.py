@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from orders.models import DailyOrderSummary
+
+class Command(BaseCommand):
+    help = 'Rebuilds the daily order summary table from the orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last day to rebuild (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        start = self.parse_day(options['start'], 'start')
+        end = self.parse_day(options['end'], 'end')
+
+        summaries = DailyOrderSummary.rebuild(start=start, end=end)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(summaries)} daily summaries'))
+
+    def parse_day(self, value, name):
+        if value is None:
+            return None
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f'--{name} must be a date in YYYY-MM-DD format')
+        return day
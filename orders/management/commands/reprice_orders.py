@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from orders.models import Order, PriceCatalog
+
+class Command(BaseCommand):
+    help = 'Reprices the orders created in a date range with a price catalog version'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, help='First order day to reprice (YYYY-MM-DD)')
+        parser.add_argument('--end', required=True, help='Last order day to reprice (YYYY-MM-DD)')
+        parser.add_argument(
+            '--catalog',
+            type=int,
+            help='Price catalog version id (defaults to the version in effect now)'
+        )
+
+    def handle(self, *args, **options):
+        start = self.parse_day(options['start'], 'start')
+        end = self.parse_day(options['end'], 'end')
+        if start > end:
+            raise CommandError('--start must not be after --end')
+
+        if options['catalog'] is not None:
+            catalog = PriceCatalog.objects.filter(pk=options['catalog']).first()
+            if catalog is None:
+                raise CommandError(f"Price catalog {options['catalog']} does not exist")
+        else:
+            catalog = PriceCatalog.get_current()
+            if catalog is None:
+                raise CommandError('No price catalog version is in effect')
+
+        orders = Order.objects.filter(created_at__date__gte=start, created_at__date__lte=end)
+        updated = orders.reprice(catalog)
+
+        self.stdout.write(self.style.SUCCESS(f'Repriced {updated} orders with {catalog}'))
+
+    def parse_day(self, value, name):
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f'--{name} must be a date in YYYY-MM-DD format')
+        return day
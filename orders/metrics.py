@@ -0,0 +1,328 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from core.pooled_postgresql.pool import pools
+from .permissions import IsAdminUser
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+REQUEST_LABELS = ('route', 'action', 'method', 'status')
+TIMING_LABELS = ('route', 'action')
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(names, values, extra=''):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """
+    Monotonic counter keyed by a tuple of label values
+    """
+    kind = 'counter'
+    
+    def __init__(self, name, documentation, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values = {}
+        self.lock = threading.Lock()
+    
+    def inc(self, label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+    
+    def samples(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        for label_values, value in items:
+            yield f'{self.name}{format_labels(self.labels, label_values)} {format_number(value)}'
+    
+    def reset(self):
+        with self.lock:
+            self.values.clear()
+
+class Histogram:
+    """
+    Cumulative histogram with fixed upper bounds, keyed by a tuple of label values
+    """
+    kind = 'histogram'
+    
+    def __init__(self, name, documentation, labels, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self.lock = threading.Lock()
+    
+    def observe(self, label_values, value):
+        # Counts are stored per bucket and only accumulated when rendering
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(label_values)
+            if state is None:
+                state = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0]
+            state[0][index] += 1
+            state[1] += value
+    
+    def samples(self):
+        with self.lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self.values.items())
+        for label_values, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="' + format_number(bound) + '"'
+                yield f'{self.name}_bucket{format_labels(self.labels, label_values, le)} {cumulative}'
+            labels = format_labels(self.labels, label_values)
+            yield f'{self.name}_sum{labels} {format_number(total)}'
+            yield f'{self.name}_count{labels} {cumulative}'
+    
+    def reset(self):
+        with self.lock:
+            self.values.clear()
+
+class PoolMetric:
+    """
+    Gauge or counter read from the database connection pools' stats when rendering
+    
+    stats maps each value of the optional extra label to the stats key it reports.
+    """
+    def __init__(self, name, documentation, kind, stats, label=None):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.stats = stats
+        self.labels = ('alias', label) if label else ('alias',)
+    
+    def samples(self):
+        for alias, pool in sorted(pools.items()):
+            stats = pool.stats()
+            for label_value, key in self.stats.items():
+                label_values = (alias, label_value) if label_value else (alias,)
+                yield f'{self.name}{format_labels(self.labels, label_values)} {format_number(stats[key])}'
+    
+    def reset(self):
+        # The pools own these values
+        pass
+
+class Registry:
+    """
+    Collection of metrics rendered together in the Prometheus text format
+    """
+    def __init__(self):
+        self.metrics = []
+    
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+    
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+    
+    def reset(self):
+        for metric in self.metrics:
+            metric.reset()
+
+registry = Registry()
+
+requests_total = registry.register(Counter(
+    'orders_http_requests_total', 'HTTP requests handled.', REQUEST_LABELS
+))
+request_duration = registry.register(Histogram(
+    'orders_http_request_duration_seconds', 'Time spent handling HTTP requests.',
+    TIMING_LABELS, LATENCY_BUCKETS
+))
+response_size = registry.register(Histogram(
+    'orders_http_response_size_bytes', 'Size of HTTP response bodies.',
+    TIMING_LABELS, SIZE_BUCKETS
+))
+db_queries = registry.register(Histogram(
+    'orders_db_queries_per_request', 'SQL queries executed per HTTP request.',
+    TIMING_LABELS, QUERY_COUNT_BUCKETS
+))
+db_duration = registry.register(Histogram(
+    'orders_db_query_duration_seconds_per_request', 'Time spent in SQL queries per HTTP request.',
+    TIMING_LABELS, LATENCY_BUCKETS
+))
+
+pool_size = registry.register(PoolMetric(
+    'orders_db_pool_max_size', 'Most connections the pool will open.', 'gauge', {'': 'max_size'}
+))
+pool_connections = registry.register(PoolMetric(
+    'orders_db_pool_connections', 'Connections owned by the pool.', 'gauge',
+    {'idle': 'idle', 'in_use': 'in_use'}, label='state'
+))
+pool_checkouts = registry.register(PoolMetric(
+    'orders_db_pool_checkouts_total', 'Connections handed out by the pool.', 'counter', {'': 'checkouts'}
+))
+pool_created = registry.register(PoolMetric(
+    'orders_db_pool_connections_created_total', 'Connections opened by the pool.', 'counter', {'': 'created'}
+))
+pool_closed = registry.register(PoolMetric(
+    'orders_db_pool_connections_closed_total', 'Connections closed by the pool.', 'counter',
+    {'expired': 'closed_expired', 'idle': 'closed_idle', 'broken': 'closed_broken'}, label='reason'
+))
+pool_ping_failures = registry.register(PoolMetric(
+    'orders_db_pool_ping_failures_total', 'Idle connections that failed their health check.', 'counter',
+    {'': 'ping_failures'}
+))
+pool_waits = registry.register(PoolMetric(
+    'orders_db_pool_waits_total', 'Checkouts that had to wait for a free connection.', 'counter', {'': 'waits'}
+))
+pool_wait_seconds = registry.register(PoolMetric(
+    'orders_db_pool_wait_seconds_total', 'Time spent waiting for a free connection.', 'counter',
+    {'': 'wait_seconds'}
+))
+pool_timeouts = registry.register(PoolMetric(
+    'orders_db_pool_timeouts_total', 'Checkouts that gave up waiting for a connection.', 'counter',
+    {'': 'timeouts'}
+))
+
+class QueryTimer:
+    """
+    Execute wrapper counting the queries run while it is the current timer, and the time they took
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+    
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+# Timer of the request being handled. Connections are per thread, and the async ORM runs
+# queries in sync_to_async threads that copy this context, so every connection gets one
+# wrapper reporting to whichever timer its caller set
+current_timer = ContextVar('current_timer', default=None)
+
+def time_query(execute, sql, params, many, context):
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+def install_query_timer(sender, connection, **kwargs):
+    """
+    connection_created handler: add the timing wrapper to a newly opened connection
+    """
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+@contextmanager
+def timing_queries(timer):
+    """
+    Count the queries run in this context, on any thread or connection, with timer
+    """
+    token = current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        current_timer.reset(token)
+
+def resolve_labels(request):
+    """
+    Return (route, action) for a handled request, using the URL name rather than the raw path
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched', ''
+
+    route = match.view_name or match.route
+    # Router-generated viewset views know which action handles each HTTP method
+    actions = getattr(match.func, 'actions', None) or {}
+    return route, actions.get(request.method.lower(), '')
+
+def get_response_size(response):
+    if response.streaming:
+        length = response.get('Content-Length')
+        return int(length) if length else None
+    return len(response.content)
+
+class MetricsMiddleware:
+    """
+    Records request counts, latency, response sizes and SQL usage per route and viewset action
+    
+    Sync and async capable like Django's own middleware, so under ASGI async views are
+    reached without a detour through sync_to_async.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with timing_queries(timer):
+            response = self.get_response(request)
+        self.record(request, response, timer, time.perf_counter() - start)
+        return response
+    
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with timing_queries(timer):
+            response = await self.get_response(request)
+        self.record(request, response, timer, time.perf_counter() - start)
+        return response
+    
+    def record(self, request, response, timer, elapsed):
+        route, action = resolve_labels(request)
+        labels = (route, action)
+        requests_total.inc((route, action, request.method, str(response.status_code)))
+        request_duration.observe(labels, elapsed)
+        db_queries.observe(labels, timer.count)
+        db_duration.observe(labels, timer.duration)
+
+        size = get_response_size(response)
+        if size is not None:
+            response_size.observe(labels, size)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def metrics_view(request):
+    """
+    Expose the collected metrics in the Prometheus text format (admin only)
+    """
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.10 on 2026-10-18 12:54
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def build_daily_summaries(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    DailyOrderSummary = apps.get_model('orders', 'DailyOrderSummary')
+    db_alias = schema_editor.connection.alias
+
+    rows = (
+        Order.objects.using(db_alias)
+        .order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values('day')
+        .annotate(
+            order_count=Count('id'),
+            large=Sum('total_lontong_large'),
+            small=Sum('total_lontong_small'),
+            revenue=Sum('total_price'),
+        )
+    )
+    DailyOrderSummary.objects.using(db_alias).bulk_create([
+        DailyOrderSummary(
+            date=row['day'],
+            order_count=row['order_count'],
+            total_lontong_large=row['large'],
+            total_lontong_small=row['small'],
+            revenue=row['revenue'],
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_order_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyOrderSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('order_count', models.IntegerField(default=0)),
+                ('total_lontong_large', models.IntegerField(default=0)),
+                ('total_lontong_small', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.RunPython(build_daily_summaries, migrations.RunPython.noop),
+    ]
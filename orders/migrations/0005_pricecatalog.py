@@ -0,0 +1,33 @@
+# Generated by Django 4.2.10 on 2026-10-18 12:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_dailyordersummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceCatalog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('large_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('small_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('effective_from', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-effective_from', '-id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='price_catalog',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='orders', to='orders.pricecatalog'),
+        ),
+    ]
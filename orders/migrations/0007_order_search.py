@@ -0,0 +1,52 @@
+# Generated by Django 4.2.10 on 2026-10-18 13:20
+
+from django.db import migrations
+from orders.search import FTS_TABLE, get_search_vector, install_sqlite_search
+
+SEARCH_INDEX = 'order_search_idx'
+PHONE_TRIGRAM_INDEX = 'order_phone_trgm_idx'
+
+
+def get_postgresql_indexes():
+    from django.contrib.postgres.indexes import GinIndex, OpClass
+
+    return [
+        GinIndex(get_search_vector(), name=SEARCH_INDEX),
+        GinIndex(OpClass('phone_number', name='gin_trgm_ops'), name=PHONE_TRIGRAM_INDEX),
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for index in get_postgresql_indexes():
+            schema_editor.add_index(Order, index)
+    elif vendor == 'sqlite':
+        install_sqlite_search(schema_editor.connection, rebuild=True)
+
+
+def drop_search_index(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        for index in get_postgresql_indexes():
+            schema_editor.remove_index(Order, index)
+    elif vendor == 'sqlite':
+        for suffix in ('insert', 'delete', 'update'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
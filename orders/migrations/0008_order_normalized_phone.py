@@ -0,0 +1,36 @@
+# Generated by Django 4.2.10 on 2026-10-18 13:15
+
+from django.db import migrations, models
+from orders.phones import normalize_phone_number
+
+
+def backfill_normalized_phone(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    orders = Order.objects.using(schema_editor.connection.alias)
+
+    # One UPDATE per distinct number as entered; repeat customers share a row here
+    phone_numbers = orders.order_by().values_list('phone_number', flat=True).distinct()
+    for phone_number in list(phone_numbers):
+        orders.filter(phone_number=phone_number).update(
+            normalized_phone=normalize_phone_number(phone_number)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_order_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='normalized_phone',
+            field=models.CharField(default='', editable=False, max_length=17),
+        ),
+        migrations.RunPython(backfill_normalized_phone, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['normalized_phone', '-created_at', '-id'], name='order_customer_idx'),
+        ),
+    ]
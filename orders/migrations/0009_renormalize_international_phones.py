@@ -0,0 +1,27 @@
+from django.db import migrations
+from orders.phones import normalize_phone_number
+
+
+def renormalize_international_phones(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    orders = Order.objects.using(schema_editor.connection.alias)
+
+    # Numbers entered as +8... or 00... were given a 62 prefix they never had
+    phone_numbers = (
+        orders.filter(phone_number__startswith='+8') | orders.filter(phone_number__startswith='00')
+    ).order_by().values_list('phone_number', flat=True).distinct()
+    for phone_number in list(phone_numbers):
+        orders.filter(phone_number=phone_number).update(
+            normalized_phone=normalize_phone_number(phone_number)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_order_normalized_phone'),
+    ]
+
+    operations = [
+        migrations.RunPython(renormalize_international_phones, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.10 on 2026-10-18 13:57
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def mark_archived_days(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    DailyOrderSummary = apps.get_model('orders', 'DailyOrderSummary')
+    db_alias = schema_editor.connection.alias
+
+    # Days that still count orders but have none left were emptied by archive_orders
+    live_days = (
+        Order.objects.using(db_alias)
+        .order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values_list('day', flat=True)
+        .distinct()
+    )
+    DailyOrderSummary.objects.using(db_alias).filter(order_count__gt=0).exclude(
+        date__in=set(live_days)
+    ).update(archived=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0009_renormalize_international_phones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyordersummary',
+            name='archived',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_archived_days, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.10 on 2026-10-18 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0010_dailyordersummary_archived'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('total_lontong_large', 0)), fields=['-created_at', '-id'], name='order_no_large_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('total_lontong_small', 0)), fields=['-created_at', '-id'], name='order_no_small_created_idx'),
+        ),
+    ]
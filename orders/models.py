@@ -1,6 +1,266 @@
-from django.db import models
+from decimal import Decimal
+from django.db import IntegrityError, models, router, transaction
+from django.db.models import Count, ExpressionWrapper, F, Max, Min, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
 from django.conf import settings
 from django.core.validators import RegexValidator
+from django.utils import timezone
+from .cache import LRUCache
+from .phones import normalize_phone_number
+from .whatsapp import get_cached_link, get_message_template
+
+# All price catalog versions, newest first; cleared on change and expired after a TTL
+# so other processes pick up new versions too
+price_catalog_cache = LRUCache(maxsize=1, ttl=settings.PRICE_CATALOG_CACHE_TTL)
+
+class PriceCatalog(models.Model):
+    """
+    Versioned lontong prices, each version effective from a given moment
+    """
+    large_price = models.DecimalField(max_digits=10, decimal_places=2)
+    small_price = models.DecimalField(max_digits=10, decimal_places=2)
+    effective_from = models.DateTimeField(default=timezone.now, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-effective_from', '-id']
+    
+    def __str__(self):
+        return f"Prices from {self.effective_from:%Y-%m-%d %H:%M} ({self.large_price} / {self.small_price})"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Clearing before the commit would let a concurrent reader cache the old versions again
+        transaction.on_commit(price_catalog_cache.clear, using=self._state.db)
+    
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(price_catalog_cache.clear, using=using)
+        return result
+    
+    @classmethod
+    def get_versions(cls):
+        """
+        Return every catalog version, newest first, from the in-process cache
+        """
+        versions = price_catalog_cache.get('versions')
+        if versions is None:
+            versions = list(cls.objects.all())
+            price_catalog_cache.set('versions', versions)
+        return versions
+    
+    @classmethod
+    def get_current(cls, at=None):
+        """
+        Return the version in effect at the given moment (default now), or None
+        """
+        at = at or timezone.now()
+        for version in cls.get_versions():
+            if version.effective_from <= at:
+                return version
+        return None
+    
+    @classmethod
+    def get_unit_prices(cls, pk=None):
+        """
+        Return (large_price, small_price) for a catalog version, or the settings prices
+        """
+        if pk is not None:
+            for version in cls.get_versions():
+                if version.pk == pk:
+                    return version.large_price, version.small_price
+            
+            # Created by another process since the cache was filled
+            version = cls.objects.filter(pk=pk).first()
+            if version is not None:
+                price_catalog_cache.clear()
+                return version.large_price, version.small_price
+        
+        return settings.LONTONG_LARGE_PRICE, settings.LONTONG_SMALL_PRICE
+
+class DailyOrderSummary(models.Model):
+    """
+    Per-day order totals, kept up to date by Order.save() and delete()
+    """
+    date = models.DateField(unique=True)
+    order_count = models.IntegerField(default=0)
+    total_lontong_large = models.IntegerField(default=0)
+    total_lontong_small = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # Set once the day's orders move to season archives, after which rebuild() keeps the row
+    archived = models.BooleanField(default=False)
+    
+    class Meta:
+        ordering = ['-date']
+    
+    def __str__(self):
+        return f"Summary {self.date}"
+    
+    @classmethod
+    def apply_delta(cls, date, order_count=0, total_lontong_large=0,
+                    total_lontong_small=0, revenue=0, using=None):
+        """
+        Add the given deltas to a day's totals with a single atomic UPDATE
+        """
+        deltas = {
+            'order_count': order_count,
+            'total_lontong_large': total_lontong_large,
+            'total_lontong_small': total_lontong_small,
+            'revenue': revenue,
+        }
+        if not any(deltas.values()):
+            return
+        
+        manager = cls.objects.db_manager(using)
+        changes = {name: F(name) + value for name, value in deltas.items()}
+        if manager.filter(date=date).update(**changes):
+            return
+        
+        # First order of the day: create the row, or add to it if another request won the race
+        try:
+            with transaction.atomic(using=manager.db):
+                manager.create(date=date, **deltas)
+        except IntegrityError:
+            manager.filter(date=date).update(**changes)
+    
+    @classmethod
+    def rebuild(cls, start=None, end=None, using=None):
+        """
+        Recompute the summary rows for a date range from the Order table with one GROUP BY
+        
+        Archived days are left as they are, since their orders are no longer in the table.
+        """
+        orders = Order.objects.db_manager(using).all()
+        summaries = cls.objects.db_manager(using).all()
+        if start is not None:
+            orders = orders.filter(created_at__date__gte=start)
+            summaries = summaries.filter(date__gte=start)
+        if end is not None:
+            orders = orders.filter(created_at__date__lte=end)
+            summaries = summaries.filter(date__lte=end)
+        
+        archived_days = set(summaries.filter(archived=True).values_list('date', flat=True))
+        rows = [row for row in orders.daily_totals() if row['day'] not in archived_days]
+        
+        with transaction.atomic(using=summaries.db):
+            summaries.filter(archived=False).delete()
+            return cls.objects.db_manager(using).bulk_create([
+                cls(
+                    date=row['day'],
+                    order_count=row['order_count'],
+                    total_lontong_large=row['large'],
+                    total_lontong_small=row['small'],
+                    revenue=row['revenue'],
+                )
+                for row in rows
+            ])
+
+class OrderQuerySet(models.QuerySet):
+    """
+    QuerySet with batch helpers for Order that keep DailyOrderSummary in step
+    """
+    def daily_totals(self):
+        """
+        Return per-day count, quantity and revenue totals for the queryset
+        """
+        return (
+            self.order_by()
+            .annotate(day=TruncDate('created_at'))
+            .values('day')
+            .annotate(
+                order_count=Count('id'),
+                large=Sum('total_lontong_large'),
+                small=Sum('total_lontong_small'),
+                revenue=Sum('total_price'),
+            )
+        )
+    
+    def create_batch(self, orders, batch_size=None):
+        """
+        Price a list of unsaved orders in one pass and insert them with bulk_create
+        """
+        catalog = PriceCatalog.get_current()
+        for order in orders:
+            order.normalized_phone = normalize_phone_number(order.phone_number)
+            order.price_catalog = catalog
+            order.total_price = Order.calculate_total_price(
+                order.total_lontong_large,
+                order.total_lontong_small,
+                order.price_catalog_id
+            )
+        
+        batch_size = batch_size or settings.ORDER_BULK_BATCH_SIZE
+        with transaction.atomic(using=self.db):
+            orders = self.bulk_create(orders, batch_size=batch_size)
+            
+            days = {}
+            for order in orders:
+                day = days.setdefault(timezone.localdate(order.created_at), [0, 0, 0, 0])
+                day[0] += 1
+                day[1] += order.total_lontong_large
+                day[2] += order.total_lontong_small
+                day[3] += order.total_price
+            for date, (count, large, small, revenue) in days.items():
+                DailyOrderSummary.apply_delta(date, count, large, small, revenue, using=self.db)
+        return orders
+    
+    def reprice(self, catalog):
+        """
+        Reprice the orders with a catalog version in one set-based UPDATE
+        """
+        price = ExpressionWrapper(
+            F('total_lontong_large') * Value(catalog.large_price)
+            + F('total_lontong_small') * Value(catalog.small_price),
+            output_field=models.DecimalField(max_digits=10, decimal_places=2)
+        )
+        
+        with transaction.atomic(using=self.db):
+            span = self.aggregate(first=Min('created_at'), last=Max('created_at'))
+            updated = self.update(
+                price_catalog=catalog,
+                total_price=price,
+                updated_at=timezone.now()
+            )
+            
+            # Revenue changed for every day in the span, so recompute those days
+            if updated:
+                DailyOrderSummary.rebuild(
+                    start=timezone.localdate(span['first']),
+                    end=timezone.localdate(span['last']),
+                    using=self.db
+                )
+        return updated
+    
+    def delete(self):
+        """
+        Delete the orders and subtract them from the daily summary
+        """
+        with transaction.atomic(using=self.db):
+            totals = list(self.daily_totals())
+            result = super().delete()
+            for row in totals:
+                DailyOrderSummary.apply_delta(
+                    row['day'],
+                    -row['order_count'],
+                    -row['large'],
+                    -row['small'],
+                    -row['revenue'],
+                    using=self.db
+                )
+        return result
+
+    def purge(self):
+        """
+        Delete the orders with one DELETE, leaving the daily summary as it is
+        
+        For orders kept elsewhere, such as season archives, whose sales still count. Their
+        days are marked archived so DailyOrderSummary.rebuild() doesn't drop those sales.
+        """
+        with transaction.atomic(using=self.db):
+            days = {row['day'] for row in self.daily_totals()}
+            DailyOrderSummary.objects.db_manager(self.db).filter(date__in=days).update(archived=True)
+            return self._raw_delete(self.db)
 
 class Order(models.Model):
     """
@@ -14,6 +274,8 @@ class Order(models.Model):
     
     # Customer information
     phone_number = models.CharField(validators=[phone_regex], max_length=17)
+    # Canonical form of phone_number that identifies the customer across orders
+    normalized_phone = models.CharField(max_length=17, editable=False, default='')
     name = models.CharField(max_length=255)
     address = models.TextField()
     
@@ -21,48 +283,245 @@ class Order(models.Model):
     total_lontong_large = models.PositiveIntegerField(default=0)
     total_lontong_small = models.PositiveIntegerField(default=0)
     total_price = models.DecimalField(max_digits=10, decimal_places=2, editable=False)
+    price_catalog = models.ForeignKey(
+        PriceCatalog,
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.PROTECT,
+        related_name='orders'
+    )
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = OrderQuerySet.as_manager()
+    
+    # Fields the total price is computed from
+    PRICE_FIELDS = ('total_lontong_large', 'total_lontong_small', 'price_catalog')
+    
+    @staticmethod
+    def calculate_total_price(total_lontong_large, total_lontong_small, price_catalog_id=None):
+        """
+        Calculate total price based on quantities and the catalog version's prices
+        """
+        large_unit_price, small_unit_price = PriceCatalog.get_unit_prices(price_catalog_id)
+        large_price = large_unit_price * total_lontong_large
+        small_price = small_unit_price * total_lontong_small
+        return large_price + small_price
+    
+    @classmethod
+    def adjust_quantities(cls, pk, large=0, small=0, using=None):
+        """
+        Add to an order's quantities and reprice it in one UPDATE, without reading it first
+        
+        Concurrent adjustments all apply, as each adds to the stored quantities. Returns
+        False, changing nothing, if the order doesn't exist or a quantity would drop below zero.
+        """
+        order = cls.objects.db_manager(using).filter(pk=pk)
+        adjustable = order
+        if large < 0:
+            adjustable = adjustable.filter(total_lontong_large__gte=-large)
+        if small < 0:
+            adjustable = adjustable.filter(total_lontong_small__gte=-small)
+        
+        # The order's catalog version prices, or the settings prices without one
+        catalog = PriceCatalog.objects.filter(pk=models.OuterRef('price_catalog'))
+        price_field = models.DecimalField(max_digits=10, decimal_places=2)
+        large_price = Coalesce(
+            models.Subquery(catalog.values('large_price')[:1]),
+            Value(Decimal(settings.LONTONG_LARGE_PRICE)),
+            output_field=price_field
+        )
+        small_price = Coalesce(
+            models.Subquery(catalog.values('small_price')[:1]),
+            Value(Decimal(settings.LONTONG_SMALL_PRICE)),
+            output_field=price_field
+        )
+        price = ExpressionWrapper(
+            (F('total_lontong_large') + large) * large_price
+            + (F('total_lontong_small') + small) * small_price,
+            output_field=price_field
+        )
+        
+        with transaction.atomic(using=order.db):
+            updated = adjustable.update(
+                total_lontong_large=F('total_lontong_large') + large,
+                total_lontong_small=F('total_lontong_small') + small,
+                total_price=price,
+                updated_at=timezone.now()
+            )
+            if not updated:
+                return False
+            
+            # The UPDATE holds the row lock, so these can't change before the commit
+            created_at, catalog_id = order.values_list('created_at', 'price_catalog').get()
+            large_unit_price, small_unit_price = PriceCatalog.get_unit_prices(catalog_id)
+            DailyOrderSummary.apply_delta(
+                timezone.localdate(created_at), 0, large, small,
+                large * large_unit_price + small * small_unit_price,
+                using=order.db
+            )
+        return True
+    
+    def get_saved_totals(self, using=None):
+        """
+        Return the (large, small, total_price) stored for this order, locking its row
+        
+        Read with SELECT ... FOR UPDATE rather than taken from the loaded order, so inside a
+        transaction no concurrent adjust_quantities() can change them before the caller writes.
+        """
+        return (
+            Order.objects.db_manager(using)
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values_list('total_lontong_large', 'total_lontong_small', 'total_price')
+            .first()
+        )
+    
     def save(self, *args, **kwargs):
-        # Calculate total price based on quantities and prices
-        large_price = settings.LONTONG_LARGE_PRICE * self.total_lontong_large
-        small_price = settings.LONTONG_SMALL_PRICE * self.total_lontong_small
-        self.total_price = large_price + small_price
+        """
+        Save the order, repricing it and updating the daily summary when its quantities change
         
-        super().save(*args, **kwargs)
+        With update_fields, only those columns (plus the ones derived from them and
+        updated_at) are written, and the price is only recomputed if a quantity is among them.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            if not update_fields:
+                # Nothing to write, as with Model.save()
+                return
+            # Accepts attnames such as price_catalog_id, like Model.save()
+            update_fields = {self._meta.get_field(name).name for name in update_fields}
+            update_fields.add('updated_at')
+            if 'phone_number' in update_fields:
+                update_fields.add('normalized_phone')
+            repriced = not update_fields.isdisjoint(self.PRICE_FIELDS)
+            if repriced:
+                update_fields.add('total_price')
+            kwargs['update_fields'] = update_fields
+        else:
+            repriced = True
+        
+        # New orders are priced with the catalog version in effect now
+        if self._state.adding and self.price_catalog_id is None:
+            self.price_catalog = PriceCatalog.get_current()
+        
+        if update_fields is None or 'phone_number' in update_fields:
+            self.normalized_phone = normalize_phone_number(self.phone_number)
+        if repriced:
+            self.total_price = self.calculate_total_price(
+                self.total_lontong_large,
+                self.total_lontong_small,
+                self.price_catalog_id
+            )
+        
+        using = kwargs.get('using') or router.db_for_write(Order, instance=self)
+        adding = self._state.adding
+        
+        with transaction.atomic(using=using):
+            previous = None if adding or not repriced else self.get_saved_totals(using)
+            super().save(*args, **kwargs)
+            
+            date = timezone.localdate(self.created_at)
+            if adding or (repriced and previous is None):
+                DailyOrderSummary.apply_delta(
+                    date, 1, self.total_lontong_large, self.total_lontong_small,
+                    self.total_price, using=using
+                )
+            elif previous is not None:
+                DailyOrderSummary.apply_delta(
+                    date, 0,
+                    self.total_lontong_large - previous[0],
+                    self.total_lontong_small - previous[1],
+                    self.total_price - previous[2],
+                    using=using
+                )
+    
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(Order, instance=self)
+        date = timezone.localdate(self.created_at)
+        
+        with transaction.atomic(using=using):
+            previous = self.get_saved_totals(using)
+            result = super().delete(*args, **kwargs)
+            if previous is not None:
+                DailyOrderSummary.apply_delta(
+                    date, -1, -previous[0], -previous[1], -previous[2], using=using
+                )
+        return result
     
     def __str__(self):
         return f"Order {self.id} - {self.name}"
     
     def get_whatsapp_link(self):
         """
-        Generate WhatsApp link with order information
-        """
-        # Format phone number for WhatsApp (remove '+' if present)
-        wa_phone = self.phone_number.lstrip('+')
-        
-        # Create order summary message
-        message = (
-            f"Hello {self.name}, "
-            f"thank you for your order!\n\n"
-            f"Order Summary:\n"
-            f"- Large Lontong: {self.total_lontong_large} x {settings.LONTONG_LARGE_PRICE} IDR\n"
-            f"- Small Lontong: {self.total_lontong_small} x {settings.LONTONG_SMALL_PRICE} IDR\n"
-            f"Total: {self.total_price} IDR\n\n"
-            f"Customer Address: {self.address}\n\n"
-            f"We will process your order and inform you once it's ready for pickup."
-            f"\n\nThank you for choosing us!"
-        )
-        
-        # URL encode the message
-        import urllib.parse
-        encoded_message = urllib.parse.quote(message)
+        Return the WhatsApp link for the order, reusing the cached link when unchanged
+        """
+        if self.pk is None or self.updated_at is None:
+            return self.build_whatsapp_link()
         
-        # Return the WhatsApp link
-        return f"https://wa.me/{wa_phone}?text={encoded_message}"
+        return get_cached_link((self.pk, self.updated_at), self.build_whatsapp_link)
+    
+    def build_whatsapp_link(self):
+        """
+        Generate WhatsApp link with order information from WHATSAPP_MESSAGE_TEMPLATE
+        """
+        template = get_message_template()
+        values = {
+            name: getattr(self, self._meta.get_field(name).attname)
+            for name in template.columns
+        }
+        return template.build_link(values, PriceCatalog.get_unit_prices)
+    
+    @classmethod
+    def get_whatsapp_link_fields(cls):
+        """
+        Return the columns read when building (and caching) the WhatsApp link
+        """
+        return get_message_template().columns + ('updated_at',)
     
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='order_created_id_idx'),
+            models.Index(fields=['updated_at'], name='order_updated_idx'),
+            models.Index(fields=['normalized_phone', '-created_at', '-id'], name='order_customer_idx'),
+            models.Index(fields=['total_price'], name='order_total_price_idx'),
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(total_lontong_large__gt=0),
+                name='order_large_created_idx'
+            ),
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(total_lontong_small__gt=0),
+                name='order_small_created_idx'
+            ),
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(total_lontong_large=0),
+                name='order_no_large_created_idx'
+            ),
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(total_lontong_small=0),
+                name='order_no_small_created_idx'
+            ),
+        ]
+
+class IdempotencyKey(models.Model):
+    """
+    Stored response for an Idempotency-Key sent with order creation
+    """
+    # SHA-256 of the client identity and its key, so the unique index stays small whatever clients send
+    key = models.CharField(max_length=64, unique=True)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+    
+    def __str__(self):
+        return f"Idempotency key {self.key[:12]}"
@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+class OrderPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination with a client-selectable page size
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+class OrderCursorPagination(CursorPagination):
+    """
+    Keyset pagination on (created_at, id), backed by the order_created_id_idx index
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
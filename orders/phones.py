@@ -0,0 +1,23 @@
+import re
+
+# Indonesian country code, used for numbers entered in the local 08... format
+DEFAULT_COUNTRY_CODE = '62'
+
+def normalize_phone_number(phone_number):
+    """
+    Return the canonical digits-only form of a phone number, e.g. 6281234567890
+    
+    '+628...', '00628...', '628...', '08...' and '8...' all normalize to the same value.
+    Numbers entered with '+' or '00' already carry their country code, e.g. +81...
+    """
+    phone_number = (phone_number or '').strip()
+    digits = re.sub(r'\D', '', phone_number)
+    if phone_number.startswith('+'):
+        return digits
+    if digits.startswith('00'):
+        return digits[2:]
+    if digits.startswith('0'):
+        return DEFAULT_COUNTRY_CODE + digits[1:]
+    if digits.startswith('8'):
+        return DEFAULT_COUNTRY_CODE + digits
+    return digits
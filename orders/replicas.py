@@ -0,0 +1,140 @@
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.throttling import BaseThrottle
+
+REPLICA_ALIAS = 'replica'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Set while a view that tolerates replication lag is running
+replica_reads = ContextVar('replica_reads', default=False)
+
+# Caches kept inside one process or machine, so other instances can't see their pins
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.filebased.FileBasedCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+def has_shared_pin_cache():
+    backend = settings.CACHES.get(settings.DATABASE_REPLICA_PIN_CACHE, {}).get('BACKEND')
+    return backend is not None and backend not in LOCAL_CACHE_BACKENDS
+
+def get_replica_alias():
+    """
+    Return the replica's database alias, or None when no replica is configured
+    
+    Without a shared pin cache the replica stays unused: another instance wouldn't see a
+    client's pin and could serve its next read from a replica that lacks its write.
+    """
+    if REPLICA_ALIAS in connections.settings and has_shared_pin_cache():
+        return REPLICA_ALIAS
+    return None
+
+def check_replica_pin_cache(app_configs, **kwargs):
+    """
+    System check reporting a replica configured without a shared pin cache
+    """
+    if REPLICA_ALIAS not in connections.settings or has_shared_pin_cache():
+        return []
+    return [checks.Error(
+        f"The '{REPLICA_ALIAS}' database is configured, but DATABASE_REPLICA_PIN_CACHE "
+        f"'{settings.DATABASE_REPLICA_PIN_CACHE}' isn't shared between instances, so it won't be used.",
+        hint='Point DATABASE_REPLICA_PIN_CACHE at a Redis, Memcached or database cache, e.g. by setting REDIS_URL.',
+        id='orders.E001',
+    )]
+
+@contextmanager
+def read_from_replica():
+    """
+    Route reads made inside the block to the replica, if there is one
+    """
+    token = replica_reads.set(True)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+class ReplicaRouter:
+    """
+    Sends reads inside read_from_replica() to the replica and everything else to the primary
+    """
+    def db_for_read(self, model, **hints):
+        if replica_reads.get():
+            return get_replica_alias()
+        return None
+    
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same rows
+        return True
+    
+    def allow_migrate(self, db, app_label, **hints):
+        # The replica receives its schema from the primary
+        return db != REPLICA_ALIAS
+
+def get_pin_key(request):
+    """
+    Return the cache key pinning a client to the primary, by credentials or else by address
+    """
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if authorization:
+        client = 'auth:' + hashlib.sha256(authorization.encode('utf-8')).hexdigest()
+    else:
+        client = 'ip:' + BaseThrottle().get_ident(request)
+    return f'replica-pin:{client}'
+
+def pin_to_primary(request):
+    caches[settings.DATABASE_REPLICA_PIN_CACHE].set(
+        get_pin_key(request), True, timeout=settings.DATABASE_REPLICA_PIN_SECONDS
+    )
+
+def is_pinned(request):
+    """
+    Return True if the client wrote recently enough that the replica may not have its change yet
+    """
+    return caches[settings.DATABASE_REPLICA_PIN_CACHE].get(get_pin_key(request), False)
+
+def can_read_from_replica(request):
+    return get_replica_alias() is not None and not is_pinned(request)
+
+def should_pin(request, response):
+    return (
+        request.method not in SAFE_METHODS
+        and response.status_code < 400
+        and get_replica_alias() is not None
+    )
+
+class ReplicaPinMiddleware:
+    """
+    Pins clients to the primary for DATABASE_REPLICA_PIN_SECONDS after a successful write
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if should_pin(request, response):
+            pin_to_primary(request)
+        return response
+    
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if should_pin(request, response):
+            await sync_to_async(pin_to_primary)(request)
+        return response
@@ -0,0 +1,162 @@
+import re
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, Replace
+
+SEARCH_CONFIG = 'simple'
+MAX_SEARCH_TERMS = 8
+# Digit-only terms at least this long also match anywhere inside the phone number
+PHONE_FRAGMENT_MIN_DIGITS = 4
+
+FTS_TABLE = 'orders_order_fts'
+
+# External-content FTS5 table over orders_order, kept in sync by triggers so bulk
+# inserts, queryset updates and deletes are indexed as well as Model.save()
+SQLITE_FTS_TABLE = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, address, phone_number, content='orders_order', content_rowid='id'
+    )
+"""
+SQLITE_FTS_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON orders_order BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, address, phone_number)
+        VALUES (new.id, new.name, new.address, new.phone_number);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON orders_order BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, address, phone_number)
+        VALUES ('delete', old.id, old.name, old.address, old.phone_number);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF name, address, phone_number ON orders_order BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, address, phone_number)
+        VALUES ('delete', old.id, old.name, old.address, old.phone_number);
+        INSERT INTO {FTS_TABLE}(rowid, name, address, phone_number)
+        VALUES (new.id, new.name, new.address, new.phone_number);
+    END
+    """,
+)
+
+def get_search_vector():
+    """
+    Return the tsvector expression the Postgres GIN index is built on
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    # The '+' of international numbers would otherwise make the parser read them as signed integers
+    return SearchVector(
+        'name', 'address', Replace('phone_number', Value('+'), Value('')), config=SEARCH_CONFIG
+    )
+
+def install_sqlite_search(connection, rebuild=False):
+    """
+    Create the FTS5 table and its triggers if missing, optionally re-indexing every order
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(SQLITE_FTS_TABLE)
+        for statement in SQLITE_FTS_TRIGGERS:
+            cursor.execute(statement)
+        if rebuild:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+def restore_sqlite_search(sender, using, **kwargs):
+    """
+    post_migrate handler: SQLite drops triggers whenever a migration rebuilds orders_order
+    """
+    connection = connections[using]
+    if connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+        install_sqlite_search(connection)
+
+def tokenize(query):
+    """
+    Split a search query into lowercase word terms, dropping any query syntax
+    """
+    return re.findall(r'\w+', query.lower())[:MAX_SEARCH_TERMS]
+
+def is_phone_fragment(term):
+    return term.isdigit() and len(term) >= PHONE_FRAGMENT_MIN_DIGITS
+
+def split_terms(terms):
+    """
+    Split terms into word terms and phone fragment terms
+    """
+    words = [term for term in terms if not is_phone_fragment(term)]
+    fragments = [term for term in terms if is_phone_fragment(term)]
+    return words, fragments
+
+def prefix_query(terms, operator='&'):
+    from django.contrib.postgres.search import SearchQuery
+
+    # Every term is a prefix, so "jal sud" finds "Jalan Sudirman"
+    return SearchQuery(
+        f' {operator} '.join(f'{term}:*' for term in terms), search_type='raw', config=SEARCH_CONFIG
+    )
+
+def search_postgresql(queryset, terms):
+    from django.contrib.postgres.search import SearchRank
+
+    # Every term has to match; a phone fragment may match inside the phone number instead
+    words, fragments = split_terms(terms)
+    matches = Q()
+    if words:
+        matches &= Q(search_vector=prefix_query(words))
+    for term in fragments:
+        matches &= Q(search_vector=prefix_query([term])) | Q(phone_number__contains=term)
+
+    vector = get_search_vector()
+    return queryset.alias(search_vector=vector).filter(matches).annotate(
+        search_rank=SearchRank(vector, prefix_query(terms, '|'))
+    )
+
+def fts_match(terms, operator=' '):
+    return operator.join(f'"{term}"*' for term in terms)
+
+def fts_rowids(match):
+    return RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+
+def search_sqlite(queryset, terms):
+    # Every term has to match; a phone fragment may match inside the phone number instead.
+    # Word terms share one MATCH so the FTS table drives the query
+    words, fragments = split_terms(terms)
+    matches = Q()
+    if words:
+        matches &= Q(id__in=fts_rowids(fts_match(words)))
+    for term in fragments:
+        matches &= Q(id__in=fts_rowids(fts_match([term]))) | Q(phone_number__contains=term)
+
+    # bm25() is lower for better matches, negate it so both backends rank descending.
+    # Ranked over any term so orders matched through a phone fragment still score
+    table = queryset.model._meta.db_table
+    rank = RawSQL(
+        f'SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+        (fts_match(terms, ' OR '),),
+        output_field=FloatField(),
+    )
+    return queryset.filter(matches).annotate(search_rank=Coalesce(rank, 0.0))
+
+def search_fallback(queryset, terms):
+    # Other databases get the unindexed scan the admin used to run
+    lookups = Q()
+    for term in terms:
+        lookups &= Q(name__icontains=term) | Q(address__icontains=term) | Q(phone_number__icontains=term)
+    return queryset.filter(lookups).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+SEARCH_BACKENDS = {
+    'postgresql': search_postgresql,
+    'sqlite': search_sqlite,
+}
+
+def search_orders(queryset, query):
+    """
+    Filter an order queryset to matches for the query, best matches first
+    """
+    terms = tokenize(query)
+    if not terms:
+        return queryset.none()
+
+    backend = SEARCH_BACKENDS.get(connections[queryset.db].vendor, search_fallback)
+    return backend(queryset, terms).order_by('-search_rank', '-created_at', '-id')
@@ -1,5 +1,10 @@
-from rest_framework import serializers
-from .models import Order
+from decimal import Decimal
+from operator import itemgetter
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from .models import DailyOrderSummary, Order, PriceCatalog
+from .whatsapp import get_cached_link, get_message_template
 
 class OrderSerializer(serializers.ModelSerializer):
     whatsapp_link = serializers.SerializerMethodField()
@@ -9,13 +14,164 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'phone_number', 'name', 'address',
             'total_lontong_large', 'total_lontong_small',
-            'total_price', 'created_at', 'updated_at',
+            'total_price', 'price_catalog', 'created_at', 'updated_at',
             'whatsapp_link'
         ]
-        read_only_fields = ['id', 'total_price', 'created_at', 'updated_at', 'whatsapp_link']
+        read_only_fields = [
+            'id', 'total_price', 'price_catalog', 'created_at', 'updated_at', 'whatsapp_link'
+        ]
+    
+    def get_fields(self):
+        """
+        Prune fields to the sparse fieldset requested by the view
+        """
+        fields = super().get_fields()
+        selected = self.context.get('fields')
+        omitted = self.context.get('omit', ())
+        
+        for name in list(fields):
+            if (selected is not None and name not in selected) or name in omitted:
+                fields.pop(name)
+        return fields
     
     def get_whatsapp_link(self, obj):
         """
         Get the WhatsApp link for the order
         """
-        return obj.get_whatsapp_link()
\ No newline at end of file
+        return obj.get_whatsapp_link()
+    
+    def update(self, instance, validated_data):
+        """
+        Write only the submitted fields, so e.g. an address change doesn't reprice the order
+        """
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
+
+class QuantityAdjustmentSerializer(serializers.Serializer):
+    """
+    Serializer for validating the amounts added to (or, when negative, taken from) an order's quantities
+    """
+    total_lontong_large = serializers.IntegerField(default=0, min_value=-10000, max_value=10000)
+    total_lontong_small = serializers.IntegerField(default=0, min_value=-10000, max_value=10000)
+    
+    def validate(self, attrs):
+        if not any(attrs.values()):
+            raise serializers.ValidationError('Adjust at least one quantity.')
+        return attrs
+
+class OrderRowFormatter:
+    """
+    Formats order rows from values() exactly as OrderSerializer represents the same orders
+    
+    Built once per field selection, it compiles a getter per field up front so the list
+    view can skip model instances and the serializer's per-row field machinery.
+    """
+    def __init__(self, field_names):
+        self.field_names = tuple(field_names)
+        self.serializer_fields = OrderSerializer().fields
+        # Compiled getters by time zone, as datetimes are rendered in the current one
+        self.getters = {}
+    
+    def get_columns(self):
+        """
+        Return the model columns to read, named as values() takes them
+        """
+        columns = ['id']
+        columns.extend(name for name in self.field_names if name != 'whatsapp_link')
+        if 'whatsapp_link' in self.field_names:
+            # Follows the message template, which can change at runtime
+            columns.extend(Order.get_whatsapp_link_fields())
+        return tuple(dict.fromkeys(columns))
+    
+    def get_getters(self, current_timezone):
+        getters = self.getters.get(current_timezone)
+        if getters is None:
+            getters = self.getters[current_timezone] = tuple(
+                (name, self.compile_getter(name, current_timezone)) for name in self.field_names
+            )
+        return getters
+    
+    def compile_getter(self, name, current_timezone):
+        """
+        Return a function reading a field from a row the way the serializer field formats it
+        """
+        if name == 'whatsapp_link':
+            return get_whatsapp_link
+        
+        field = self.serializer_fields[name]
+        if isinstance(field, (serializers.CharField, serializers.IntegerField, serializers.PrimaryKeyRelatedField)):
+            # values() already returns the str, int and foreign key id the serializer outputs
+            return itemgetter(name)
+        
+        coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        if isinstance(field, serializers.DecimalField) and coerce_to_string and not field.localize:
+            quantum = Decimal('.1') ** field.decimal_places
+            rounding = field.rounding
+            
+            def get_decimal(row):
+                value = row[name]
+                return None if value is None else format(value.quantize(quantum, rounding=rounding), 'f')
+            return get_decimal
+        
+        if isinstance(field, serializers.DateTimeField) and getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601:
+            def get_datetime(row):
+                value = row[name]
+                if value is None:
+                    return None
+                value = value.astimezone(current_timezone).isoformat()
+                if value.endswith('+00:00'):
+                    value = value[:-6] + 'Z'
+                return value
+            return get_datetime
+        
+        # Anything else is left to the serializer field
+        return lambda row: None if row[name] is None else field.to_representation(row[name])
+    
+    def format_rows(self, rows):
+        """
+        Return the serialized form of a list of values() rows
+        """
+        getters = self.get_getters(timezone.get_current_timezone())
+        return [{name: get(row) for name, get in getters} for row in rows]
+
+def get_whatsapp_link(row):
+    return get_cached_link(
+        (row['id'], row['updated_at']),
+        lambda: get_message_template().build_link(row, PriceCatalog.get_unit_prices)
+    )
+
+# Formatters by selected field names
+row_formatters = {}
+
+def get_row_formatter(field_names):
+    field_names = tuple(field_names)
+    formatter = row_formatters.get(field_names)
+    if formatter is None:
+        formatter = row_formatters[field_names] = OrderRowFormatter(field_names)
+    return formatter
+
+class DailyOrderSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailyOrderSummary
+        fields = [
+            'date', 'order_count',
+            'total_lontong_large', 'total_lontong_small',
+            'revenue'
+        ]
+
+class SummaryTotalsSerializer(serializers.Serializer):
+    order_count = serializers.IntegerField()
+    total_lontong_large = serializers.IntegerField()
+    total_lontong_small = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+class CustomerSerializer(serializers.Serializer):
+    phone_number = serializers.CharField()
+    order_count = serializers.IntegerField()
+    total_lontong_large = serializers.IntegerField()
+    total_lontong_small = serializers.IntegerField()
+    total_spent = serializers.DecimalField(max_digits=14, decimal_places=2)
+    first_order_at = serializers.DateTimeField()
+    last_order_at = serializers.DateTimeField()
@@ -1,8 +1,11 @@
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 from orders.models import Order
+from orders.throttling import reset_admission_state
 
 class OrderAPITest(APITestCase):
     """
@@ -12,6 +15,9 @@ class OrderAPITest(APITestCase):
         """
         Set up test data and users
         """
+        # Start every test with empty admission buckets
+        reset_admission_state()
+        
         # Create admin user
         self.admin_user = User.objects.create_superuser(
             username='admin',
@@ -39,6 +45,7 @@ class OrderAPITest(APITestCase):
         self.list_url = reverse('order-list')
         self.detail_url = reverse('order-detail', args=[self.order.id])
         self.whatsapp_url = reverse('order-send-whatsapp', args=[self.order.id])
+        self.bulk_url = reverse('order-bulk-create')
     
     def test_create_order_unauthenticated(self):
         """
@@ -81,6 +88,64 @@ class OrderAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
     
+    def test_list_orders_without_whatsapp_link(self):
+        """
+        Test that the WhatsApp link can be omitted from list responses
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.list_url, {'whatsapp_link': 'false'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('whatsapp_link', response.data['results'][0])
+    
+    def test_list_orders_sparse_fields(self):
+        """
+        Test that ?fields= limits both the response fields and the fetched columns
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, {'fields': 'id,name,total_price,created_at'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data['results'][0]),
+            {'id', 'name', 'total_price', 'created_at'}
+        )
+        
+        select_sql = [query['sql'] for query in queries if 'FROM "orders_order"' in query['sql']]
+        self.assertTrue(select_sql)
+        self.assertNotIn('"address"', select_sql[-1])
+    
+    def test_retrieve_order_omit_fields(self):
+        """
+        Test that ?omit= removes fields from the response
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.detail_url, {'omit': 'address,whatsapp_link'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('address', response.data)
+        self.assertNotIn('whatsapp_link', response.data)
+        self.assertEqual(response.data['name'], 'Test User')
+    
+    def test_list_orders_unknown_field(self):
+        """
+        Test that unknown sparse fieldset names are rejected
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.list_url, {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.data)
+    
+    def test_list_orders_empty_fields(self):
+        """
+        Test that an empty ?fields= returns every field, not empty objects
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        full = self.client.get(self.list_url).data['results']
+        for value in ('', ','):
+            with self.subTest(fields=value):
+                response = self.client.get(self.list_url, {'fields': value})
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.data['results'], full)
+    
     def test_retrieve_order_admin(self):
         """
         Test that an admin user can retrieve an order
@@ -121,4 +186,106 @@ class OrderAPITest(APITestCase):
         response = self.client.post(self.whatsapp_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('whatsapp_link', response.data)
-        self.assertTrue(response.data['whatsapp_link'].startswith('https://wa.me/'))
\ No newline at end of file
+        self.assertTrue(response.data['whatsapp_link'].startswith('https://wa.me/'))
+    
+    def test_bulk_create_orders_admin(self):
+        """
+        Test that an admin user can create many orders at once
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        data = [
+            {
+                'phone_number': f'+62812345678{index}',
+                'name': f'Reseller Customer {index}',
+                'address': f'{index} Reseller Street',
+                'total_lontong_large': index,
+                'total_lontong_small': 1
+            }
+            for index in range(5)
+        ]
+        response = self.client.post(self.bulk_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(Order.objects.count(), 6)
+        
+        order = Order.objects.get(name='Reseller Customer 3')
+        self.assertEqual(order.total_price, Order.calculate_total_price(3, 1))
+        self.assertIsNotNone(order.created_at)
+    
+    def test_bulk_create_reports_item_errors(self):
+        """
+        Test that invalid items are reported by index and nothing is created
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        data = [
+            {
+                'phone_number': '+6281234567891',
+                'name': 'Valid Customer',
+                'address': 'Valid Street',
+                'total_lontong_large': 1
+            },
+            {
+                'phone_number': 'not-a-phone',
+                'name': 'Invalid Customer',
+                'address': 'Invalid Street'
+            }
+        ]
+        response = self.client.post(self.bulk_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data['errors']), 1)
+        self.assertEqual(response.data['errors'][0]['index'], 1)
+        self.assertIn('phone_number', response.data['errors'][0]['errors'])
+        self.assertEqual(Order.objects.count(), 1)
+    
+    def test_bulk_create_unauthenticated(self):
+        """
+        Test that an unauthenticated user cannot bulk create orders
+        """
+        response = self.client.post(self.bulk_url, [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_list_orders_cursor_pagination(self):
+        """
+        Test that the order list can be paged with a keyset cursor
+        """
+        for index in range(4):
+            Order.objects.create(
+                phone_number=f'+62812345678{index}',
+                name=f'Cursor User {index}',
+                address='Cursor Street',
+                total_lontong_large=1
+            )
+        
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.list_url, {'pagination': 'cursor', 'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        seen = [order['id'] for order in response.data['results']]
+        
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(order['id'] for order in response.data['results'])
+        
+        expected = list(Order.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+    
+    def test_list_orders_page_size_is_capped(self):
+        """
+        Test that a client-selected page size cannot exceed the maximum
+        """
+        Order.objects.bulk_create([
+            Order(
+                phone_number='+6281234567890',
+                name=f'Paged User {index}',
+                address='Paged Street',
+                total_price=0
+            )
+            for index in range(105)
+        ])
+        
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.list_url, {'page_size': 1000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 100)
+        self.assertEqual(response.data['count'], 106)
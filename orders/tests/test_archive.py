@@ -0,0 +1,257 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.archive import get_season
+from orders.models import DailyOrderSummary, Order
+
+class SeasonTest(SimpleTestCase):
+    """
+    Test case for naming the season a day belongs to
+    """
+    def test_calendar_years_without_season_starts(self):
+        """
+        Test that seasons are calendar years when no start dates are configured
+        """
+        self.assertEqual(get_season(date(2024, 12, 31), []), '2024')
+        self.assertEqual(get_season(date(2025, 1, 1), []), '2025')
+    
+    def test_configured_season_starts(self):
+        """
+        Test that a season runs from its start date until the next one, after calendar year seasons
+        """
+        starts = [date(2024, 3, 11), date(2025, 3, 1)]
+        self.assertEqual(get_season(date(2024, 3, 10), starts), '2023')
+        self.assertEqual(get_season(date(2024, 3, 11), starts), '2024')
+        self.assertEqual(get_season(date(2025, 2, 28), starts), '2024')
+        self.assertEqual(get_season(date(2025, 3, 1), starts), '2025')
+        self.assertEqual(get_season(date(2023, 6, 1), starts), '2023')
+
+class ArchiveTestMixin:
+    """
+    Creates orders in past seasons and a temporary archive directory
+    """
+    def setUp(self):
+        """
+        Set up orders from the 2023 and 2024 seasons and one recent order
+        """
+        super().setUp()
+        self.archive_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_root)
+        settings_override = override_settings(
+            ORDER_ARCHIVE_ROOT=self.archive_root,
+            ORDER_SEASON_STARTS=['2024-03-11'],
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        self.old_orders = []
+        for index, created_at in enumerate([
+            datetime(2023, 5, 1, 9, 30, 15, 123456),
+            datetime(2024, 1, 20, 10),
+            datetime(2024, 3, 12, 11),
+            datetime(2024, 4, 2, 12),
+            datetime(2024, 4, 3, 13),
+        ]):
+            order = Order.objects.create(
+                phone_number=f'+6281234567{index:03d}',
+                name=f'Archived Customer {index}',
+                address=f'{index} Jalan Sudirman',
+                total_lontong_large=index + 1,
+                total_lontong_small=index
+            )
+            Order.objects.filter(pk=order.pk).update(created_at=timezone.make_aware(created_at))
+            self.old_orders.append(order)
+        self.recent_order = Order.objects.create(
+            phone_number='+6285700000000',
+            name='Recent Customer',
+            address='Jalan Thamrin',
+            total_lontong_large=1
+        )
+    
+    def archive(self, *args):
+        output = StringIO()
+        call_command('archive_orders', '--before', '2025-01-01', *args, stdout=output)
+        return output.getvalue()
+    
+    def read_season(self, season):
+        path = os.path.join(self.archive_root, season)
+        orders = []
+        for name in sorted(os.listdir(path)):
+            with gzip.open(os.path.join(path, name), 'rt', encoding='utf-8') as chunk:
+                orders.extend(json.loads(line) for line in chunk)
+        return orders
+
+class ArchiveOrdersCommandTest(ArchiveTestMixin, TestCase):
+    """
+    Test case for the archive_orders management command
+    """
+    def test_moves_old_orders_into_season_archives(self):
+        """
+        Test that old orders are written to their season's archive and removed from the table
+        """
+        self.archive()
+        
+        self.assertEqual(list(Order.objects.values_list('id', flat=True)), [self.recent_order.id])
+        self.assertEqual(sorted(os.listdir(self.archive_root)), ['2023', '2024'])
+        self.assertEqual(
+            [order['id'] for order in self.read_season('2023')],
+            [self.old_orders[0].id, self.old_orders[1].id]
+        )
+        self.assertEqual(
+            [order['id'] for order in self.read_season('2024')],
+            [order.id for order in self.old_orders[2:]]
+        )
+    
+    def test_archives_every_column(self):
+        """
+        Test that archived orders keep every column, with full timestamp precision
+        """
+        self.archive()
+        
+        archived = self.read_season('2023')[0]
+        order = self.old_orders[0]
+        self.assertEqual(archived['phone_number'], order.phone_number)
+        self.assertEqual(archived['normalized_phone'], '6281234567000')
+        self.assertEqual(Decimal(archived['total_price']), order.total_price)
+        self.assertIn('price_catalog_id', archived)
+        self.assertEqual(archived['created_at'], '2023-05-01T09:30:15.123456+00:00')
+    
+    def test_writes_chunks(self):
+        """
+        Test that seasons are split into chunk files of at most --chunk-size orders
+        """
+        self.archive('--chunk-size', '2', '--batch-size', '1')
+        
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.archive_root, '2024'))),
+            ['orders-00001.ndjson.gz', 'orders-00002.ndjson.gz']
+        )
+        self.assertEqual(len(self.read_season('2024')), 3)
+    
+    def test_keeps_daily_summary(self):
+        """
+        Test that archiving doesn't subtract the orders from the sales summary
+        """
+        before = list(DailyOrderSummary.objects.values_list('order_count', 'revenue'))
+        self.archive()
+        
+        self.assertEqual(list(DailyOrderSummary.objects.values_list('order_count', 'revenue')), before)
+    
+    def test_rebuild_keeps_archived_days(self):
+        """
+        Test that rebuilding the summary after archiving keeps the archived seasons' sales
+        """
+        # Count the orders on the days they were moved to
+        DailyOrderSummary.rebuild()
+        self.archive()
+        before = list(DailyOrderSummary.objects.values_list('date', 'order_count', 'revenue'))
+        
+        self.assertEqual(len(before), 6)
+        call_command('rebuild_order_summary', stdout=StringIO())
+        self.assertEqual(list(DailyOrderSummary.objects.values_list('date', 'order_count', 'revenue')), before)
+        
+        # Days with live orders are still recomputed
+        DailyOrderSummary.objects.filter(archived=False).update(order_count=0)
+        DailyOrderSummary.rebuild()
+        self.assertEqual(list(DailyOrderSummary.objects.values_list('date', 'order_count', 'revenue')), before)
+    
+    def test_dry_run(self):
+        """
+        Test that --dry-run reports counts per season without archiving anything
+        """
+        output = self.archive('--dry-run')
+        
+        self.assertIn('2023: 2 orders would be archived', output)
+        self.assertIn('2024: 3 orders would be archived', output)
+        self.assertEqual(Order.objects.count(), 6)
+        self.assertEqual(os.listdir(self.archive_root), [])
+
+class ArchiveEndpointTest(ArchiveTestMixin, APITestCase):
+    """
+    Test case for querying season archives through the API
+    """
+    def setUp(self):
+        """
+        Set up archived seasons and an admin user
+        """
+        super().setUp()
+        self.archive()
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def query(self, season, **params):
+        response = self.client.get(reverse('order-archive', kwargs={'season': season}), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+    
+    def test_lists_seasons(self):
+        """
+        Test that the archived seasons are listed with their chunk counts
+        """
+        response = self.client.get(reverse('order-archives'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([season['season'] for season in response.data], ['2023', '2024'])
+        self.assertEqual(response.data[0]['chunks'], 1)
+    
+    def test_streams_season(self):
+        """
+        Test that a season's archived orders are returned without touching the orders table
+        """
+        with self.assertNumQueries(0):
+            orders = self.query('2024')
+        self.assertEqual([order['id'] for order in orders], [order.id for order in self.old_orders[2:]])
+    
+    def test_filters(self):
+        """
+        Test that archived orders can be filtered by phone number, text and creation time
+        """
+        self.assertEqual(
+            [order['id'] for order in self.query('2024', phone='081234567003')],
+            [self.old_orders[3].id]
+        )
+        self.assertEqual(
+            [order['id'] for order in self.query('2023', q='archived sudirman')],
+            [self.old_orders[0].id, self.old_orders[1].id]
+        )
+        self.assertEqual(self.query('2023', q='thamrin'), [])
+        self.assertEqual(
+            [order['id'] for order in self.query('2024', created_after='2024-04-02T12:00:00Z')],
+            [self.old_orders[3].id, self.old_orders[4].id]
+        )
+        # created_before is exclusive, like the list filter
+        self.assertEqual(
+            [order['id'] for order in self.query('2024', created_before='2024-04-02T12:00:00Z')],
+            [self.old_orders[2].id]
+        )
+    
+    def test_unknown_season(self):
+        """
+        Test that a season without an archive returns 404
+        """
+        response = self.client.get(reverse('order-archive', kwargs={'season': '2019'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_requires_admin(self):
+        """
+        Test that anonymous users cannot read archives
+        """
+        self.client.force_authenticate(user=None)
+        response = self.client.get(reverse('order-archive', kwargs={'season': '2024'}))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,201 @@
+import asyncio
+import os
+import tempfile
+from unittest import mock
+from asgiref.sync import AsyncToSync, SyncToAsync, iscoroutinefunction, sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.urls import reverse
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from core.middleware import LazyWhiteNoiseMiddleware
+from rest_framework_simplejwt.tokens import AccessToken
+from orders.models import Order
+from orders.serializers import OrderSerializer
+from orders.throttling import CacheAdmissionBackend, reset_admission_state
+
+class AsyncOrderViewTest(TestCase):
+    """
+    Test case for the async order intake views
+    """
+    def setUp(self):
+        """
+        Set up test data and users
+        """
+        # Start every test with empty admission buckets
+        reset_admission_state()
+        
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.regular_user = User.objects.create_user(
+            username='user',
+            email='user@example.com',
+            password='userpassword'
+        )
+        self.order = Order.objects.create(
+            phone_number="+6281234567890",
+            name="Async User",
+            address="1 Async Street",
+            total_lontong_large=1
+        )
+        
+        self.create_url = reverse('async-order-create')
+        self.detail_url = reverse('async-order-detail', args=[self.order.id])
+        self.admin_auth = f'Bearer {AccessToken.for_user(self.admin_user)}'
+        self.user_auth = f'Bearer {AccessToken.for_user(self.regular_user)}'
+    
+    async def test_create_order(self):
+        """
+        Test that anyone can create an order through the async view
+        """
+        data = {
+            'phone_number': '+6289876543210',
+            'name': 'Async New User',
+            'address': '2 Async Street',
+            'total_lontong_large': 1,
+            'total_lontong_small': 2
+        }
+        response = await self.async_client.post(self.create_url, data, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        
+        body = response.json()
+        self.assertEqual(body['name'], 'Async New User')
+        self.assertEqual(body['total_price'], '160000.00')
+        self.assertTrue(body['whatsapp_link'].startswith('https://wa.me/'))
+        self.assertEqual(await Order.objects.acount(), 2)
+    
+    async def test_create_invalid_order(self):
+        """
+        Test that validation errors are returned like the DRF view
+        """
+        response = await self.async_client.post(
+            self.create_url,
+            {'phone_number': 'nope'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('phone_number', response.json())
+        self.assertIn('name', response.json())
+    
+    async def test_create_with_idempotency_key(self):
+        """
+        Test that a retried request with an Idempotency-Key replays the first response
+        """
+        data = {
+            'phone_number': '+6289876543210',
+            'name': 'Async Retry User',
+            'address': '3 Async Street',
+            'total_lontong_large': 1
+        }
+        headers = {'Idempotency-Key': 'async-retry-1'}
+        first = await self.async_client.post(self.create_url, data, content_type='application/json', headers=headers)
+        retry = await self.async_client.post(self.create_url, data, content_type='application/json', headers=headers)
+        
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(await Order.objects.acount(), 2)
+    
+    async def test_create_in_queue_mode(self):
+        """
+        Test that in queue intake mode the submission is queued with a ticket, not inserted
+        """
+        data = {
+            'phone_number': '+6289876543210',
+            'name': 'Async Queued User',
+            'address': '4 Async Street',
+            'total_lontong_small': 1
+        }
+        with tempfile.TemporaryDirectory() as tmpdir, override_settings(
+            ORDER_INTAKE_MODE='queue',
+            ORDER_INTAKE_QUEUE_PATH=os.path.join(tmpdir, 'queue.sqlite3')
+        ):
+            response = await self.async_client.post(self.create_url, data, content_type='application/json')
+        
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'queued')
+        self.assertEqual(await Order.objects.acount(), 1)
+    
+    @override_settings(ORDER_ADMISSION=dict(
+        settings.ORDER_ADMISSION, ENABLED=True,
+        BACKEND='orders.throttling.CacheAdmissionBackend', KEY_PREFIX='test-async-admission'
+    ))
+    async def test_admission_runs_off_event_loop(self):
+        """
+        Test that the shared cache admission backend isn't called on the event loop
+        """
+        calls = []
+        
+        def record(method):
+            def wrapper(*args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                    calls.append((method.__name__, 'event loop'))
+                except RuntimeError:
+                    calls.append((method.__name__, 'thread'))
+                return method(*args, **kwargs)
+            return wrapper
+        
+        data = {
+            'phone_number': '+6289876543210',
+            'name': 'Async Admitted User',
+            'address': '5 Async Street',
+            'total_lontong_large': 1
+        }
+        with mock.patch.multiple(
+            CacheAdmissionBackend,
+            take_token=record(CacheAdmissionBackend.take_token),
+            acquire=record(CacheAdmissionBackend.acquire),
+            release=record(CacheAdmissionBackend.release)
+        ):
+            response = await self.async_client.post(self.create_url, data, content_type='application/json')
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(calls, [
+            ('take_token', 'thread'), ('take_token', 'thread'), ('acquire', 'thread'), ('release', 'thread')
+        ])
+    
+    async def test_retrieve_order_admin(self):
+        """
+        Test that an admin can retrieve an order through the async view
+        """
+        response = await self.async_client.get(self.detail_url, headers={'Authorization': self.admin_auth})
+        self.assertEqual(response.status_code, 200)
+        
+        expected = await sync_to_async(lambda: dict(OrderSerializer(self.order).data))()
+        self.assertEqual(response.json(), expected)
+    
+    async def test_retrieve_order_permissions(self):
+        """
+        Test that anonymous and regular users cannot retrieve orders
+        """
+        response = await self.async_client.get(self.detail_url)
+        self.assertEqual(response.status_code, 401)
+        
+        response = await self.async_client.get(self.detail_url, headers={'Authorization': self.user_auth})
+        self.assertEqual(response.status_code, 403)
+        
+        response = await self.async_client.get(self.detail_url, headers={'Authorization': 'Bearer invalid'})
+        self.assertEqual(response.status_code, 401)
+
+class AsyncMiddlewareChainTest(SimpleTestCase):
+    """
+    Test case for the middleware chain Django builds for ASGI requests
+    """
+    def test_middleware_chain_stays_async(self):
+        """
+        Test that ASGI requests reach the view through every middleware without a thread
+        """
+        middleware = []
+        get_response = ASGIHandler()._middleware_chain
+        while get_response is not None:
+            self.assertNotIsInstance(get_response, (SyncToAsync, AsyncToSync))
+            self.assertTrue(iscoroutinefunction(get_response), get_response)
+            middleware.append(type(get_response))
+            # Each middleware is wrapped by convert_exception_to_response
+            get_response = getattr(get_response, '__wrapped__', None) or getattr(get_response, 'get_response', None)
+        self.assertIn(LazyWhiteNoiseMiddleware, middleware)
@@ -1,7 +1,11 @@
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from orders.authentication import user_cache
 
 class AuthenticationTest(APITestCase):
     """
@@ -90,4 +94,39 @@ class AuthenticationTest(APITestCase):
         Test that a missing token is rejected
         """
         response = self.client.get(self.orders_url)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def get_user_queries(self):
+        """
+        Request the order list and return the queries that hit the user table
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.orders_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [query for query in queries if 'FROM "auth_user"' in query['sql']]
+    
+    def test_authenticated_user_is_cached(self):
+        """
+        Test that repeated token requests reuse the cached user
+        """
+        user_cache.clear()
+        token = AccessToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        self.assertEqual(len(self.get_user_queries()), 1)
+        self.assertEqual(len(self.get_user_queries()), 0)
+    
+    def test_cached_user_invalidated_on_save(self):
+        """
+        Test that saving a user drops it from the cache
+        """
+        token = AccessToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.client.get(self.orders_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.admin_user.is_staff = False
+        self.admin_user.save()
+        
+        response = self.client.get(self.orders_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
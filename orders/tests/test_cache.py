@@ -0,0 +1,34 @@
+from unittest import mock
+from django.test import SimpleTestCase
+from orders.cache import LRUCache
+
+class LRUCacheTest(SimpleTestCase):
+    """
+    Test case for the in-process LRU cache
+    """
+    def test_evicts_least_recently_used(self):
+        """
+        Test that the least recently used entry is evicted when full
+        """
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(len(cache), 2)
+    
+    def test_entries_expire_after_ttl(self):
+        """
+        Test that entries are dropped once their TTL has passed
+        """
+        cache = LRUCache(maxsize=2, ttl=10)
+        with mock.patch('orders.cache.time.monotonic', return_value=100):
+            cache.set('a', 1)
+        with mock.patch('orders.cache.time.monotonic', return_value=105):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('orders.cache.time.monotonic', return_value=111):
+            self.assertIsNone(cache.get('a'))
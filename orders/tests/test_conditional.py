@@ -0,0 +1,119 @@
+import time
+from unittest import mock
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import Order
+
+class ConditionalGetTest(APITestCase):
+    """
+    Test case for ETag support on order reads
+    """
+    def setUp(self):
+        """
+        Set up test data and users
+        """
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.order = Order.objects.create(
+            phone_number="+6281234567890",
+            name="Polling User",
+            address="1 Polling Street",
+            total_lontong_large=1
+        )
+        
+        self.list_url = reverse('order-list')
+        self.detail_url = reverse('order-detail', args=[self.order.id])
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def test_list_not_modified(self):
+        """
+        Test that an unchanged list returns 304 without serializing anything
+        """
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        
+        with mock.patch('orders.views.OrderSerializer.to_representation') as to_representation:
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        to_representation.assert_not_called()
+    
+    def test_list_modified_after_change(self):
+        """
+        Test that creating, updating or deleting an order changes the list ETag
+        """
+        etag = self.client.get(self.list_url)['ETag']
+        
+        order = Order.objects.get(pk=self.order.pk)
+        order.name = "Changed User"
+        order.save()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        
+        order.delete()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_list_ignores_if_modified_since(self):
+        """
+        Test that lists send no Last-Modified, so a delete is never hidden behind a 304
+        """
+        response = self.client.get(self.list_url)
+        self.assertNotIn('Last-Modified', response)
+        
+        Order.objects.create(
+            phone_number="+6281234567891",
+            name="Second User",
+            address="2 Polling Street",
+            total_lontong_small=1
+        )
+        if_modified_since = http_date(time.time() + 60)
+        Order.objects.get(pk=self.order.pk).delete()
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=if_modified_since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+    
+    def test_list_etag_depends_on_query(self):
+        """
+        Test that different query parameters get different validators
+        """
+        etag = self.client.get(self.list_url)['ETag']
+        response = self.client.get(self.list_url, {'fields': 'id,name'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_detail_not_modified(self):
+        """
+        Test that an unchanged order returns 304 for its ETag
+        """
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        response_etag = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response_etag.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_detail_ignores_if_modified_since(self):
+        """
+        Test that details send no Last-Modified, so a change in the same second is never hidden behind a 304
+        """
+        response = self.client.get(self.detail_url)
+        self.assertNotIn('Last-Modified', response)
+        
+        if_modified_since = http_date(time.time() + 60)
+        self.client.patch(self.detail_url, {'name': 'Renamed User'}, format='json')
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=if_modified_since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Renamed User')
+    
+    def test_detail_missing_order(self):
+        """
+        Test that a missing order still returns 404
+        """
+        response = self.client.get(reverse('order-detail', args=[self.order.id + 100]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
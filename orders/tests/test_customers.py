@@ -0,0 +1,120 @@
+import unittest
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import Order
+from orders.phones import normalize_phone_number
+
+class NormalizePhoneNumberTest(SimpleTestCase):
+    """
+    Test case for phone number normalization
+    """
+    def test_formats_share_one_canonical_form(self):
+        """
+        Test that international, country code and local formats normalize alike
+        """
+        for phone_number in ('+6281234567890', '6281234567890', '081234567890', '81234567890'):
+            with self.subTest(phone_number=phone_number):
+                self.assertEqual(normalize_phone_number(phone_number), '6281234567890')
+    
+    def test_other_country_codes_are_kept(self):
+        """
+        Test that numbers with another country code only lose their formatting
+        """
+        self.assertEqual(normalize_phone_number('+14155550123'), '14155550123')
+    
+    def test_international_numbers_starting_with_8(self):
+        """
+        Test that +81 and +86 numbers keep their own country code instead of gaining 62
+        """
+        self.assertEqual(normalize_phone_number('+819012345678'), '819012345678')
+        self.assertEqual(normalize_phone_number('+8613800138000'), '8613800138000')
+        self.assertEqual(normalize_phone_number('008613800138000'), '8613800138000')
+        self.assertEqual(normalize_phone_number('0062812345678'), '62812345678')
+
+class CustomerEndpointTest(APITestCase):
+    """
+    Test case for the customer order history endpoint
+    """
+    def setUp(self):
+        """
+        Set up orders placed by one customer in different phone formats
+        """
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        for phone_number in ('+6281234567890', '081234567890', '6281234567890'):
+            Order.objects.create(
+                phone_number=phone_number,
+                name='Repeat Customer',
+                address='Test Address',
+                total_lontong_large=1,
+                total_lontong_small=1
+            )
+        Order.objects.create(
+            phone_number='+6285700000000',
+            name='Other Customer',
+            address='Other Address',
+            total_lontong_large=5
+        )
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def get_customer(self, phone):
+        return self.client.get(reverse('order-customer', kwargs={'phone': phone}))
+    
+    def test_normalized_phone_is_stored(self):
+        """
+        Test that save() and create_batch() store the canonical phone number
+        """
+        self.assertEqual(Order.objects.filter(normalized_phone='6281234567890').count(), 3)
+        
+        Order.objects.create_batch([
+            Order(phone_number='081234567890', name='Batch', address='Batch Address', total_lontong_small=1)
+        ])
+        self.assertEqual(Order.objects.filter(normalized_phone='6281234567890').count(), 4)
+    
+    def test_customer_history_and_totals(self):
+        """
+        Test that any phone format returns the customer's orders and totals
+        """
+        response = self.get_customer('081234567890')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 3)
+        
+        customer = response.data['customer']
+        self.assertEqual(customer['phone_number'], '6281234567890')
+        self.assertEqual(customer['order_count'], 3)
+        self.assertEqual(customer['total_lontong_large'], 3)
+        self.assertEqual(customer['total_lontong_small'], 3)
+        self.assertEqual(Decimal(customer['total_spent']), Decimal('360000.00'))
+    
+    def test_unknown_customer(self):
+        """
+        Test that a phone number without orders returns 404
+        """
+        response = self.get_customer('+6289999999999')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_requires_admin(self):
+        """
+        Test that customer history is not public
+        """
+        self.client.force_authenticate(user=None)
+        response = self.get_customer('081234567890')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    @unittest.skipUnless(connection.vendor == 'sqlite', 'Query plan assertions are written for SQLite')
+    def test_customer_lookup_uses_index(self):
+        """
+        Test that a customer's history is read from the customer index in order
+        """
+        plan = Order.objects.filter(normalized_phone='6281234567890').explain()
+        self.assertIn('USING INDEX order_customer_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
@@ -0,0 +1,112 @@
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import Order
+
+class OrderExportTest(APITestCase):
+    """
+    Test case for the streaming order export
+    """
+    def setUp(self):
+        """
+        Set up test data and users
+        """
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.regular_user = User.objects.create_user(
+            username='user',
+            email='user@example.com',
+            password='userpassword'
+        )
+        
+        self.order = Order.objects.create(
+            phone_number="+6281234567890",
+            name="Export User",
+            address="1 Export Street, Jakarta",
+            total_lontong_large=2,
+            total_lontong_small=1
+        )
+        self.old_order = Order.objects.create(
+            phone_number="+6281234567891",
+            name="Old Export User",
+            address="2 Export Street",
+            total_lontong_small=4
+        )
+        past = timezone.now() - timedelta(days=30)
+        Order.objects.filter(pk=self.old_order.pk).update(created_at=past)
+        
+        self.export_url = reverse('order-export')
+    
+    def read_content(self, response):
+        """
+        Join a streamed response body into text
+        """
+        return b''.join(response.streaming_content).decode('utf-8')
+    
+    def test_export_csv(self):
+        """
+        Test that the export streams every order as CSV
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        
+        rows = list(csv.DictReader(io.StringIO(self.read_content(response))))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['name'], 'Export User')
+        self.assertEqual(rows[0]['address'], '1 Export Street, Jakarta')
+    
+    def test_export_ndjson_with_date_range(self):
+        """
+        Test that the NDJSON export honours the created_at filters
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        response = self.client.get(self.export_url, {'output': 'ndjson', 'created_after': since})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        lines = self.read_content(response).splitlines()
+        self.assertEqual(len(lines), 1)
+        record = json.loads(lines[0])
+        self.assertEqual(record['id'], self.order.id)
+        self.assertEqual(record['total_price'], '200000.00')
+    
+    def test_export_gzip(self):
+        """
+        Test that the export is gzip encoded when the client accepts it
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.export_url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        
+        content = gzip.decompress(b''.join(response.streaming_content)).decode('utf-8')
+        self.assertIn('Old Export User', content)
+    
+    def test_export_invalid_output(self):
+        """
+        Test that an unknown export format is rejected
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.export_url, {'output': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_export_regular_user(self):
+        """
+        Test that a regular user cannot export orders
+        """
+        self.client.force_authenticate(user=self.regular_user)
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
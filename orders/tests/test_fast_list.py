@@ -0,0 +1,120 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import Order, PriceCatalog, price_catalog_cache
+from orders.whatsapp import whatsapp_link_cache
+
+class FastListParityTest(APITestCase):
+    """
+    Test case comparing the values() list path with OrderSerializer output byte for byte
+    """
+    def setUp(self):
+        """
+        Set up orders priced with and without a catalog version, with odd prices and timestamps
+        """
+        price_catalog_cache.clear()
+        whatsapp_link_cache.clear()
+        self.addCleanup(price_catalog_cache.clear)
+        self.addCleanup(whatsapp_link_cache.clear)
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        
+        # Priced from settings, without a catalog version
+        for index in range(3):
+            Order.objects.create(
+                phone_number=f'+62812345678{index:02d}',
+                name=f'Settings Customer {index}',
+                address=f'{index} Jalan Sudirman',
+                total_lontong_large=index,
+                total_lontong_small=index + 1
+            )
+        PriceCatalog.objects.create(
+            large_price=Decimal('12345.67'),
+            small_price=Decimal('0.05'),
+            effective_from=timezone.now() - timedelta(days=1)
+        )
+        for index in range(4):
+            Order.objects.create(
+                phone_number=f'08571234{index:04d}',
+                name=f'Catalog "Customer" {index} / ü',
+                address=f'{index} Jalan Thamrin\nJakarta',
+                total_lontong_large=index * 3,
+                total_lontong_small=index
+            )
+        # Microseconds and a whole second, which isoformat() renders differently
+        Order.objects.filter(name='Catalog "Customer" 0 / ü').update(
+            updated_at=timezone.now().replace(microsecond=0)
+        )
+        self.list_url = reverse('order-list')
+    
+    def assert_parity(self, params):
+        with override_settings(ORDER_LIST_FAST_PATH=False):
+            expected = self.client.get(self.list_url, params)
+        actual = self.client.get(self.list_url, params)
+        
+        self.assertEqual(expected.status_code, status.HTTP_200_OK)
+        self.assertEqual(actual.status_code, status.HTTP_200_OK)
+        self.assertEqual(actual.content, expected.content)
+        self.assertEqual(actual['ETag'], expected['ETag'])
+    
+    def test_pages_match_serializer(self):
+        """
+        Test that page number pages are identical to the serializer's
+        """
+        for params in ({}, {'page_size': 5, 'page': 2}, {'page_size': 3, 'page': 3}):
+            with self.subTest(params=params):
+                self.assert_parity(params)
+    
+    def test_cursor_pages_match_serializer(self):
+        """
+        Test that cursor pages, including the next cursor, are identical to the serializer's
+        """
+        self.assert_parity({'pagination': 'cursor', 'page_size': 2})
+    
+    def test_sparse_fieldsets_match_serializer(self):
+        """
+        Test that ?fields= and ?omit= selections are identical to the serializer's
+        """
+        for params in (
+            {'fields': 'id,total_price,updated_at'},
+            {'fields': 'whatsapp_link,name'},
+            {'omit': 'whatsapp_link,address'},
+            {'whatsapp_link': 'false'},
+        ):
+            with self.subTest(params=params):
+                self.assert_parity(params)
+    
+    def test_filters_and_search_match_serializer(self):
+        """
+        Test that filtered and searched lists are identical to the serializer's
+        """
+        for params in ({'q': 'thamrin'}, {'min_total': '1'}, {'has_large': 'true'}):
+            with self.subTest(params=params):
+                self.assert_parity(params)
+    
+    def test_skips_model_instances(self):
+        """
+        Test that the fast path doesn't build Order instances
+        """
+        original_from_db = Order.from_db.__func__
+        built = []
+        
+        def from_db(cls, db, field_names, values):
+            built.append(values)
+            return original_from_db(cls, db, field_names, values)
+        
+        Order.from_db = classmethod(from_db)
+        self.addCleanup(setattr, Order, 'from_db', classmethod(original_from_db))
+        
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(built, [])
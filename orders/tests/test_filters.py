@@ -0,0 +1,123 @@
+import unittest
+from datetime import timedelta
+from decimal import Decimal
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import Order
+from orders.filters import filter_orders
+
+class OrderFilterTest(APITestCase):
+    """
+    Test case for the order list filters
+    """
+    def setUp(self):
+        """
+        Set up test data and users
+        """
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        
+        self.large_order = Order.objects.create(
+            phone_number="+6281234567890",
+            name="Large Customer",
+            address="1 Large Street",
+            total_lontong_large=3
+        )
+        self.small_order = Order.objects.create(
+            phone_number="+6281234567891",
+            name="Small Customer",
+            address="2 Small Street",
+            total_lontong_small=1
+        )
+        
+        # Move the small order into the past
+        past = timezone.now() - timedelta(days=10)
+        Order.objects.filter(pk=self.small_order.pk).update(created_at=past, updated_at=past)
+        
+        self.list_url = reverse('order-list')
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def get_names(self, params):
+        """
+        Return the names of the orders listed for the given query parameters
+        """
+        response = self.client.get(self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {order['name'] for order in response.data['results']}
+    
+    def test_filter_created_range(self):
+        """
+        Test filtering orders by a created_at range
+        """
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        self.assertEqual(self.get_names({'created_after': since}), {'Large Customer'})
+        self.assertEqual(self.get_names({'created_before': since}), {'Small Customer'})
+    
+    def test_filter_updated_since(self):
+        """
+        Test filtering orders updated since a given time
+        """
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        self.assertEqual(self.get_names({'updated_since': since}), {'Large Customer'})
+    
+    def test_filter_total_price(self):
+        """
+        Test filtering orders by minimum and maximum total price
+        """
+        self.assertEqual(self.get_names({'min_total': '100000'}), {'Large Customer'})
+        self.assertEqual(self.get_names({'max_total': '100000'}), {'Small Customer'})
+    
+    def test_filter_non_zero_quantities(self):
+        """
+        Test filtering orders that contain large or small lontong
+        """
+        self.assertEqual(self.get_names({'has_large': 'true'}), {'Large Customer'})
+        self.assertEqual(self.get_names({'has_small': 'true'}), {'Small Customer'})
+    
+    def test_filter_zero_quantities(self):
+        """
+        Test that a false quantity filter keeps only orders without that size
+        """
+        self.assertEqual(self.get_names({'has_large': 'false'}), {'Small Customer'})
+        self.assertEqual(self.get_names({'has_small': 'false'}), {'Large Customer'})
+        self.assertEqual(self.get_names({'has_large': 'false', 'has_small': 'false'}), set())
+    
+    def test_invalid_filter_value(self):
+        """
+        Test that an invalid filter value is rejected
+        """
+        response = self.client.get(self.list_url, {'min_total': 'lots'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('min_total', response.data)
+    
+    @unittest.skipUnless(connection.vendor == 'sqlite', 'Query plan assertions are written for SQLite')
+    def test_filters_use_indexes(self):
+        """
+        Test that every filter is answered from an index instead of a full table scan
+        """
+        now = timezone.now().isoformat()
+        expected_indexes = [
+            ({'created_after': now}, 'order_created_id_idx'),
+            ({'created_before': now}, 'order_created_id_idx'),
+            ({'updated_since': now}, 'order_updated_idx'),
+            ({'min_total': Decimal('1')}, 'order_total_price_idx'),
+            ({'max_total': Decimal('1')}, 'order_total_price_idx'),
+            ({'has_large': 'true'}, 'order_large_created_idx'),
+            ({'has_small': 'true'}, 'order_small_created_idx'),
+            ({'has_large': 'false'}, 'order_no_large_created_idx'),
+            ({'has_small': 'false'}, 'order_no_small_created_idx'),
+        ]
+        
+        for params, index in expected_indexes:
+            with self.subTest(**params):
+                # Drop the default ordering so the plan reflects the filter alone
+                queryset = filter_orders(Order.objects.order_by(), params)
+                plan = queryset.explain()
+                self.assertIn(f'USING INDEX {index}', plan)
@@ -0,0 +1,125 @@
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import IdempotencyKey, Order
+from orders.throttling import reset_admission_state
+
+class IdempotencyKeyTest(APITestCase):
+    """
+    Test case for Idempotency-Key support on order creation
+    """
+    def setUp(self):
+        """
+        Set up the request data
+        """
+        # Start every test with empty admission buckets
+        reset_admission_state()
+        
+        self.list_url = reverse('order-list')
+        self.order_data = {
+            'phone_number': '+6281234567890',
+            'name': 'Retrying User',
+            'address': '1 Flaky Street',
+            'total_lontong_large': 1,
+            'total_lontong_small': 1
+        }
+    
+    def post(self, data, key, ip='10.0.0.1'):
+        """
+        Create an order with the given Idempotency-Key
+        """
+        return self.client.post(self.list_url, data, format='json', HTTP_IDEMPOTENCY_KEY=key, REMOTE_ADDR=ip)
+    
+    def test_retry_replays_response(self):
+        """
+        Test that a retried request returns the first response without a new order
+        """
+        first = self.post(self.order_data, 'retry-key-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        
+        second = self.post(self.order_data, 'retry-key-1')
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(Order.objects.count(), 1)
+    
+    def test_key_reused_with_different_body(self):
+        """
+        Test that reusing a key for a different order is rejected
+        """
+        self.post(self.order_data, 'retry-key-2')
+        response = self.post(dict(self.order_data, total_lontong_large=5), 'retry-key-2')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Order.objects.count(), 1)
+    
+    def test_failed_request_does_not_store_key(self):
+        """
+        Test that a rejected request can be corrected and retried with the same key
+        """
+        response = self.post({'phone_number': 'nope'}, 'retry-key-3')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        
+        response = self.post(self.order_data, 'retry-key-3')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+    
+    def test_expired_key_can_be_reused(self):
+        """
+        Test that an expired key is treated as new
+        """
+        self.post(self.order_data, 'retry-key-4')
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        
+        response = self.post(self.order_data, 'retry-key-4')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Order.objects.count(), 2)
+    
+    def test_requests_without_key_are_not_deduplicated(self):
+        """
+        Test that requests without a key behave as before
+        """
+        self.client.post(self.list_url, self.order_data, format='json')
+        self.client.post(self.list_url, self.order_data, format='json')
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+    
+    def test_keys_are_scoped_to_the_client(self):
+        """
+        Test that clients picking the same key don't get each other's responses
+        """
+        first = self.post(self.order_data, 'shared-key', ip='10.0.0.1')
+        other = self.post(dict(self.order_data, name='Other User'), 'shared-key', ip='10.0.0.2')
+        self.assertEqual(other.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('Idempotent-Replayed', other)
+        self.assertNotEqual(other.data['id'], first.data['id'])
+        
+        # Signed in clients are told apart by user, wherever they connect from
+        user = User.objects.create_user(username='user', password='userpassword')
+        self.client.force_authenticate(user=user)
+        self.post(dict(self.order_data, name='Signed In User'), 'shared-key', ip='10.0.0.3')
+        replayed = self.post(dict(self.order_data, name='Signed In User'), 'shared-key', ip='10.0.0.4')
+        self.assertEqual(replayed['Idempotent-Replayed'], 'true')
+        self.assertEqual(Order.objects.count(), 3)
+    
+    @override_settings(ORDER_ADMISSION=dict(settings.ORDER_ADMISSION, ENABLED=True, PHONE_BURST=1, PHONE_RATE=0.01))
+    def test_replays_are_not_throttled(self):
+        """
+        Test that retrying a stored key replays the response instead of returning 429
+        """
+        first = self.post(self.order_data, 'retry-key-5')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        
+        for _ in range(3):
+            retry = self.post(self.order_data, 'retry-key-5')
+            self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        
+        # New orders for the phone number are still throttled
+        response = self.post(self.order_data, 'retry-key-6')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
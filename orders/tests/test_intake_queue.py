@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.urls import reverse
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.intake_queue import get_intake_queue
+from orders.models import Order
+from orders.throttling import reset_admission_state
+
+class IntakeQueueTest(APITestCase):
+    """
+    Test case for the write-behind order intake queue
+    """
+    def setUp(self):
+        """
+        Point the queue at a temporary database and switch to queue mode
+        """
+        # Start every test with empty admission buckets
+        reset_admission_state()
+        
+        self.tmpdir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            ORDER_INTAKE_MODE='queue',
+            ORDER_INTAKE_QUEUE_PATH=os.path.join(self.tmpdir, 'queue.sqlite3')
+        )
+        self.settings_override.enable()
+        
+        self.list_url = reverse('order-list')
+        self.order_data = {
+            'phone_number': '+6281234567890',
+            'name': 'Queued User',
+            'address': '1 Queue Street',
+            'total_lontong_large': 2,
+            'total_lontong_small': 1
+        }
+    
+    def tearDown(self):
+        """
+        Restore the intake mode and remove the temporary queue
+        """
+        self.settings_override.disable()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    
+    def test_create_is_queued(self):
+        """
+        Test that a valid submission is accepted with a ticket and not inserted yet
+        """
+        response = self.client.post(self.list_url, self.order_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'queued')
+        self.assertEqual(response['Location'], response.data['status_url'])
+        self.assertEqual(Order.objects.count(), 0)
+    
+    def test_invalid_submission_is_rejected(self):
+        """
+        Test that invalid submissions are rejected before reaching the queue
+        """
+        response = self.client.post(self.list_url, {'phone_number': 'nope'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_drain_creates_orders_and_resolves_tickets(self):
+        """
+        Test that draining the queue creates the orders and completes their tickets
+        """
+        tickets = []
+        for index in range(3):
+            data = dict(self.order_data, name=f'Queued User {index}')
+            response = self.client.post(self.list_url, data, format='json')
+            tickets.append(response.data['ticket'])
+        
+        call_command('drain_order_queue', '--batch-size', '2', stdout=StringIO())
+        self.assertEqual(Order.objects.count(), 3)
+        
+        response = self.client.get(reverse('order-ticket', args=[tickets[1]]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'done')
+        order = Order.objects.get(pk=response.data['order_id'])
+        self.assertEqual(order.name, 'Queued User 1')
+        self.assertEqual(order.total_price, Order.calculate_total_price(2, 1))
+    
+    def test_stale_claims_are_requeued(self):
+        """
+        Test that submissions claimed by a worker that died are processed again
+        """
+        self.client.post(self.list_url, self.order_data, format='json')
+        queue = get_intake_queue()
+        self.assertEqual(len(queue.claim(10)), 1)
+        self.assertEqual(queue.claim(10), [])
+        
+        self.assertEqual(queue.requeue_stale(older_than=-1), 1)
+        self.assertEqual(len(queue.claim(10)), 1)
+    
+    def test_unknown_ticket(self):
+        """
+        Test that an unknown ticket returns 404
+        """
+        response = self.client.get(reverse('order-ticket', args=['0' * 32]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -3,6 +3,7 @@ from django.contrib.auth.models import User
 from rest_framework import status
 from rest_framework.test import APITestCase
 from orders.models import Order
+from orders.throttling import reset_admission_state
 
 class IntegrationTest(APITestCase):
     """
@@ -12,6 +13,9 @@ class IntegrationTest(APITestCase):
         """
         Set up test data and users
         """
+        # Start every test with empty admission buckets
+        reset_admission_state()
+        
         # Create admin user
         self.admin_user = User.objects.create_superuser(
             username='admin',
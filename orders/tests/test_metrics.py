@@ -0,0 +1,157 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from orders.async_views import order_detail
+from orders.metrics import Histogram, MetricsMiddleware, registry
+from orders.models import Order
+
+class HistogramTest(SimpleTestCase):
+    """
+    Test case for the histogram text rendering
+    """
+    def test_buckets_are_cumulative(self):
+        """
+        Test that bucket counts include every smaller bucket and end with +Inf
+        """
+        histogram = Histogram('test_seconds', 'Test.', ('route',), (0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(('order-list',), value)
+        
+        samples = list(histogram.samples())
+        self.assertEqual(samples[:3], [
+            'test_seconds_bucket{route="order-list",le="0.1"} 2',
+            'test_seconds_bucket{route="order-list",le="1"} 3',
+            'test_seconds_bucket{route="order-list",le="+Inf"} 4',
+        ])
+        self.assertEqual(samples[-1], 'test_seconds_count{route="order-list"} 4')
+
+class MetricsEndpointTest(APITestCase):
+    """
+    Test case for the metrics middleware and endpoint
+    """
+    def setUp(self):
+        """
+        Set up an admin user and start from empty metrics
+        """
+        registry.reset()
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.token = str(RefreshToken.for_user(self.admin_user).access_token)
+        self.order = Order.objects.create(
+            phone_number='+6281234567890',
+            name='Test User',
+            address='Test Address',
+            total_lontong_large=1
+        )
+        self.metrics_url = reverse('metrics')
+    
+    def get_metrics(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        response = self.client.get(self.metrics_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        return response.content.decode()
+    
+    def test_requires_admin(self):
+        """
+        Test that anonymous and regular users cannot read the metrics
+        """
+        response = self.client.get(self.metrics_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        regular_user = User.objects.create_user(username='user', password='userpassword')
+        self.client.force_authenticate(user=regular_user)
+        response = self.client.get(self.metrics_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_records_viewset_actions(self):
+        """
+        Test that requests are labelled with the URL name and viewset action
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.client.get(reverse('order-detail', args=[self.order.id]))
+        self.client.get(reverse('order-detail', args=[self.order.id]))
+        self.client.post(reverse('order-send-whatsapp', args=[self.order.id]))
+        
+        metrics = self.get_metrics()
+        self.assertIn(
+            'orders_http_requests_total{route="order-detail",action="retrieve",method="GET",status="200"} 2',
+            metrics
+        )
+        self.assertIn(
+            'orders_http_requests_total{route="order-send-whatsapp",action="send_whatsapp",method="POST",status="200"} 1',
+            metrics
+        )
+        self.assertIn('orders_http_request_duration_seconds_count{route="order-detail",action="retrieve"} 2', metrics)
+        self.assertIn('orders_http_response_size_bytes_count{route="order-detail",action="retrieve"} 2', metrics)
+    
+    def test_records_sql_queries(self):
+        """
+        Test that queries run by the view are counted for its route
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.client.get(reverse('order-detail', args=[self.order.id]))
+        
+        metrics = self.get_metrics()
+        self.assertIn(
+            'orders_db_queries_per_request_bucket{route="order-detail",action="retrieve",le="0"} 0',
+            metrics
+        )
+        self.assertIn('orders_db_query_duration_seconds_per_request_count{route="order-detail",action="retrieve"} 1', metrics)
+    
+    async def test_async_views_stay_async(self):
+        """
+        Test that async views are recorded without the middleware running synchronously
+        """
+        self.assertTrue(iscoroutinefunction(MetricsMiddleware(order_detail)))
+        self.assertFalse(iscoroutinefunction(MetricsMiddleware(lambda request: None)))
+        
+        response = await self.async_client.get(
+            reverse('async-order-detail', args=[self.order.id]),
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = await sync_to_async(self.get_metrics)()
+        self.assertIn(
+            'orders_http_requests_total{route="async-order-detail",action="",method="GET",status="200"} 1',
+            metrics
+        )
+        # The async ORM's queries are counted too
+        self.assertIn(
+            'orders_db_queries_per_request_bucket{route="async-order-detail",action="",le="0"} 0',
+            metrics
+        )
+    
+    async def test_counts_async_orm_queries(self):
+        """
+        Test that queries the async ORM runs in a worker thread are counted for the request
+        """
+        async def view(request):
+            await Order.objects.afirst()
+            await Order.objects.acount()
+            return HttpResponse()
+        
+        middleware = MetricsMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        await middleware(AsyncRequestFactory().get('/'))
+        
+        metrics = await sync_to_async(self.get_metrics)()
+        self.assertIn('orders_db_queries_per_request_sum{route="unmatched",action=""} 2', metrics)
+    
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled(self):
+        """
+        Test that nothing is recorded when metrics are disabled
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.client.get(reverse('order-detail', args=[self.order.id]))
+        
+        self.assertNotIn('order-detail', self.get_metrics())
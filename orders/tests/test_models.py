@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.conf import settings
 from orders.models import Order
+from orders.whatsapp import whatsapp_link_cache
 
 class OrderModelTest(TestCase):
     """
@@ -56,4 +57,22 @@ class OrderModelTest(TestCase):
         # Check that the link contains the order information
         self.assertIn("Test%20User", wa_link)
         self.assertIn("Large%20Lontong%3A%202", wa_link)
-        self.assertIn("Small%20Lontong%3A%203", wa_link)
\ No newline at end of file
+        self.assertIn("Small%20Lontong%3A%203", wa_link)
+    
+    def test_whatsapp_link_is_cached_until_saved(self):
+        """
+        Test that the WhatsApp link is reused until the order changes
+        """
+        link = self.order.get_whatsapp_link()
+        self.assertEqual(
+            whatsapp_link_cache.get((self.order.pk, self.order.updated_at)),
+            link
+        )
+        
+        order = Order.objects.get(pk=self.order.pk)
+        order.name = "Renamed User"
+        order.save()
+        
+        refreshed_link = order.get_whatsapp_link()
+        self.assertNotEqual(refreshed_link, link)
+        self.assertIn("Renamed%20User", refreshed_link)
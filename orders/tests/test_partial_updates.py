@@ -0,0 +1,211 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import DailyOrderSummary, Order, PriceCatalog, price_catalog_cache
+
+class PartialUpdateTestMixin:
+    """
+    Sets up an admin client, a catalog priced order and a summary check
+    """
+    def setUp(self):
+        """
+        Set up an order priced with a catalog version
+        """
+        price_catalog_cache.clear()
+        self.addCleanup(price_catalog_cache.clear)
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        self.catalog = PriceCatalog.objects.create(
+            large_price=Decimal('90000'),
+            small_price=Decimal('45000'),
+            effective_from=timezone.now() - timedelta(days=1)
+        )
+        self.order = Order.objects.create(
+            phone_number='+6281234567890',
+            name='Partial User',
+            address='1 Partial Street',
+            total_lontong_large=2,
+            total_lontong_small=1
+        )
+        self.detail_url = reverse('order-detail', args=[self.order.id])
+    
+    def order_updates(self, captured):
+        return [
+            query['sql'] for query in captured.captured_queries
+            if query['sql'].startswith('UPDATE "orders_order"')
+        ]
+    
+    def assertSummaryMatchesOrders(self):
+        """
+        Assert that the incremental summary equals a full rebuild
+        """
+        columns = ('date', 'order_count', 'total_lontong_large', 'total_lontong_small', 'revenue')
+        incremental = list(DailyOrderSummary.objects.values_list(*columns))
+        DailyOrderSummary.rebuild()
+        self.assertEqual(incremental, list(DailyOrderSummary.objects.values_list(*columns)))
+
+class PartialUpdateTest(PartialUpdateTestMixin, APITestCase):
+    """
+    Test case for saving only the changed columns of an order
+    """
+    def test_patch_writes_only_submitted_fields(self):
+        """
+        Test that an address change updates the address and updated_at, and nothing else
+        """
+        updated_at = Order.objects.get(pk=self.order.pk).updated_at
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.patch(self.detail_url, {'address': '2 Partial Street'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        updates = self.order_updates(captured)
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"address"', updates[0])
+        self.assertIn('"updated_at"', updates[0])
+        for column in ('"name"', '"phone_number"', '"total_price"', '"total_lontong_large"'):
+            self.assertNotIn(column, updates[0])
+        self.assertGreater(Order.objects.get(pk=self.order.pk).updated_at, updated_at)
+    
+    def test_patch_without_quantities_keeps_price(self):
+        """
+        Test that only a quantity change reprices the order
+        """
+        # A price the current catalog wouldn't produce, e.g. from an earlier repricing
+        Order.objects.filter(pk=self.order.pk).update(total_price=Decimal('1000.00'))
+        
+        self.client.patch(self.detail_url, {'name': 'Renamed User'}, format='json')
+        self.assertEqual(Order.objects.get(pk=self.order.pk).total_price, Decimal('1000.00'))
+        
+        self.client.patch(self.detail_url, {'total_lontong_small': 3}, format='json')
+        self.assertEqual(Order.objects.get(pk=self.order.pk).total_price, Decimal('315000.00'))
+    
+    def test_patch_quantities_updates_summary(self):
+        """
+        Test that a quantity change is reflected in the daily summary
+        """
+        self.client.patch(self.detail_url, {'total_lontong_large': 5}, format='json')
+        self.assertSummaryMatchesOrders()
+    
+    def test_patch_phone_updates_normalized_phone(self):
+        """
+        Test that changing the phone number also stores its normalized form
+        """
+        self.client.patch(self.detail_url, {'phone_number': '085700000000'}, format='json')
+        self.assertEqual(Order.objects.get(pk=self.order.pk).normalized_phone, '6285700000000')
+    
+    def test_update_fields_accepts_attnames(self):
+        """
+        Test that save(update_fields=) takes attnames and reprices for a catalog change
+        """
+        catalog = PriceCatalog.objects.create(large_price=Decimal('1'), small_price=Decimal('2'))
+        order = Order.objects.get(pk=self.order.pk)
+        order.price_catalog_id = catalog.pk
+        order.save(update_fields=['price_catalog_id'])
+        
+        self.assertEqual(Order.objects.get(pk=self.order.pk).total_price, Decimal('4.00'))
+        self.assertSummaryMatchesOrders()
+
+class AdjustQuantitiesTest(PartialUpdateTestMixin, APITestCase):
+    """
+    Test case for the atomic quantity adjustment action
+    """
+    def adjust(self, order_id=None, **data):
+        url = reverse('order-adjust-quantities', args=[order_id or self.order.id])
+        return self.client.post(url, data, format='json')
+    
+    def test_adjusts_and_reprices(self):
+        """
+        Test that quantities are adjusted and the order repriced with its catalog version
+        """
+        response = self.adjust(total_lontong_large=3, total_lontong_small=-1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_lontong_large'], 5)
+        self.assertEqual(response.data['total_lontong_small'], 0)
+        self.assertEqual(response.data['total_price'], '450000.00')
+        self.assertSummaryMatchesOrders()
+    
+    def test_adjustments_accumulate(self):
+        """
+        Test that adjustments made from stale copies of the order are all kept
+        """
+        stale = Order.objects.get(pk=self.order.pk)
+        self.adjust(total_lontong_small=2)
+        self.adjust(total_lontong_small=2)
+        
+        self.assertEqual(Order.objects.get(pk=stale.pk).total_lontong_small, 5)
+        self.assertSummaryMatchesOrders()
+    
+    def test_updates_without_reading_first(self):
+        """
+        Test that the order is changed by a single UPDATE before anything reads it
+        """
+        with CaptureQueriesContext(connection) as captured:
+            self.adjust(total_lontong_large=1)
+        
+        order_queries = [query['sql'] for query in captured.captured_queries if '"orders_order"' in query['sql']]
+        self.assertTrue(order_queries[0].startswith('UPDATE "orders_order"'))
+        self.assertEqual(len(self.order_updates(captured)), 1)
+    
+    def test_patch_after_concurrent_adjustment(self):
+        """
+        Test that saving an order loaded before an adjustment keeps the summary in step
+        """
+        order = Order.objects.get(pk=self.order.pk)
+        Order.adjust_quantities(self.order.pk, large=3)
+        
+        order.total_lontong_large = 1
+        order.save(update_fields=['total_lontong_large'])
+        self.assertSummaryMatchesOrders()
+    
+    def test_delete_after_concurrent_adjustment(self):
+        """
+        Test that deleting an order loaded before an adjustment subtracts its stored totals
+        """
+        order = Order.objects.get(pk=self.order.pk)
+        Order.adjust_quantities(self.order.pk, small=4)
+        
+        order.delete()
+        self.assertEqual(DailyOrderSummary.objects.get().order_count, 0)
+        self.assertEqual(DailyOrderSummary.objects.get().revenue, 0)
+    
+    def test_settings_prices_without_catalog(self):
+        """
+        Test that orders without a catalog version are repriced with the settings prices
+        """
+        Order.objects.filter(pk=self.order.pk).update(price_catalog=None)
+        self.adjust(total_lontong_large=-2)
+        
+        self.assertEqual(Order.objects.get(pk=self.order.pk).total_price, Decimal('40000.00'))
+    
+    def test_cannot_drop_below_zero(self):
+        """
+        Test that an adjustment making a quantity negative changes nothing
+        """
+        response = self.adjust(total_lontong_large=1, total_lontong_small=-2)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        order = Order.objects.get(pk=self.order.pk)
+        self.assertEqual((order.total_lontong_large, order.total_lontong_small), (2, 1))
+    
+    def test_requires_an_adjustment(self):
+        """
+        Test that an empty adjustment is rejected
+        """
+        response = self.adjust(total_lontong_large=0)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_unknown_order(self):
+        """
+        Test that adjusting a missing order returns 404
+        """
+        response = self.adjust(order_id=self.order.id + 100, total_lontong_large=1)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,316 @@
+import threading
+from types import SimpleNamespace
+from unittest import mock
+from django.db.backends.postgresql import base as postgresql_base
+from django.test import SimpleTestCase
+from core.pooled_postgresql import pool as pool_module
+from core.pooled_postgresql.base import DatabaseWrapper
+from core.pooled_postgresql.pool import ConnectionPool, PoolTimeout
+from orders.metrics import registry
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def execute(self, sql, params=None):
+        if self.connection.broken:
+            raise OSError('server closed the connection unexpectedly')
+        self.connection.executed.append(sql)
+
+class FakeConnection:
+    """
+    Stand-in for a psycopg2 connection, recording what the pool and backend do with it
+    """
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.executed = []
+        self.rollbacks = 0
+        self.info = SimpleNamespace(transaction_status=0)
+    
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+    
+    def rollback(self):
+        self.rollbacks += 1
+        self.info.transaction_status = 0
+    
+    def close(self):
+        self.closed = 1
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+class ConnectionPoolTest(SimpleTestCase):
+    """
+    Test case for the connection pool
+    """
+    def setUp(self):
+        """
+        Set up a pool of fake connections driven by a fake clock
+        """
+        self.clock = FakeClock()
+        self.connections = []
+        self.pool = ConnectionPool(
+            connect=self.connect,
+            ping=DatabaseWrapper.ping,
+            max_size=2,
+            max_lifetime=100,
+            max_idle=30,
+            ping_after=5,
+            timeout=0.05,
+            clock=self.clock,
+        )
+    
+    def connect(self):
+        connection = FakeConnection()
+        self.connections.append(connection)
+        return connection
+    
+    def test_reuses_released_connection(self):
+        """
+        Test that a released connection is handed out again instead of opening another
+        """
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        
+        self.assertIs(self.pool.acquire(), connection)
+        stats = self.pool.stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['in_use'], 1)
+    
+    def test_bounded_size_times_out(self):
+        """
+        Test that the pool never opens more than max_size connections
+        """
+        # Real time, so the wait for a free connection runs out
+        pool = ConnectionPool(connect=self.connect, max_size=2, timeout=0.05)
+        pool.acquire()
+        pool.acquire()
+        
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(len(self.connections), 2)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+    
+    def test_waiter_gets_released_connection(self):
+        """
+        Test that a thread waiting on a full pool gets the next released connection
+        """
+        # Real time, so the waiting thread's timeout is honoured
+        pool = ConnectionPool(connect=self.connect, max_size=1, timeout=5)
+        connection = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        
+        while not pool.stats()['waits']:
+            threading.Event().wait(0.001)
+        pool.release(connection)
+        waiter.join(5)
+        
+        self.assertEqual(acquired, [connection])
+        self.assertEqual(pool.stats()['created'], 1)
+    
+    def test_expired_connection_is_replaced(self):
+        """
+        Test that connections older than max_lifetime are closed rather than reused
+        """
+        connection = self.pool.acquire()
+        self.clock.now = 101
+        self.pool.release(connection)
+        
+        replacement = self.pool.acquire()
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(self.pool.stats()['closed_expired'], 1)
+    
+    def test_idle_connection_is_replaced(self):
+        """
+        Test that connections idle longer than max_idle are closed rather than reused
+        """
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        self.clock.now = 31
+        
+        self.assertIsNot(self.pool.acquire(), connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(self.pool.stats()['closed_idle'], 1)
+    
+    def test_pings_only_after_ping_after(self):
+        """
+        Test that recently returned connections are reused without a health check
+        """
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        self.clock.now = 1
+        self.pool.release(self.pool.acquire())
+        self.assertEqual(connection.executed, [])
+        
+        self.clock.now = 10
+        self.assertIs(self.pool.acquire(), connection)
+        self.assertEqual(connection.executed, ['SELECT 1'])
+    
+    def test_broken_connection_is_replaced(self):
+        """
+        Test that a connection failing its ping is closed and a new one opened
+        """
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        connection.broken = True
+        self.clock.now = 10
+        
+        replacement = self.pool.acquire()
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        stats = self.pool.stats()
+        self.assertEqual(stats['ping_failures'], 1)
+        self.assertEqual(stats['closed_broken'], 1)
+        self.assertEqual(stats['size'], 1)
+    
+    def test_unusable_connection_frees_its_slot(self):
+        """
+        Test that releasing an unusable connection closes it and makes room for a new one
+        """
+        first = self.pool.acquire()
+        self.pool.acquire()
+        self.pool.release(first, reusable=False)
+        
+        self.assertTrue(first.closed)
+        self.assertIsNot(self.pool.acquire(), first)
+        self.assertEqual(self.pool.stats()['created'], 3)
+    
+    def test_failed_connect_frees_its_slot(self):
+        """
+        Test that a connection error doesn't leave a slot reserved
+        """
+        with self.assertRaises(OSError):
+            self.pool.acquire(connect=mock.Mock(side_effect=OSError('could not connect')))
+        
+        self.assertEqual(self.pool.stats()['size'], 0)
+    
+    def test_close_idle(self):
+        """
+        Test that close_idle closes idle connections but leaves checked out ones alone
+        """
+        idle = self.pool.acquire()
+        busy = self.pool.acquire()
+        self.pool.release(idle)
+        
+        self.pool.close_idle()
+        self.assertTrue(idle.closed)
+        self.assertFalse(busy.closed)
+        self.assertEqual(self.pool.stats()['size'], 1)
+
+class PooledBackendTest(SimpleTestCase):
+    """
+    Test case for the pooled PostgreSQL backend, with psycopg2 connections faked out
+    """
+    def setUp(self):
+        """
+        Set up a pooled backend whose underlying connections are fakes
+        """
+        self.connections = []
+        patcher = mock.patch.object(
+            postgresql_base.DatabaseWrapper, 'get_new_connection', side_effect=self.connect
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Skip the session setup queries psycopg2 would run
+        patcher = mock.patch.object(DatabaseWrapper, 'init_connection_state')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        pools = mock.patch.dict(pool_module.pools, clear=True)
+        pools.start()
+        self.addCleanup(pools.stop)
+        self.settings_dict = {
+            'ENGINE': 'core.pooled_postgresql',
+            'NAME': 'orders',
+            'USER': '',
+            'PASSWORD': '',
+            'HOST': '',
+            'PORT': '',
+            'OPTIONS': {},
+            'ATOMIC_REQUESTS': False,
+            'AUTOCOMMIT': True,
+            'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': False,
+            'TIME_ZONE': None,
+            'TEST': {},
+            'POOL': {'MAX_SIZE': 2, 'TIMEOUT': 1},
+        }
+    
+    def connect(self, wrapper, conn_params):
+        connection = FakeConnection()
+        connection.autocommit = False
+        self.connections.append(connection)
+        return connection
+    
+    def make_wrapper(self):
+        return DatabaseWrapper(self.settings_dict, alias='pooled')
+    
+    def test_close_returns_connection_to_pool(self):
+        """
+        Test that a closed wrapper's connection is reused by the next one
+        """
+        first = self.make_wrapper()
+        first.connect()
+        connection = first.connection
+        first.close()
+        self.assertFalse(connection.closed)
+        
+        second = self.make_wrapper()
+        second.connect()
+        self.assertIs(second.connection, connection)
+        self.assertEqual(len(self.connections), 1)
+        self.assertEqual(second.pool.max_size, 2)
+    
+    def test_open_transaction_is_rolled_back(self):
+        """
+        Test that a connection is rolled back before going back to the pool
+        """
+        wrapper = self.make_wrapper()
+        wrapper.connect()
+        connection = wrapper.connection
+        connection.info.transaction_status = 2
+        wrapper.close()
+        
+        self.assertEqual(connection.rollbacks, 1)
+        self.assertEqual(wrapper.pool.stats()['idle'], 1)
+    
+    def test_connection_with_errors_is_closed(self):
+        """
+        Test that a connection which saw a database error is not reused
+        """
+        wrapper = self.make_wrapper()
+        wrapper.connect()
+        connection = wrapper.connection
+        wrapper.errors_occurred = True
+        wrapper.close()
+        
+        self.assertTrue(connection.closed)
+        self.assertEqual(wrapper.pool.stats()['closed_broken'], 1)
+    
+    def test_pool_metrics(self):
+        """
+        Test that the pools' stats are exposed with the other metrics
+        """
+        wrapper = self.make_wrapper()
+        wrapper.connect()
+        
+        metrics = registry.render()
+        self.assertIn('orders_db_pool_connections{alias="pooled",state="in_use"} 1', metrics)
+        self.assertIn('orders_db_pool_connections_created_total{alias="pooled"} 1', metrics)
+        self.assertIn('orders_db_pool_connections_closed_total{alias="pooled",reason="expired"} 0', metrics)
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from orders.models import DailyOrderSummary, Order, PriceCatalog, price_catalog_cache
+
+class PriceCatalogTest(TestCase):
+    """
+    Test case for the versioned price catalog
+    """
+    def setUp(self):
+        """
+        Set up an initial catalog version
+        """
+        price_catalog_cache.clear()
+        self.catalog = PriceCatalog.objects.create(
+            large_price=Decimal('90000'),
+            small_price=Decimal('45000'),
+            effective_from=timezone.now() - timedelta(days=1)
+        )
+    
+    def tearDown(self):
+        """
+        Drop cached versions that are rolled back with the test
+        """
+        price_catalog_cache.clear()
+    
+    def create_order(self, **kwargs):
+        """
+        Create an order with default customer details
+        """
+        return Order.objects.create(
+            phone_number="+6281234567890",
+            name="Catalog User",
+            address="1 Catalog Street",
+            **kwargs
+        )
+    
+    def test_new_order_uses_current_catalog(self):
+        """
+        Test that a new order is priced with the version in effect and records it
+        """
+        order = self.create_order(total_lontong_large=2, total_lontong_small=1)
+        self.assertEqual(order.price_catalog, self.catalog)
+        self.assertEqual(order.total_price, Decimal('225000'))
+    
+    def test_future_version_not_used_yet(self):
+        """
+        Test that a version with a future effective_from is ignored until then
+        """
+        PriceCatalog.objects.create(
+            large_price=Decimal('100000'),
+            small_price=Decimal('50000'),
+            effective_from=timezone.now() + timedelta(days=1)
+        )
+        order = self.create_order(total_lontong_large=1)
+        self.assertEqual(order.price_catalog, self.catalog)
+    
+    def test_catalog_change_invalidates_cache(self):
+        """
+        Test that saving a new version is picked up once committed, without waiting for the TTL
+        """
+        self.assertEqual(PriceCatalog.get_current(), self.catalog)
+        with self.captureOnCommitCallbacks(execute=True):
+            newer = PriceCatalog.objects.create(large_price=Decimal('95000'), small_price=Decimal('47500'))
+            # Still cached until the commit, so readers can't cache the old versions again
+            self.assertEqual(price_catalog_cache.get('versions'), [self.catalog])
+        self.assertEqual(PriceCatalog.get_current(), newer)
+    
+    def test_catalog_delete_invalidates_cache(self):
+        """
+        Test that deleting a version clears the cached versions once committed
+        """
+        self.assertEqual(PriceCatalog.get_current(), self.catalog)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.catalog.delete()
+        self.assertIsNone(PriceCatalog.get_current())
+    
+    def test_whatsapp_link_uses_catalog_prices(self):
+        """
+        Test that the WhatsApp message quotes the order's catalog prices
+        """
+        order = self.create_order(total_lontong_large=1)
+        self.assertIn("90000.00%20IDR", order.get_whatsapp_link())
+    
+    def test_reprice_command(self):
+        """
+        Test that the reprice command updates prices and the daily summary
+        """
+        order = self.create_order(total_lontong_large=2)
+        with self.captureOnCommitCallbacks(execute=True):
+            newer = PriceCatalog.objects.create(large_price=Decimal('100000'), small_price=Decimal('50000'))
+        today = timezone.localdate().isoformat()
+        
+        call_command('reprice_orders', '--start', today, '--end', today, stdout=StringIO())
+        
+        order.refresh_from_db()
+        self.assertEqual(order.price_catalog, newer)
+        self.assertEqual(order.total_price, Decimal('200000'))
+        self.assertEqual(
+            DailyOrderSummary.objects.get(date=timezone.localdate()).revenue,
+            Decimal('200000')
+        )
@@ -0,0 +1,198 @@
+from unittest import mock
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from orders.async_views import order_create
+from orders.models import Order
+from orders.replicas import (
+    REPLICA_ALIAS, ReplicaPinMiddleware, ReplicaRouter, check_replica_pin_cache, get_pin_key, get_replica_alias,
+    read_from_replica, replica_reads
+)
+
+class ReplicaRouterTest(SimpleTestCase):
+    """
+    Test case for the read replica database router
+    """
+    def setUp(self):
+        """
+        Set up a router with a replica configured
+        """
+        self.router = ReplicaRouter()
+        patcher = mock.patch('orders.replicas.get_replica_alias', return_value=REPLICA_ALIAS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_reads_use_primary_by_default(self):
+        """
+        Test that reads outside read_from_replica() are left to the primary
+        """
+        self.assertIsNone(self.router.db_for_read(Order))
+    
+    def test_reads_use_replica_when_enabled(self):
+        """
+        Test that reads inside read_from_replica() go to the replica, and writes never do
+        """
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(Order), REPLICA_ALIAS)
+            self.assertEqual(self.router.db_for_write(Order), DEFAULT_DB_ALIAS)
+        self.assertIsNone(self.router.db_for_read(Order))
+    
+    def test_migrations_skip_replica(self):
+        """
+        Test that migrations only run on the primary
+        """
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'orders'))
+        self.assertFalse(self.router.allow_migrate(REPLICA_ALIAS, 'orders'))
+
+LOCAL_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+SHARED_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'pins'}}
+
+class ReplicaPinCacheTest(SimpleTestCase):
+    """
+    Test case for requiring a pin cache shared between instances before using the replica
+    """
+    def setUp(self):
+        """
+        Set up a configured replica database
+        """
+        replica = dict(connections.settings[DEFAULT_DB_ALIAS])
+        patcher = mock.patch.dict(connections.settings, {REPLICA_ALIAS: replica})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    @override_settings(CACHES=LOCAL_CACHES)
+    def test_local_cache_disables_replica(self):
+        """
+        Test that a per-process pin cache keeps reads on the primary and fails the system check
+        """
+        self.assertIsNone(get_replica_alias())
+        self.assertEqual([error.id for error in check_replica_pin_cache(None)], ['orders.E001'])
+    
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_shared_cache_enables_replica(self):
+        """
+        Test that the replica is used with a pin cache every instance can see
+        """
+        self.assertEqual(get_replica_alias(), REPLICA_ALIAS)
+        self.assertEqual(check_replica_pin_cache(None), [])
+
+class ReplicaRoutingTest(APITestCase):
+    """
+    Test case for routing admin reads to the replica with read-your-writes pinning
+    """
+    def setUp(self):
+        """
+        Set up two admins and an order, with the primary standing in for the replica
+        """
+        cache.clear()
+        self.addCleanup(cache.clear)
+        # Queries can't tell the databases apart here, so each records whether replica reads were on
+        patcher = mock.patch('orders.replicas.get_replica_alias', return_value=DEFAULT_DB_ALIAS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.other_admin = User.objects.create_superuser(
+            username='other',
+            email='other@example.com',
+            password='otherpassword'
+        )
+        self.token = str(RefreshToken.for_user(self.admin_user).access_token)
+        self.other_token = str(RefreshToken.for_user(self.other_admin).access_token)
+        self.order = Order.objects.create(
+            phone_number='+6281234567890',
+            name='Test User',
+            address='Test Address',
+            total_lontong_large=1
+        )
+        self.list_url = reverse('order-list')
+        self.detail_url = reverse('order-detail', args=[self.order.id])
+    
+    def record_order_reads(self, token, method, url, **kwargs):
+        """
+        Make a request and return whether each query on the orders table read from the replica
+        """
+        reads = []
+        
+        def record(execute, sql, params, many, context):
+            if sql.startswith('SELECT') and 'orders_order' in sql:
+                reads.append(replica_reads.get())
+            return execute(sql, params, many, context)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        with connection.execute_wrapper(record):
+            response = getattr(self.client, method)(url, **kwargs)
+        self.assertLess(response.status_code, 400)
+        return reads
+    
+    def test_list_and_detail_read_from_replica(self):
+        """
+        Test that list and detail reads run with replica reads enabled
+        """
+        self.assertEqual(set(self.record_order_reads(self.token, 'get', self.list_url)), {True})
+        self.assertEqual(set(self.record_order_reads(self.token, 'get', self.detail_url)), {True})
+    
+    def test_writes_use_primary(self):
+        """
+        Test that updates read the order they change from the primary
+        """
+        reads = self.record_order_reads(self.token, 'patch', self.detail_url, data={'name': 'Changed'})
+        self.assertEqual(set(reads), {False})
+    
+    def test_writer_is_pinned_to_primary(self):
+        """
+        Test that a client's reads stay on the primary right after it writes, and other clients' don't
+        """
+        self.record_order_reads(self.token, 'patch', self.detail_url, data={'name': 'Changed'})
+        
+        self.assertEqual(set(self.record_order_reads(self.token, 'get', self.list_url)), {False})
+        self.assertEqual(set(self.record_order_reads(self.other_token, 'get', self.list_url)), {True})
+    
+    def test_pin_expires(self):
+        """
+        Test that reads return to the replica once the pin has expired
+        """
+        with self.settings(DATABASE_REPLICA_PIN_SECONDS=0):
+            self.record_order_reads(self.token, 'patch', self.detail_url, data={'name': 'Changed'})
+        
+        self.assertEqual(set(self.record_order_reads(self.token, 'get', self.list_url)), {True})
+    
+    async def test_async_writer_is_pinned(self):
+        """
+        Test that writes through the async views pin the client too
+        """
+        self.assertTrue(iscoroutinefunction(ReplicaPinMiddleware(order_create)))
+        data = {
+            'phone_number': '+6289876543210',
+            'name': 'Async Writer',
+            'address': 'Async Address',
+            'total_lontong_large': 1
+        }
+        response = await self.async_client.post(
+            reverse('async-order-create'), data, content_type='application/json',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(await cache.aget(get_pin_key(self.client_request(self.token))))
+    
+    def client_request(self, token):
+        return RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+    
+    def test_no_replica(self):
+        """
+        Test that nothing is pinned when no replica is configured
+        """
+        with mock.patch('orders.replicas.get_replica_alias', return_value=None), \
+                mock.patch('orders.replicas.pin_to_primary') as pin_to_primary:
+            self.record_order_reads(self.token, 'patch', self.detail_url, data={'name': 'Changed'})
+        
+        pin_to_primary.assert_not_called()
@@ -0,0 +1,151 @@
+import unittest
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import Order
+from orders.search import search_orders
+
+class OrderSearchTest(APITestCase):
+    """
+    Test case for full-text order search
+    """
+    def setUp(self):
+        """
+        Set up test orders and an admin user
+        """
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.budi = Order.objects.create(
+            phone_number="+6281234567890",
+            name="Budi Santoso",
+            address="Jalan Sudirman 10, Jakarta",
+            total_lontong_large=1
+        )
+        self.siti = Order.objects.create(
+            phone_number="+6285711112222",
+            name="Siti Aminah",
+            address="Jalan Merdeka 5, Bandung",
+            total_lontong_small=2
+        )
+        self.list_url = reverse('order-list')
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def search(self, query):
+        """
+        Return the names of the orders found by the list endpoint for query
+        """
+        response = self.client.get(self.list_url, {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [order['name'] for order in response.data['results']]
+    
+    def test_search_by_partial_words(self):
+        """
+        Test that terms match word prefixes in name and address
+        """
+        self.assertEqual(self.search('bud'), ['Budi Santoso'])
+        self.assertEqual(self.search('jal merd'), ['Siti Aminah'])
+        self.assertEqual(self.search('jalan'), ['Siti Aminah', 'Budi Santoso'])
+    
+    def test_search_by_phone(self):
+        """
+        Test matching phone number prefixes and digit fragments
+        """
+        self.assertEqual(self.search('62857'), ['Siti Aminah'])
+        self.assertEqual(self.search('1111'), ['Siti Aminah'])
+    
+    def test_search_by_words_and_phone_fragment(self):
+        """
+        Test that a phone fragment has to match alongside the word terms, not instead of them
+        """
+        self.assertEqual(self.search('merdeka 1111'), ['Siti Aminah'])
+        self.assertEqual(self.search('merdeka 5678'), [])
+        self.assertEqual(self.search('siti 1234'), [])
+        self.assertEqual(self.search('1234 5678'), ['Budi Santoso'])
+    
+    @unittest.skipUnless(connection.vendor == 'sqlite', 'Query plan assertions are written for SQLite')
+    def test_search_uses_fts_index(self):
+        """
+        Test that word terms are answered from the FTS table alongside a phone fragment
+        """
+        for query in ('jalan', 'jalan 1111'):
+            with self.subTest(query=query):
+                plan = search_orders(Order.objects.all(), query).explain()
+                # Orders are looked up by the rowids the FTS table returns
+                self.assertIn('SEARCH orders_order USING INTEGER PRIMARY KEY', plan)
+                self.assertNotRegex(plan, r'(?m)SCAN orders_order$')
+    
+    def test_results_are_ranked(self):
+        """
+        Test that orders matching a term more often rank first
+        """
+        bandung = Order.objects.create(
+            phone_number="+6281300000000",
+            name="Bandung Bakery",
+            address="Bandung",
+            total_lontong_large=1
+        )
+        results = list(search_orders(Order.objects.all(), 'bandung'))
+        self.assertEqual(results, [bandung, self.siti])
+    
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_admin_results_are_ranked(self):
+        """
+        Test that the admin change list keeps the search's rank order
+        """
+        bandung = Order.objects.create(
+            phone_number="+6281300000000",
+            name="Bandung Bakery",
+            address="Bandung",
+            total_lontong_large=1
+        )
+        # Older than Siti's order, so only the rank puts it first
+        Order.objects.filter(pk=bandung.pk).update(created_at=self.siti.created_at - timedelta(days=1))
+        self.client.force_login(self.admin_user)
+        
+        response = self.client.get(reverse('admin:orders_order_changelist'), {'q': 'bandung'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.context['cl'].result_list), [bandung, self.siti])
+    
+    def test_index_follows_updates_and_deletes(self):
+        """
+        Test that changed and deleted orders are reflected in the results
+        """
+        self.budi.address = 'Jalan Thamrin 1, Jakarta'
+        self.budi.save()
+        self.assertEqual(self.search('sudirman'), [])
+        self.assertEqual(self.search('thamrin'), ['Budi Santoso'])
+        
+        Order.objects.filter(pk=self.siti.pk).update(name='Siti Rahma')
+        self.assertEqual(self.search('rahma'), ['Siti Rahma'])
+        
+        self.budi.delete()
+        self.assertEqual(self.search('jalan'), ['Siti Rahma'])
+    
+    def test_query_syntax_is_ignored(self):
+        """
+        Test that search operators in the query are treated as plain words
+        """
+        self.assertEqual(self.search('"budi" -santo*'), ['Budi Santoso'])
+        self.assertEqual(self.search('***'), [])
+    
+    def test_search_combines_with_filters(self):
+        """
+        Test that ?q= narrows the other list filters
+        """
+        response = self.client.get(self.list_url, {'q': 'jalan', 'has_small': 'true'})
+        self.assertEqual([order['name'] for order in response.data['results']], ['Siti Aminah'])
+    
+    def test_search_rejects_cursor_pagination(self):
+        """
+        Test that ?q= with ?pagination=cursor is rejected instead of losing the relevance order
+        """
+        response = self.client.get(self.list_url, {'q': 'jalan', 'pagination': 'cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('pagination', response.data)
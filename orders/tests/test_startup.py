@@ -0,0 +1,77 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from orders.benchmarking import parse_importtime, profile_startup
+
+class StartupProfileTest(SimpleTestCase):
+    """
+    Test case for the cold-start profile of the WSGI application
+    """
+    def get_modules(self, report):
+        return {name for name, _, _ in report['modules']}
+    
+    def test_full_mode_defers_admin_and_static_files(self):
+        """
+        Test that an API request does not load the admin URLs or WhiteNoise
+        """
+        report = profile_startup(api_only=False, runs=1)
+        self.assertEqual(report['status'], 401)
+        
+        modules = self.get_modules(report)
+        self.assertIn('orders.views', modules)
+        self.assertNotIn('core.admin_urls', modules)
+        self.assertNotIn('orders.admin', modules)
+        self.assertNotIn('whitenoise.middleware', modules)
+    
+    def test_api_only_mode(self):
+        """
+        Test that API-only mode serves the API without the browser apps
+        """
+        report = profile_startup(api_only=True, runs=1)
+        self.assertEqual(report['status'], 401)
+        
+        modules = self.get_modules(report)
+        for module in (
+            'django.contrib.sessions.backends.base',
+            'django.contrib.messages.storage.base',
+            'django.contrib.staticfiles.finders',
+        ):
+            self.assertNotIn(module, modules)
+    
+    def test_parse_importtime(self):
+        """
+        Test parsing python -X importtime output
+        """
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |   orders.cache\n'
+            'Unauthorized: /api/orders/\n'
+            'import time:        80 |        200 | orders\n'
+        )
+        self.assertEqual(parse_importtime(output), [('orders.cache', 120, 120), ('orders', 80, 200)])
+
+class LazyAdminTest(TestCase):
+    """
+    Test case for the lazily loaded admin
+    """
+    def test_admin_is_served(self):
+        """
+        Test that the admin still answers once it is first used
+        """
+        response = self.client.get('/admin/')
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/admin/login/', response['Location'])
+    
+    # The manifest only exists after collectstatic
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_model_admins_are_registered(self):
+        """
+        Test that the order admin is registered when the admin is first used
+        """
+        admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.client.force_login(admin_user)
+        response = self.client.get('/admin/orders/order/', {'q': 'budi'})
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,137 @@
+from decimal import Decimal
+from io import StringIO
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import DailyOrderSummary, Order
+
+class DailyOrderSummaryTest(APITestCase):
+    """
+    Test case for the incrementally maintained daily summary
+    """
+    def setUp(self):
+        """
+        Set up test data and users
+        """
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        
+        self.order = Order.objects.create(
+            phone_number="+6281234567890",
+            name="Summary User",
+            address="1 Summary Street",
+            total_lontong_large=2,
+            total_lontong_small=1
+        )
+        self.today = timezone.localdate(self.order.created_at)
+        self.summary_url = reverse('order-summary')
+    
+    def get_summary(self):
+        """
+        Return today's summary row
+        """
+        return DailyOrderSummary.objects.get(date=self.today)
+    
+    def assertSummaryMatchesOrders(self):
+        """
+        Assert that the incremental summary equals a full rebuild
+        """
+        incremental = list(DailyOrderSummary.objects.values_list(
+            'date', 'order_count', 'total_lontong_large', 'total_lontong_small', 'revenue'
+        ))
+        DailyOrderSummary.rebuild()
+        rebuilt = list(DailyOrderSummary.objects.values_list(
+            'date', 'order_count', 'total_lontong_large', 'total_lontong_small', 'revenue'
+        ))
+        self.assertEqual(incremental, rebuilt)
+    
+    def test_create_adds_to_summary(self):
+        """
+        Test that creating an order adds it to the day's totals
+        """
+        summary = self.get_summary()
+        self.assertEqual(summary.order_count, 1)
+        self.assertEqual(summary.total_lontong_large, 2)
+        self.assertEqual(summary.total_lontong_small, 1)
+        self.assertEqual(summary.revenue, self.order.total_price)
+    
+    def test_update_applies_quantity_delta(self):
+        """
+        Test that changing quantities applies only the difference
+        """
+        order = Order.objects.get(pk=self.order.pk)
+        order.total_lontong_large = 5
+        order.save()
+        
+        summary = self.get_summary()
+        self.assertEqual(summary.order_count, 1)
+        self.assertEqual(summary.total_lontong_large, 5)
+        self.assertEqual(summary.revenue, order.total_price)
+        self.assertSummaryMatchesOrders()
+    
+    def test_delete_subtracts_from_summary(self):
+        """
+        Test that deleting orders one by one or in bulk keeps the summary correct
+        """
+        Order.objects.create(
+            phone_number="+6281234567891",
+            name="Second User",
+            address="2 Summary Street",
+            total_lontong_small=3
+        )
+        self.order.delete()
+        self.assertEqual(self.get_summary().order_count, 1)
+        self.assertSummaryMatchesOrders()
+        
+        Order.objects.all().delete()
+        summary = self.get_summary()
+        self.assertEqual(summary.order_count, 0)
+        self.assertEqual(summary.revenue, Decimal('0'))
+    
+    def test_bulk_create_adds_to_summary(self):
+        """
+        Test that batch created orders are added to the summary
+        """
+        Order.objects.create_batch([
+            Order(
+                phone_number="+6281234567892",
+                name=f"Batch User {index}",
+                address="3 Summary Street",
+                total_lontong_large=1
+            )
+            for index in range(3)
+        ])
+        self.assertEqual(self.get_summary().order_count, 4)
+        self.assertSummaryMatchesOrders()
+    
+    def test_rebuild_command(self):
+        """
+        Test that the rebuild command restores a damaged summary table
+        """
+        DailyOrderSummary.objects.all().delete()
+        call_command('rebuild_order_summary', stdout=StringIO())
+        self.assertEqual(self.get_summary().order_count, 1)
+    
+    def test_summary_endpoint(self):
+        """
+        Test that an admin can read the daily summary and its totals
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.summary_url, {'start': self.today.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['days']), 1)
+        self.assertEqual(response.data['totals']['order_count'], 1)
+        self.assertEqual(response.data['totals']['revenue'], '200000.00')
+    
+    def test_summary_endpoint_unauthenticated(self):
+        """
+        Test that an unauthenticated user cannot read the summary
+        """
+        response = self.client.get(self.summary_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,181 @@
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import Order
+from orders.throttling import (
+    CacheAdmissionBackend, admission_slot, get_admission_backend, reset_admission_state
+)
+
+def admission_settings(**options):
+    """
+    Return ORDER_ADMISSION with the given options replaced
+    """
+    return dict(settings.ORDER_ADMISSION, ENABLED=True, **options)
+
+class AdmissionControlTest(APITestCase):
+    """
+    Test case for admission control on public order creation
+    """
+    def setUp(self):
+        """
+        Set up the request data and empty buckets
+        """
+        reset_admission_state()
+        self.list_url = reverse('order-list')
+        self.order_data = {
+            'phone_number': '+6281234567890',
+            'name': 'Eager User',
+            'address': '1 Rush Street',
+            'total_lontong_large': 1
+        }
+    
+    def tearDown(self):
+        """
+        Leave empty buckets for the next test
+        """
+        reset_admission_state()
+    
+    def post(self, phone_number='+6281234567890', ip='10.0.0.1'):
+        """
+        Create an order from the given client address
+        """
+        data = dict(self.order_data, phone_number=phone_number)
+        return self.client.post(self.list_url, data, format='json', REMOTE_ADDR=ip)
+    
+    @override_settings(ORDER_ADMISSION=admission_settings(IP_BURST=2, IP_RATE=0.01))
+    def test_ip_bucket(self):
+        """
+        Test that a client IP is throttled with 429 and Retry-After once its burst is spent
+        """
+        self.assertEqual(self.post('+6281234567891').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.post('+6281234567892').status_code, status.HTTP_201_CREATED)
+        
+        response = self.post('+6281234567893')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response['Retry-After']), 0)
+        
+        # Another client is unaffected
+        self.assertEqual(self.post('+6281234567894', ip='10.0.0.2').status_code, status.HTTP_201_CREATED)
+    
+    @override_settings(ORDER_ADMISSION=admission_settings(IP_BURST=2, IP_RATE=0.01))
+    def test_forged_forwarded_for_keeps_ip_bucket(self):
+        """
+        Test that rotating X-Forwarded-For doesn't give a client a fresh IP bucket
+        """
+        expected = [status.HTTP_201_CREATED, status.HTTP_201_CREATED, status.HTTP_429_TOO_MANY_REQUESTS]
+        for index, expected_status in enumerate(expected):
+            data = dict(self.order_data, phone_number=f'+628123456780{index}')
+            response = self.client.post(
+                self.list_url, data, format='json',
+                REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=f'203.0.113.{index}'
+            )
+            self.assertEqual(response.status_code, expected_status)
+    
+    @override_settings(
+        ORDER_ADMISSION=admission_settings(IP_BURST=1, IP_RATE=0.01),
+        REST_FRAMEWORK=dict(settings.REST_FRAMEWORK, NUM_PROXIES=1)
+    )
+    def test_trusted_proxy_address(self):
+        """
+        Test that behind a proxy the client is the address it appended, not what the client sent
+        """
+        def post(forged, client):
+            data = dict(self.order_data, phone_number=f'+62812345678{forged}')
+            return self.client.post(
+                self.list_url, data, format='json', REMOTE_ADDR='10.0.0.254',
+                HTTP_X_FORWARDED_FOR=f'203.0.113.{forged}, {client}'
+            )
+        
+        self.assertEqual(post(1, '198.51.100.7').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(post(2, '198.51.100.7').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(post(3, '198.51.100.8').status_code, status.HTTP_201_CREATED)
+    
+    @override_settings(ORDER_ADMISSION=admission_settings(PHONE_BURST=1, PHONE_RATE=0.01))
+    def test_phone_bucket(self):
+        """
+        Test that one phone number is throttled across client addresses
+        """
+        self.assertEqual(self.post(ip='10.0.0.1').status_code, status.HTTP_201_CREATED)
+        response = self.post(phone_number='6281234567890', ip='10.0.0.2')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(Order.objects.count(), 1)
+    
+    @override_settings(ORDER_ADMISSION=admission_settings(MAX_CONCURRENT=1, RETRY_AFTER=3))
+    def test_concurrency_cap_sheds_load(self):
+        """
+        Test that requests beyond the in-flight cap get 503 with Retry-After
+        """
+        with admission_slot():
+            response = self.post()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '3')
+        
+        # The slot is released again afterwards
+        self.assertEqual(self.post().status_code, status.HTTP_201_CREATED)
+    
+    @override_settings(ORDER_ADMISSION=admission_settings(
+        BACKEND='orders.throttling.CacheAdmissionBackend', KEY_PREFIX='test-admission',
+        IP_BURST=1, IP_RATE=0.01, MAX_CONCURRENT=1
+    ))
+    def test_cache_backend(self):
+        """
+        Test that the shared cache backend enforces the same limits
+        """
+        backend = get_admission_backend()
+        self.assertIsInstance(backend, CacheAdmissionBackend)
+        backend.cache.clear()
+        
+        self.assertEqual(self.post().status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.post('+6281234567891').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        
+        slot = backend.acquire(1)
+        self.assertTrue(slot)
+        self.assertFalse(backend.acquire(1))
+        backend.release(slot)
+        slot = backend.acquire(1)
+        self.assertTrue(slot)
+        backend.release(slot)
+    
+    @override_settings(ORDER_ADMISSION=admission_settings(
+        BACKEND='orders.throttling.CacheAdmissionBackend', KEY_PREFIX='test-admission', SLOT_TIMEOUT=30
+    ))
+    def test_cache_backend_frees_lost_slots(self):
+        """
+        Test that a slot never released, e.g. by a killed worker, is freed after two slot timeouts
+        """
+        backend = get_admission_backend()
+        backend.cache.clear()
+        
+        with mock.patch('orders.throttling.time') as clock:
+            clock.time.return_value = 1000.0
+            self.assertTrue(backend.acquire(1))
+            
+            # Still counted in the next window, as the request may still be running
+            clock.time.return_value = 1030.0
+            self.assertFalse(backend.acquire(1))
+            
+            clock.time.return_value = 1060.0
+            slot = backend.acquire(1)
+            self.assertTrue(slot)
+        backend.release(slot)
+    
+    @override_settings(ORDER_ADMISSION=admission_settings(IP_BURST=1, IP_RATE=0.01))
+    def test_admin_actions_not_throttled(self):
+        """
+        Test that only public order creation is throttled
+        """
+        admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.post()
+        self.assertEqual(self.post('+6281234567891').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        
+        self.client.force_authenticate(user=admin_user)
+        response = self.client.get(self.list_url, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,154 @@
+import gzip
+import json
+import urllib.parse
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from orders.models import Order
+from orders.whatsapp import MessageTemplate
+
+ORDER_FIELDS = ('id', 'phone_number', 'name', 'address', 'total_lontong_large', 'total_price', 'price_catalog')
+
+class MessageTemplateTest(SimpleTestCase):
+    """
+    Test case for the compiled WhatsApp message template
+    """
+    def test_encoded_message_matches_quoting_the_whole_text(self):
+        """
+        Test that joining pre-encoded pieces equals encoding the formatted message
+        """
+        template = MessageTemplate('Hi {name}!\nTotal: {total_price:,} IDR & {address!r}', ORDER_FIELDS)
+        values = {'name': 'Budi / Siti', 'total_price': 120000, 'address': 'Jalan Ü 5?'}
+        expected = urllib.parse.quote(
+            'Hi {name}!\nTotal: {total_price:,} IDR & {address!r}'.format(**values)
+        )
+        self.assertEqual(template.encode_message(values), expected)
+    
+    def test_columns_are_only_what_the_template_uses(self):
+        """
+        Test that the template asks for the phone number plus its own fields
+        """
+        self.assertEqual(MessageTemplate('Hi {name}', ORDER_FIELDS).columns, ('phone_number', 'name'))
+        self.assertEqual(
+            MessageTemplate('{total_lontong_large} x {large_unit_price}', ORDER_FIELDS).columns,
+            ('phone_number', 'total_lontong_large', 'price_catalog')
+        )
+    
+    def test_unknown_field(self):
+        """
+        Test that a template using an unknown field is rejected
+        """
+        with self.assertRaises(ImproperlyConfigured):
+            MessageTemplate('Hi {customer}', ORDER_FIELDS)
+    
+    def test_link_phone_is_the_number_as_entered(self):
+        """
+        Test that the wa.me number is the phone number without its '+', as before templates
+        """
+        template = MessageTemplate('Hi', ORDER_FIELDS)
+        for phone_number, expected in (
+            ('+6281234567890', 'https://wa.me/6281234567890?text=Hi'),
+            ('+819012345678', 'https://wa.me/819012345678?text=Hi'),
+            ('+8613800138000', 'https://wa.me/8613800138000?text=Hi'),
+        ):
+            with self.subTest(phone_number=phone_number):
+                self.assertEqual(template.build_link({'phone_number': phone_number}), expected)
+
+class WhatsAppLinkBatchTest(APITestCase):
+    """
+    Test case for the batch WhatsApp link action
+    """
+    def setUp(self):
+        """
+        Set up test data and an admin user
+        """
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.large_order = Order.objects.create(
+            phone_number="+6281234567890",
+            name="Large Customer",
+            address="1 Large Street",
+            total_lontong_large=3
+        )
+        self.small_order = Order.objects.create(
+            phone_number="081234567891",
+            name="Small Customer",
+            address="2 Small Street",
+            total_lontong_small=1
+        )
+        self.url = reverse('order-whatsapp-links')
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def get_links(self, data, **extra):
+        """
+        Post a batch request and return the streamed rows keyed by order id
+        """
+        response = self.client.post(self.url, data, format='json', **extra)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = b''.join(response.streaming_content)
+        if response.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return {row['id']: row for row in map(json.loads, body.decode().splitlines())}
+    
+    def test_links_for_ids(self):
+        """
+        Test that the links match the ones send_whatsapp returns
+        """
+        rows = self.get_links({'ids': [self.large_order.id, self.small_order.id]})
+        self.assertEqual(set(rows), {self.large_order.id, self.small_order.id})
+        order = Order.objects.get(pk=self.large_order.id)
+        self.assertEqual(rows[order.id]['whatsapp_link'], order.build_whatsapp_link())
+        self.assertEqual(rows[self.small_order.id]['phone_number'], '081234567891')
+        self.assertTrue(rows[self.small_order.id]['whatsapp_link'].startswith('https://wa.me/081234567891?'))
+    
+    def test_links_for_filters(self):
+        """
+        Test selecting orders with the list filters, gzip encoded
+        """
+        rows = self.get_links({'filters': {'has_large': True}}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(set(rows), {self.large_order.id})
+    
+    def test_selection_is_required(self):
+        """
+        Test that a request without ids or filters is rejected
+        """
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        response = self.client.post(self.url, {'filters': {'min_total': 'cheap'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('min_total', response.data)
+    
+    def test_filters_must_be_known_and_non_empty(self):
+        """
+        Test that empty or unknown filters are rejected instead of selecting every order
+        """
+        for filters in ({}, {'bogus': 1}, {'has_large': True, 'min_totl': '1'}):
+            with self.subTest(filters=filters):
+                response = self.client.post(self.url, {'filters': filters}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('filters', response.data)
+    
+    @override_settings(WHATSAPP_MESSAGE_TEMPLATE='Hello {name}, see you soon')
+    def test_configured_template_reads_only_its_columns(self):
+        """
+        Test that a configured template is used and unused columns are not fetched
+        """
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.get_links({'ids': [self.large_order.id]})
+        
+        link = rows[self.large_order.id]['whatsapp_link']
+        self.assertEqual(link, 'https://wa.me/6281234567890?text=Hello%20Large%20Customer%2C%20see%20you%20soon')
+        self.assertEqual(self.large_order.build_whatsapp_link(), link)
+        
+        select = next(query['sql'] for query in queries if 'FROM "orders_order"' in query['sql'])
+        self.assertNotIn('"address"', select)
+        self.assertNotIn('"total_price"', select)
@@ -0,0 +1,210 @@
+import math
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import BaseThrottle
+from .cache import LRUCache
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many orders are being placed right now, please try again shortly.'
+    default_code = 'overloaded'
+    
+    def __init__(self, wait):
+        super().__init__()
+        # DRF's exception handler turns this into a Retry-After header
+        self.wait = wait
+
+class LocalAdmissionBackend:
+    """
+    Token buckets and the in-flight counter kept in this process's memory
+    """
+    def __init__(self, options):
+        self.buckets = LRUCache(maxsize=options.get('MAX_TRACKED_CLIENTS', 10000))
+        self.in_flight = 0
+        self.lock = threading.Lock()
+    
+    def take_token(self, key, rate, burst):
+        """
+        Take one token from the bucket for key; return 0 or the seconds until one is available
+        """
+        now = time.monotonic()
+        with self.lock:
+            tokens, last = self.buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            if tokens >= 1:
+                self.buckets.set(key, (tokens - 1, now))
+                return 0
+            self.buckets.set(key, (tokens, now))
+            return (1 - tokens) / rate
+    
+    def acquire(self, limit):
+        """
+        Reserve an in-flight slot, returning False when all limit slots are taken
+        """
+        with self.lock:
+            if self.in_flight >= limit:
+                return False
+            self.in_flight += 1
+            return True
+    
+    def release(self, slot):
+        """
+        Give back an in-flight slot
+        """
+        with self.lock:
+            self.in_flight -= 1
+
+class CacheAdmissionBackend:
+    """
+    Admission state in a Django cache, so instances sharing Redis or Memcached share limits
+    
+    Buckets use GCRA, which stores a single timestamp per key. The get/set pair is not
+    atomic, so concurrent requests from one client can occasionally slip through; the
+    in-flight counters rely on the cache's atomic incr/decr.
+    """
+    def __init__(self, options):
+        self.cache = caches[options.get('CACHE', 'default')]
+        self.prefix = options.get('KEY_PREFIX', 'order-admission')
+        self.slot_timeout = options.get('SLOT_TIMEOUT', 60)
+    
+    def take_token(self, key, rate, burst):
+        """
+        Take one token from the bucket for key; return 0 or the seconds until one is available
+        """
+        key = f'{self.prefix}:{key}'
+        interval = 1 / rate
+        now = time.time()
+        theoretical_arrival = max(self.cache.get(key, now), now) + interval
+        
+        wait = theoretical_arrival - now - burst * interval
+        if wait > 0:
+            return wait
+        self.cache.set(key, theoretical_arrival, timeout=math.ceil(burst * interval) + 1)
+        return 0
+    
+    def acquire(self, limit):
+        """
+        Reserve an in-flight slot, returning its counter key, or None when all limit slots are taken
+        
+        Slots are counted per SLOT_TIMEOUT window in keys that expire after two windows, so
+        slots held by a worker killed mid-request are freed then instead of leaking forever.
+        """
+        window = int(time.time() // self.slot_timeout)
+        key = f'{self.prefix}:in-flight:{window}'
+        self.cache.add(key, 0, timeout=self.slot_timeout * 2)
+        # Requests admitted during the previous window may still be running
+        running = self.cache.get(f'{self.prefix}:in-flight:{window - 1}', 0)
+        if self.cache.incr(key) + running > limit:
+            self.release(key)
+            return None
+        return key
+    
+    def release(self, slot):
+        """
+        Give back an in-flight slot
+        """
+        try:
+            self.cache.decr(slot)
+        except ValueError:
+            # The request outlived its window's counter, which no longer counts it
+            pass
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+def get_admission_backend():
+    """
+    Return the process-wide backend configured in settings.ORDER_ADMISSION
+    """
+    options = settings.ORDER_ADMISSION
+    with _backends_lock:
+        if options['BACKEND'] not in _backends:
+            _backends[options['BACKEND']] = import_string(options['BACKEND'])(options)
+        return _backends[options['BACKEND']]
+
+def reset_admission_state():
+    """
+    Forget every bucket and in-flight count held by local backends
+    """
+    with _backends_lock:
+        _backends.clear()
+
+def admission_wait(ident, phone_number=None):
+    """
+    Take tokens for a client IP and phone number; return 0 or the seconds to wait
+    """
+    options = settings.ORDER_ADMISSION
+    if not options['ENABLED']:
+        return 0
+    
+    backend = get_admission_backend()
+    wait = backend.take_token(f'ip:{ident}', options['IP_RATE'], options['IP_BURST'])
+    
+    # Strip formatting so '+62 812-...' and '62812...' share a bucket
+    digits = re.sub(r'\D', '', phone_number) if isinstance(phone_number, str) else ''
+    if digits:
+        wait = max(wait, backend.take_token(f'phone:{digits}', options['PHONE_RATE'], options['PHONE_BURST']))
+    return wait
+
+def acquire_admission_slot():
+    """
+    Reserve one of the MAX_CONCURRENT in-flight slots, raising Overloaded when all are taken
+    
+    Returns the slot to pass to release_admission_slot(), or None when admission control is off.
+    """
+    options = settings.ORDER_ADMISSION
+    if not options['ENABLED']:
+        return None
+    
+    slot = get_admission_backend().acquire(options['MAX_CONCURRENT'])
+    if not slot:
+        raise Overloaded(options['RETRY_AFTER'])
+    return slot
+
+def release_admission_slot(slot):
+    if slot is not None:
+        get_admission_backend().release(slot)
+
+@contextmanager
+def admission_slot():
+    """
+    Hold one of the MAX_CONCURRENT in-flight slots, shedding the request with 503 when full
+    """
+    slot = acquire_admission_slot()
+    try:
+        yield
+    finally:
+        release_admission_slot(slot)
+
+@asynccontextmanager
+async def async_admission_slot():
+    """
+    admission_slot() for async views, running the backend's cache calls off the event loop
+    """
+    # Not thread sensitive: the cache calls don't touch the ORM, so they needn't queue
+    # behind it on the shared sync thread
+    slot = await sync_to_async(acquire_admission_slot, thread_sensitive=False)()
+    try:
+        yield
+    finally:
+        await sync_to_async(release_admission_slot, thread_sensitive=False)(slot)
+
+class OrderCreateThrottle(BaseThrottle):
+    """
+    Token bucket throttle per client IP and per phone number for public order creation
+    """
+    def allow_request(self, request, view):
+        phone_number = request.data.get('phone_number') if hasattr(request.data, 'get') else None
+        self.wait_time = admission_wait(self.get_ident(request), phone_number)
+        return self.wait_time == 0
+    
+    def wait(self):
+        return math.ceil(self.wait_time)
@@ -1,10 +1,15 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import OrderViewSet
+from . import async_views
+from .metrics import metrics_view
 
 router = DefaultRouter()
 router.register(r'orders', OrderViewSet)
 
 urlpatterns = [
+    path('async/orders/', async_views.order_create, name='async-order-create'),
+    path('async/orders/<int:pk>/', async_views.order_detail, name='async-order-detail'),
+    path('metrics', metrics_view, name='metrics'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,30 +1,249 @@
+from django.conf import settings
+from django.db.models import Count, Max, Min, Sum
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from rest_framework import viewsets, status
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from .models import Order
-from .serializers import OrderSerializer
+from .models import DailyOrderSummary, Order
+from .serializers import (
+    CustomerSerializer, DailyOrderSummarySerializer, OrderSerializer, QuantityAdjustmentSerializer,
+    SummaryTotalsSerializer, get_row_formatter
+)
+from .archive import filter_archive, get_chunk_paths, iter_archive, list_archives
+from .conditional import ConditionalGetMixin
+from .exports import EXPORT_FIELDS, EXPORT_FORMATS, iter_gzip, iter_ndjson
+from .filters import (
+    ArchiveFilterSerializer, DailySummaryFilterSerializer, WhatsAppLinkBatchSerializer, filter_orders
+)
+from .idempotency import has_stored_key, idempotent
+from .intake_queue import get_intake_queue
+from .pagination import OrderCursorPagination, OrderPageNumberPagination
 from .permissions import IsAdminUser
+from .phones import normalize_phone_number
+from .replicas import can_read_from_replica, replica_reads
+from .throttling import OrderCreateThrottle, admission_slot
+from .whatsapp import get_message_template, iter_links
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Order instances.
     """
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    pagination_class = OrderPageNumberPagination
+    
+    # Actions that accept the order filters from the query string
+    filtered_actions = ('list', 'export')
+    
+    # Actions whose responses can be narrowed with ?fields= and ?omit=
+    sparse_actions = ('list', 'retrieve')
+    
+    # Admin reads that can tolerate replication lag, served by the read replica if there is one
+    replica_actions = ('list', 'retrieve', 'export', 'summary', 'customer')
+    
+    def initial(self, request, *args, **kwargs):
+        """
+        Route this action's reads to the replica, unless the client wrote moments ago
+        """
+        super().initial(request, *args, **kwargs)
+        if self.action in self.replica_actions and can_read_from_replica(request):
+            self._replica_token = replica_reads.set(True)
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        if getattr(self, '_replica_token', None) is not None:
+            replica_reads.reset(self._replica_token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+    
+    def get_queryset(self):
+        """
+        Apply the order filters and sparse fieldset columns to read requests
+        """
+        queryset = super().get_queryset()
+        if self.action in self.filtered_actions:
+            queryset = filter_orders(queryset, self.request.query_params)
+        if self.action in self.replica_actions:
+            # Fix the database now, as exports are streamed after the view has returned
+            queryset = queryset.using(queryset.db)
+        
+        columns = self.get_sparse_columns()
+        if columns is not None:
+            queryset = queryset.only(*columns)
+        return queryset
+    
+    def parse_field_list(self, param):
+        """
+        Parse a comma separated list of serializer field names from the query string
+        
+        An empty list counts as not given, rather than selecting no fields at all.
+        """
+        value = self.request.query_params.get(param)
+        if value is None:
+            return None
+        
+        names = {name.strip() for name in value.split(',') if name.strip()}
+        if not names:
+            return None
+        unknown = names.difference(OrderSerializer.Meta.fields)
+        if unknown:
+            raise ValidationError({param: [f"Unknown field(s): {', '.join(sorted(unknown))}"]})
+        return names
+    
+    def get_field_selection(self):
+        """
+        Return the (fields, omit) sets requested with ?fields= and ?omit=
+        """
+        if not hasattr(self, '_field_selection'):
+            fields, omit = None, set()
+            if self.action in self.sparse_actions:
+                fields = self.parse_field_list('fields')
+                omit = self.parse_field_list('omit') or set()
+                
+                # Keep supporting the older ?whatsapp_link=false switch
+                include_link = self.request.query_params.get('whatsapp_link', 'true')
+                if include_link.lower() in ('false', '0', 'no'):
+                    omit.add('whatsapp_link')
+            self._field_selection = (fields, omit)
+        return self._field_selection
+    
+    def get_sparse_columns(self):
+        """
+        Return the model columns needed for the requested fields, or None for all of them
+        """
+        fields, omit = self.get_field_selection()
+        if fields is None and not omit:
+            return None
+        
+        selected = set(fields if fields is not None else OrderSerializer.Meta.fields) - omit
+        
+        # The primary key and ordering columns are always needed for pagination
+        columns = {'id', 'created_at'}
+        columns.update(name for name in selected if name != 'whatsapp_link')
+        if 'whatsapp_link' in selected:
+            columns.update(Order.get_whatsapp_link_fields())
+        return sorted(columns)
+    
+    def get_serializer_context(self):
+        """
+        Pass the sparse fieldset selection to the serializer
+        """
+        context = super().get_serializer_context()
+        context['fields'], context['omit'] = self.get_field_selection()
+        return context
+    
+    @property
+    def paginator(self):
+        """
+        Use keyset pagination when the client asks for it with ?pagination=cursor
+        
+        Not with ?q=, as cursors follow created_at and would drop the relevance ordering.
+        """
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('pagination') == 'cursor':
+                if self.request.query_params.get('q'):
+                    raise ValidationError({
+                        'pagination': ['Search results are ranked by relevance and only support page numbers.']
+                    })
+                self._paginator = OrderCursorPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List orders, formatting plain rows instead of serializing model instances by default
+        """
+        if not settings.ORDER_LIST_FAST_PATH:
+            return super().list(request, *args, **kwargs)
+        return self.conditional_response(self.get_list_etag(), self.list_rows, *args, **kwargs)
+    
+    def list_rows(self, request, *args, **kwargs):
+        """
+        Produce the same response as ListModelMixin.list() from values() rows
+        """
+        fields, omit = self.get_field_selection()
+        # The fields OrderSerializer.get_fields() keeps, in the same order
+        formatter = get_row_formatter(
+            name for name in OrderSerializer.Meta.fields
+            if (fields is None or name in fields) and name not in omit
+        )
+        # Pagination orders (and cursor pagination reads positions) by created_at and id
+        columns = dict.fromkeys(formatter.get_columns() + ('created_at',))
+        queryset = self.filter_queryset(self.get_queryset()).values(*columns)
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(formatter.format_rows(page))
+        return Response(formatter.format_rows(queryset))
     
     def get_permissions(self):
         """
         Instantiates and returns the list of permissions that this view requires.
         """
-        if self.action == 'create':
-            # Allow anyone to create an order
+        if self.action in ('create', 'ticket'):
+            # Allow anyone to create an order and follow its intake ticket
             permission_classes = [AllowAny]
         else:
             # All other actions require admin privileges
             permission_classes = [IsAuthenticated, IsAdminUser]
         return [permission() for permission in permission_classes]
     
+    def get_throttles(self):
+        """
+        Apply admission control to public order creation
+        """
+        if self.action == 'create':
+            return [OrderCreateThrottle()]
+        return super().get_throttles()
+    
+    def check_throttles(self, request):
+        """
+        Let retries of a stored Idempotency-Key through without spending tokens, as they only replay
+        """
+        if self.action == 'create' and has_stored_key(request):
+            return
+        super().check_throttles(request)
+    
+    def create(self, request, *args, **kwargs):
+        """
+        Create an order, replaying the stored response for a repeated Idempotency-Key
+        """
+        with admission_slot():
+            return idempotent(request, lambda: self.intake(request, *args, **kwargs))
+    
+    def intake(self, request, *args, **kwargs):
+        """
+        Create an order, or queue it for the intake worker in 'queue' intake mode
+        """
+        if settings.ORDER_INTAKE_MODE != 'queue':
+            return super().create(request, *args, **kwargs)
+        
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ticket = get_intake_queue().enqueue(serializer.validated_data)
+        
+        status_url = request.build_absolute_uri(reverse('order-ticket', args=[ticket]))
+        return Response(
+            {'ticket': ticket, 'status': 'queued', 'status_url': status_url},
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': status_url}
+        )
+    
+    @action(detail=False, methods=['get'], url_path=r'tickets/(?P<ticket>[0-9a-f]{32})')
+    def ticket(self, request, ticket=None):
+        """
+        Custom action to resolve a queued submission ticket to its order
+        """
+        ticket_status = get_intake_queue().status(ticket)
+        if ticket_status is None:
+            raise NotFound()
+        return Response(ticket_status)
+    
     @action(detail=True, methods=['post'])
     def send_whatsapp(self, request, pk=None):
         """
@@ -35,4 +254,184 @@ class OrderViewSet(viewsets.ModelViewSet):
         return Response({
             'message': 'WhatsApp link generated successfully',
             'whatsapp_link': whatsapp_link
-        })
\ No newline at end of file
+        })
+    
+    @action(detail=True, methods=['post'], url_path='adjust')
+    def adjust_quantities(self, request, pk=None):
+        """
+        Custom action to add to or take from an order's quantities atomically, e.g. {"total_lontong_large": -1}
+        """
+        adjustment = QuantityAdjustmentSerializer(data=request.data)
+        adjustment.is_valid(raise_exception=True)
+        
+        try:
+            pk = int(pk)
+        except ValueError:
+            raise NotFound()
+        
+        adjusted = Order.adjust_quantities(
+            pk,
+            large=adjustment.validated_data['total_lontong_large'],
+            small=adjustment.validated_data['total_lontong_small']
+        )
+        if not adjusted:
+            # Either the order doesn't exist (404) or the adjustment would make a quantity negative
+            self.get_object()
+            raise ValidationError({'detail': 'Quantities cannot drop below zero.'})
+        return Response(self.get_serializer(self.get_object()).data)
+    
+    @action(detail=False, methods=['post'])
+    def whatsapp_links(self, request):
+        """
+        Custom action to stream WhatsApp links for a list of order ids and/or list filters as NDJSON
+        """
+        selection = WhatsAppLinkBatchSerializer(data=request.data)
+        selection.is_valid(raise_exception=True)
+        
+        orders = Order.objects.all()
+        if 'filters' in selection.validated_data:
+            orders = filter_orders(orders, selection.validated_data['filters'])
+        if 'ids' in selection.validated_data:
+            orders = orders.filter(id__in=selection.validated_data['ids'])
+        
+        # Read only the columns the message template uses
+        template = get_message_template()
+        rows = (
+            orders.values('id', *template.columns)
+            .iterator(chunk_size=settings.ORDER_EXPORT_CHUNK_SIZE)
+        )
+        stream = iter_ndjson(iter_links(rows, template), fields=('id', 'phone_number', 'whatsapp_link'))
+        return self.streaming_response(stream, 'application/x-ndjson; charset=utf-8')
+    
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Custom action to create many orders in a single transaction
+        """
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.ORDER_BULK_MAX_ITEMS
+        )
+        if not serializer.is_valid():
+            errors = serializer.errors
+            if isinstance(errors, list):
+                # Report errors per item, keyed by position in the payload
+                errors = [
+                    {'index': index, 'errors': item_errors}
+                    for index, item_errors in enumerate(errors)
+                    if item_errors
+                ]
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        orders = [Order(**item) for item in serializer.validated_data]
+        orders = Order.objects.create_batch(orders)
+        
+        response_serializer = self.get_serializer(orders, many=True)
+        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Custom action to stream all matching orders as CSV or NDJSON
+        """
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({'output': [f"Choose one of: {', '.join(EXPORT_FORMATS)}"]})
+        encode, content_type, extension = EXPORT_FORMATS[output]
+        
+        rows = (
+            self.get_queryset()
+            .values_list(*EXPORT_FIELDS)
+            .iterator(chunk_size=settings.ORDER_EXPORT_CHUNK_SIZE)
+        )
+        response = self.streaming_response(encode(rows), content_type)
+        filename = f"orders-{timezone.now():%Y%m%d}.{extension}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    
+    def streaming_response(self, stream, content_type):
+        """
+        Stream text chunks to the client, gzip encoded when it accepts gzip
+        """
+        use_gzip = 'gzip' in self.request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if use_gzip:
+            stream = iter_gzip(stream)
+        
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        patch_vary_headers(response, ['Accept-Encoding'])
+        if use_gzip:
+            response['Content-Encoding'] = 'gzip'
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """
+        Custom action to report per-day order totals from the daily summary table
+        """
+        params = DailySummaryFilterSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        
+        summaries = DailyOrderSummary.objects.all()
+        if 'start' in params.validated_data:
+            summaries = summaries.filter(date__gte=params.validated_data['start'])
+        if 'end' in params.validated_data:
+            summaries = summaries.filter(date__lte=params.validated_data['end'])
+        
+        totals = summaries.aggregate(
+            order_count=Sum('order_count'),
+            total_lontong_large=Sum('total_lontong_large'),
+            total_lontong_small=Sum('total_lontong_small'),
+            revenue=Sum('revenue'),
+        )
+        totals = {name: value or 0 for name, value in totals.items()}
+        return Response({
+            'days': DailyOrderSummarySerializer(summaries, many=True).data,
+            'totals': SummaryTotalsSerializer(totals).data
+        })
+    
+    @action(detail=False, methods=['get'])
+    def archives(self, request):
+        """
+        Custom action to list the archived seasons
+        """
+        return Response(list_archives())
+    
+    @action(detail=False, methods=['get'], url_path=r'archives/(?P<season>[\w-]+)')
+    def archive(self, request, season=None):
+        """
+        Custom action to stream a season's archived orders as NDJSON, read from the archive files
+        """
+        if not get_chunk_paths(season):
+            raise NotFound('No archive found for this season.')
+        
+        params = ArchiveFilterSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        
+        orders = filter_archive(iter_archive(season), params.validated_data)
+        return self.streaming_response(iter_ndjson(orders, fields=None), 'application/x-ndjson; charset=utf-8')
+    
+    @action(detail=False, methods=['get'], url_path=r'customers/(?P<phone>\+?\d{9,17})')
+    def customer(self, request, phone=None):
+        """
+        Custom action to return a customer's totals and paginated order history, newest first
+        """
+        normalized_phone = normalize_phone_number(phone)
+        # Both queries are range scans on order_customer_idx
+        orders = self.get_queryset().filter(normalized_phone=normalized_phone)
+        totals = orders.aggregate(
+            order_count=Count('id'),
+            total_lontong_large=Sum('total_lontong_large'),
+            total_lontong_small=Sum('total_lontong_small'),
+            total_spent=Sum('total_price'),
+            first_order_at=Min('created_at'),
+            last_order_at=Max('created_at'),
+        )
+        if not totals['order_count']:
+            raise NotFound('No orders found for this phone number.')
+        
+        page = self.paginate_queryset(orders)
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        response.data['customer'] = CustomerSerializer({'phone_number': normalized_phone, **totals}).data
+        return response
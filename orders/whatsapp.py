@@ -0,0 +1,127 @@
+import string
+import urllib.parse
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from .cache import LRUCache
+
+WHATSAPP_URL = 'https://wa.me/'
+
+# Template fields filled from the order's price catalog version rather than a column
+UNIT_PRICE_FIELDS = ('large_unit_price', 'small_unit_price')
+
+CONVERSIONS = {'s': str, 'r': repr, 'a': ascii}
+
+# WhatsApp links keyed by (id, updated_at), so any saved change produces a new key
+whatsapp_link_cache = LRUCache(maxsize=settings.WHATSAPP_LINK_CACHE_SIZE)
+
+_message_template = None
+
+class MessageTemplate:
+    """
+    WhatsApp message template parsed once, with its literal text already URL encoded
+    """
+    def __init__(self, template, order_fields):
+        # (encoded literal, field name or None, conversion, format spec)
+        self.parts = []
+        fields = []
+        allowed = set(order_fields).union(UNIT_PRICE_FIELDS)
+        
+        for literal, field, format_spec, conversion in string.Formatter().parse(template):
+            if field is not None and field not in allowed:
+                raise ImproperlyConfigured(
+                    f"WHATSAPP_MESSAGE_TEMPLATE uses unknown field '{field}'. "
+                    f"Choose from: {', '.join(sorted(allowed))}"
+                )
+            # Percent-encoding works per character, so encoded pieces can be joined later
+            self.parts.append((urllib.parse.quote(literal), field, conversion, format_spec))
+            if field is not None and field not in fields:
+                fields.append(field)
+        
+        self.uses_unit_prices = any(field in UNIT_PRICE_FIELDS for field in fields)
+        
+        # Order columns needed to build a link: the phone number plus whatever the text uses
+        columns = ['phone_number']
+        columns.extend(field for field in fields if field in order_fields and field != 'phone_number')
+        if self.uses_unit_prices:
+            columns.append('price_catalog')
+        self.columns = tuple(dict.fromkeys(columns))
+    
+    def encode_message(self, values):
+        """
+        Return the URL encoded message for a mapping of field values
+        """
+        pieces = []
+        for literal, field, conversion, format_spec in self.parts:
+            pieces.append(literal)
+            if field is not None:
+                value = values[field]
+                if conversion:
+                    value = CONVERSIONS[conversion](value)
+                pieces.append(urllib.parse.quote(format(value, format_spec)))
+        return ''.join(pieces)
+    
+    def build_link(self, values, unit_prices=None):
+        """
+        Return the wa.me link for a mapping of the template's columns
+        
+        unit_prices is a function returning (large, small) prices for a catalog id.
+        """
+        if self.uses_unit_prices:
+            large_unit_price, small_unit_price = unit_prices(values['price_catalog'])
+            values = dict(values, large_unit_price=large_unit_price, small_unit_price=small_unit_price)
+        
+        # The number as entered, without the '+' wa.me doesn't accept
+        phone = values['phone_number'].lstrip('+')
+        return f'{WHATSAPP_URL}{phone}?text={self.encode_message(values)}'
+
+def get_cached_link(key, build):
+    """
+    Return the cached link for an (id, updated_at) key, building and caching it on a miss
+    """
+    link = whatsapp_link_cache.get(key)
+    if link is None:
+        link = build()
+        whatsapp_link_cache.set(key, link)
+    return link
+
+def get_message_template():
+    """
+    Return the compiled WHATSAPP_MESSAGE_TEMPLATE, parsing it on first use
+    """
+    global _message_template
+    if _message_template is None:
+        from .models import Order
+        
+        order_fields = [field.name for field in Order._meta.concrete_fields]
+        _message_template = MessageTemplate(settings.WHATSAPP_MESSAGE_TEMPLATE, order_fields)
+    return _message_template
+
+def iter_links(rows, template=None):
+    """
+    Yield (id, phone_number, whatsapp_link) for order rows from values()
+    """
+    from .models import PriceCatalog
+    
+    template = template or get_message_template()
+    prices = {}
+    
+    def unit_prices(catalog_id):
+        # Few catalog versions exist, so look each one up once per stream
+        if catalog_id not in prices:
+            prices[catalog_id] = PriceCatalog.get_unit_prices(catalog_id)
+        return prices[catalog_id]
+    
+    for row in rows:
+        yield row['id'], row['phone_number'], template.build_link(row, unit_prices)
+
+@receiver(setting_changed)
+def reset_message_template(setting, **kwargs):
+    """
+    Recompile the template, and forget links built with the old one, when the setting changes
+    """
+    global _message_template
+    if setting == 'WHATSAPP_MESSAGE_TEMPLATE':
+        _message_template = None
+        whatsapp_link_cache.clear()